@@ -0,0 +1,56 @@
+"""
+Benchmark of the showdown evaluation paths.
+
+Compares ``best_hand_rank`` against the 21 five card combination expansion
+that ``generate_possible_hands`` performs, on random seven card sets.
+
+Run from the repository root:
+    python -m automation.bench_evaluator
+"""
+from itertools import combinations
+import random
+import sys
+import time
+
+from pokerbot.poker.deck import Card, Suits
+from pokerbot.poker.evaluator import best_hand_rank
+from pokerbot.poker.hands import Hand
+
+# best_hand_rank has to be at least this many times faster than the
+# combination expansion
+SPEEDUP_TARGET = 20
+SAMPLES = 20000
+
+
+def random_sets(count):
+    cards = [Card(value, suit) for value in range(2, 15)
+             for suit in Suits.SUITS]
+    return [random.sample(cards, 7) for _ in range(count)]
+
+
+def expansion(pocket, community_cards):
+    return max(Hand.get_hand(list(cards)) for cards in
+               combinations(community_cards + pocket, 5))
+
+
+def timed(function, sets):
+    start = time.perf_counter()
+    for cards in sets:
+        function(cards[:2], cards[2:])
+    return time.perf_counter() - start
+
+
+def main():
+    random.seed(0)
+    sets = random_sets(SAMPLES)
+    slow = timed(expansion, sets)
+    fast = timed(best_hand_rank, sets)
+    speedup = slow / fast
+    print("21 combination expansion: %8.2f us/hand" % (slow / SAMPLES * 1e6))
+    print("best_hand_rank:           %8.2f us/hand" % (fast / SAMPLES * 1e6))
+    print("speedup: %.1fx (target %dx)" % (speedup, SPEEDUP_TARGET))
+    return 0 if speedup >= SPEEDUP_TARGET else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,13 +2,18 @@
 from pokerbot.poker.poker import Poker
 from pokerbot.ai.aiplayers import MonteCarloAI
 from pokerbot.ai.holdemai import HoldemAI
+from pokerbot.ai import utils
 import logging
+from pokerbot import logs
 import time
 
 if __name__ == '__main__':
     logging.basicConfig(level=logging.ERROR)
     LOGGER = logging.getLogger("poker-console")
     LOGGER.setLevel(logging.INFO)
+    logs.configure()
+    # repeat spots survive a restart
+    utils.use_naive_rank_cache()
 
     start = time.time()
     players = [
@@ -25,6 +30,6 @@ if __name__ == '__main__':
     game = Poker(players)
     winner = game.play()
 
-    LOGGER.info("Winner is :%s" % winner)
+    LOGGER.info("Winner is :%s", winner)
     LOGGER.info("GAME ENDED SUCCESSFULLY")
-    LOGGER.info("Elasped Time: %d s." % (time.time() - start))
+    LOGGER.info("Elasped Time: %d s.", time.time() - start)
@@ -2,11 +2,10 @@ from pokerbot.poker.player import BasePlayer
 from pokerbot.ai import strategies
 import random
 from pokerbot.poker.player import Call, Fold, Bet, Check
-from pokerbot.ai import utils
+from pokerbot.ai import equity, preflop
+from pokerbot.ai.cache import EquityCache
 import logging
-from pokerbot.poker.deck import Card
 import numpy
-import itertools
 
 LOGGER = logging.getLogger('poker-ai-players1')
 
@@ -21,10 +20,7 @@ class SimpleAIPlayer(BasePlayer):
 
     def interact(self, _game):
         round_ = _game.current_round
-        action = self.strat.rank(_game)
-        while action not in self.available_actions(round_):
-            action = self.strat.rank(_game)
-        return action(self, round_)
+        return self.strat.rank(_game)(self, round_)
 
     def get_amount(self, _min, _max):
         return random.randint(_min, _max)
@@ -33,23 +29,33 @@ class MonteCarloAI(BasePlayer):
 
     NAME = "MonteCarloAI"
 
-    def interact(self, game):
-        round_ = game.current_round
+    def __init__(self, name, starting_money, rng=None):
+        super(MonteCarloAI, self).__init__(name, starting_money)
+        self.rng = numpy.random.default_rng() if rng is None else rng
+
+    def win_shares(self, round_):
         my_cards = self.pocket
         players_count = len(round_.active_players)
-        wins = [0.0] * players_count
+        if not round_.community_cards:
+            # preflop the opponents hold symmetric random hands, so the
+            # precomputed win ratio is split evenly between them
+            win_ratio = preflop.win_ratio(my_cards, players_count - 1)
+            if win_ratio is not None:
+                return [win_ratio] + [(1 - win_ratio) / (players_count - 1)] * \
+                    (players_count - 1)
+        return list(post_flop_table.lookup(
+            my_cards, round_.community_cards, players_count - 1,
+            lambda: tuple(self.simulate_wins(round_))))
+
+    def simulate_wins(self, round_):
         LOGGER.debug("Calculating win ration")
-        for i in range(0, 100):
-            community_cards = round_.community_cards
-            community_cards = Card.random_cards(5 - len(community_cards)) + \
-                community_cards
-            players_cards = [my_cards] + [Card.random_cards(2) for i in
-                range(players_count - 1)]
-            best_hands = [
-                utils.get_best_possible_hand(player_cards, community_cards)
-                for player_cards in players_cards]
-            winner_index = best_hands.index(max(best_hands))
-            wins[winner_index] += 1
+        return equity.pot_shares(
+            self.pocket, round_.community_cards,
+            len(round_.active_players) - 1, SIMULATION_ROLLOUTS, self.rng)
+
+    def interact(self, game):
+        round_ = game.current_round
+        wins = self.win_shares(round_)
         available_actions = self.available_actions(round_)
         winner_index = wins.index(max(wins))
         LOGGER.debug("Win ratio calculated")
@@ -68,37 +74,15 @@ class MonteCarloAI(BasePlayer):
         return random.randint(_min, _max)
 
 
-MAX_OPPENENTS = 5
-
-pre_flop_table = numpy.zeros((169, MAX_OPPENENTS))
-
-def is_increasing(l):
-    return all(a <= b for a, b in zip(l[:-1], l[1:]))
-
-def get_all_possible_flops(num_cards):
-    all_flops = list(itertools.permutations(range(2, 15), num_cards))
-    return filter(is_increasing, all_flops)
+MAX_OPPENENTS = preflop.MAX_OPPONENTS
 
+SIMULATION_ROLLOUTS = 100
 
+pre_flop_table = preflop.equity_table()
 
+POST_FLOP_CACHE_SIZE = 100000
 
-def init_post_flop_table():
-    if post_flop_table_initialized:
-        return
-    flop = 3 * [0]
-    flop_id = 0
-    for full_flop in get_all_possible_flops(5):
-        flop = full_flop
-        m = full_flop[3]
-        n = full_flop[4]
-        hole_id = 0
-        for m in range(2, 29):
-            if m in flop:
-                continue
-            for n in range(m + 1, test):
-                pass
-            if m < 14:
-                pass
+post_flop_table = EquityCache(POST_FLOP_CACHE_SIZE)
 
 
 class NeuralAI(BasePlayer):
@@ -1,15 +1,34 @@
-from pokerbot.deuces.deuces import Deck, Card, Evaluator
+import numpy as np
 
-# hand strength estimator (same class as in https://github.com/neynt/pokertude but uses Deuces Deck, Card and Evaluator classes for the inner workings)
+from pokerbot.ai import equity, preflop
+from pokerbot.ai.cache import EquityCache, canonical_key
+from pokerbot.poker import evaluator
+
+# postflop win ratio estimates shared by every analyzer in the process
+post_flop_cache = EquityCache()
+
+# half width of the 95% confidence interval analyze aims for
+DEFAULT_TARGET_CI = 0.03
+
+
+# hand strength estimator (same interface as the class in https://github.com/neynt/pokertude)
+# rollouts are drawn and ranked in batches by the vectorized equity engine
+# until the win ratio is known precisely enough, monte_carlo_rounds caps them
 class Analyzer:
-    def __init__(self):
-        self.deck = Deck()
+    def __init__(self, rng=None, cache=None):
         self.reset()
-        self._evaluator = Evaluator()
+        self.rng = np.random.default_rng() if rng is None else rng
+        self.cache = post_flop_cache if cache is None else cache
         self.monte_carlo_rounds = 1000
+        self.num_opponents = 1
+        self.target_ci = DEFAULT_TARGET_CI
+        self.time_budget = None
+        # rollouts behind the last analyzed win ratio and the half width of
+        # its 95% confidence interval
+        self.iterations = 0
+        self.confidence_interval = 0.0
 
     def reset(self):
-        self.deck.shuffle()
         self.hole_cards = []
         self.community_cards = []
 
@@ -19,46 +38,80 @@ class Analyzer:
     def set_monte_carlo_rounds(self, n):
         self.monte_carlo_rounds = n
 
+    def set_target_ci(self, ci):
+        self.target_ci = ci
+
+    def set_time_budget(self, seconds):
+        self.time_budget = seconds
+
     def set_pocket_cards(self, card1, card2):
-        self.deck.remove(card1)
-        self.deck.remove(card2)
-        self.hole_cards.append(card1)
-        self.hole_cards.append(card2)
+        self.hole_cards.append(evaluator.encode(card1))
+        self.hole_cards.append(evaluator.encode(card2))
 
     def community_card(self, card):
-        self.deck.remove(card)
-        self.community_cards.append(card)
-
-    def analyze(self):
-        wins = 0
-        ties = 0
-        to_flop = 5 - len(self.community_cards)
-        to_draw = to_flop + 2 * self.num_opponents
-
-        total_rounds = self.monte_carlo_rounds
-        total_opponent_hands = total_rounds * self.num_opponents
-
-        # Monte Carlo simulation
-        for _ in range(self.monte_carlo_rounds):
-            # Draw a uniformly random combination of unseen cards (remaining
-            # community cards + 2 hole cards per opponent)
-            drawn_cards = self.deck.sample(to_draw)
-            all_comms = self.community_cards + drawn_cards[:to_flop]
-            my_ranking = self._evaluator.evaluate(self.hole_cards, all_comms)
-
-            # 2: win, 1: tie, 0: loss
-            winner = 2
-            for i in range(self.num_opponents):
-                their_cards = drawn_cards[to_flop+2*i:to_flop+2*i+2]
-                their_ranking =self._evaluator.evaluate(their_cards, all_comms)
-                if my_ranking > their_ranking:
-                    winner = 0
-                elif my_ranking == their_ranking:
-                    winner = min(winner, 1)
-            if winner == 2:
-                wins += 1
-            elif winner == 1:
-                ties += 1
-
-        win_ratio = wins/total_rounds
-        return win_ratio
+        self.community_cards.append(evaluator.encode(card))
+
+    def set_hand(self, pocket, community, num_opponents):
+        """
+        Replace the whole spot at once, no reset needed between decisions.
+        """
+        self.hole_cards = [evaluator.encode(card) for card in pocket]
+        self.community_cards = [evaluator.encode(card) for card in community]
+        self.num_opponents = num_opponents
+
+    def simulate(self):
+        """
+        :return: (win, tie, loss) boolean vectors of the hero, one entry per
+        Monte Carlo round
+        """
+        return equity.simulate(self.hole_cards, self.community_cards,
+                               self.num_opponents, self.monte_carlo_rounds,
+                               self.rng)
+
+    def estimate(self, target_ci, time_budget):
+        return equity.estimate(self.hole_cards, self.community_cards,
+                               self.num_opponents, target_ci, time_budget,
+                               self.monte_carlo_rounds, rng=self.rng)
+
+    def analyze(self, target_ci=None, time_budget=None):
+        """
+        :param target_ci: stop once the 95% confidence interval of the win
+        ratio is narrower than +/- target_ci
+        :param time_budget: stop after this many seconds
+        :return: win ratio of the hero
+        """
+        target_ci = self.target_ci if target_ci is None else target_ci
+        time_budget = self.time_budget if time_budget is None else time_budget
+        if not self.community_cards:
+            # preflop spots are served from the precomputed table
+            win_ratio = preflop.win_ratio(self.hole_cards, self.num_opponents)
+            if win_ratio is not None:
+                self.iterations, self.confidence_interval = 0, 0.0
+                return win_ratio
+            result = self.estimate(target_ci, time_budget)
+        else:
+            key = canonical_key(self.hole_cards, self.community_cards,
+                                self.num_opponents)
+            result = self.cache.get(key)
+            if result is None or (result.confidence_interval > target_ci and
+                                  result.iterations < self.monte_carlo_rounds):
+                result = self.refine(result, target_ci, time_budget)
+                self.cache.put(key, result)
+        self.iterations = result.iterations
+        self.confidence_interval = result.confidence_interval
+        return result.win_ratio
+
+    def refine(self, previous, target_ci, time_budget):
+        """
+        Estimate a spot, pooling the rollouts of a previous (cached)
+        estimate with the new ones.
+        """
+        result = self.estimate(target_ci, time_budget)
+        if previous is None:
+            return result
+        wins = previous.win_ratio * previous.iterations + \
+            result.win_ratio * result.iterations
+        iterations = previous.iterations + result.iterations
+        return equity.Estimate(
+            wins / iterations, iterations,
+            float(equity.confidence_interval(wins, iterations)))
@@ -0,0 +1,108 @@
+"""
+Bounded LRU cache for postflop equity, keyed on suit-canonical spots.
+
+Suits are interchangeable until they are compared with each other, so
+(A♥ K♥ | Q♥ 7♣ 2♦) and (A♠ K♠ | Q♠ 7♥ 2♣) have the same equity. ``canonical_key``
+relabels the suits of a spot to the smallest equivalent labelling so every
+member of such a class shares one cache entry.
+"""
+from collections import OrderedDict
+from itertools import permutations
+import logging
+import os
+import pickle
+
+from pokerbot.poker import evaluator
+
+LOGGER = logging.getLogger('ai-cache')
+
+_SUIT_PERMUTATIONS = tuple(permutations(range(evaluator.SUITS)))
+
+
+def canonical_key(pocket, community_cards, num_opponents):
+    """
+    :return: hashable key shared by all suit isomorphic spots
+    """
+    pocket = [evaluator.encode(card) for card in pocket]
+    community_cards = [evaluator.encode(card) for card in community_cards]
+    suits = evaluator.SUITS
+    best = None
+    for permutation in _SUIT_PERMUTATIONS:
+        candidate = (
+            tuple(sorted(card - card % suits + permutation[card % suits]
+                         for card in pocket)),
+            tuple(sorted(card - card % suits + permutation[card % suits]
+                         for card in community_cards)))
+        if best is None or candidate < best:
+            best = candidate
+    return best + (num_opponents,)
+
+
+class EquityCache(object):
+    def __init__(self, maxsize=100000, path=None):
+        self.maxsize = maxsize
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        if path is not None and os.path.exists(path):
+            self.load()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def lookup(self, pocket, community_cards, num_opponents, compute):
+        """
+        Return the cached value of a spot, calling compute() on a miss.
+        """
+        key = canonical_key(pocket, community_cards, num_opponents)
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    @property
+    def hit_ratio(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def save(self, path=None):
+        path = self.path if path is None else path
+        # several processes may save the same file at exit, replace it whole
+        temporary = '%s.%d' % (path, os.getpid())
+        with open(temporary, 'wb') as f:
+            pickle.dump(list(self._entries.items()), f,
+                        pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, path)
+
+    def load(self, path=None):
+        path = self.path if path is None else path
+        with open(path, 'rb') as f:
+            for key, value in pickle.load(f):
+                self.put(key, value)
+        LOGGER.info("Loaded %d equity entries from %s", len(self), path)
@@ -0,0 +1,369 @@
+"""
+Vectorized NumPy hand evaluation and Monte Carlo equity.
+
+``evaluate_batch`` scores any number of 5-7 card sets at once and returns
+the same strengths as ``pokerbot.poker.evaluator.evaluate``. ``showdowns``
+draws all rollouts of a spot as one integer array and ranks every seat of
+every rollout in a handful of array operations.
+"""
+from collections import namedtuple
+from itertools import combinations
+from math import comb
+import logging
+import time
+
+import numpy as np
+
+from pokerbot.ai import workers
+from pokerbot.poker import evaluator
+
+LOGGER = logging.getLogger('ai-equity')
+
+# two sided 95% normal quantile
+Z_95 = 1.96
+
+# smallest simulation that is split across the worker pool
+# a rollout costs 4-8us serially and a pool round trip of a showdowns chunk
+# up to 3ms, so from about 16ms of work up splitting pays off. The Analyzer's
+# batches (200 rollouts) and MonteCarloAI (100) stay in-process, only long
+# runs such as the preflop table generator use the pool.
+PARALLEL_ROLLOUTS = 4000
+
+# largest number of showdowns (board runouts times opponent hands) that is
+# enumerated exactly instead of sampled
+EXACT_MAX_SHOWDOWNS = 100000
+
+Estimate = namedtuple('Estimate', ['win_ratio', 'iterations',
+                                   'confidence_interval'])
+
+_RANKS = np.arange(evaluator.RANKS)
+_STRAIGHT_TOP = np.array(evaluator.STRAIGHT_TOP, dtype=np.int64)
+_BEST_FLUSH = np.array(evaluator.BEST_FLUSH, dtype=np.int64)
+# highest set bit of every 13 bit rank mask
+_HIGH_BIT = np.array([mask.bit_length() - 1
+                      for mask in range(1 << evaluator.RANKS)],
+                     dtype=np.int64)
+_CARD_RANK = np.array(evaluator.CARD_RANK, dtype=np.int64)
+_CARD_SUIT = np.array(evaluator.CARD_SUIT, dtype=np.int64)
+_CARD_BIT = np.array(evaluator.CARD_BIT, dtype=np.int64)
+
+
+def _pack(hand_category, *ranks):
+    strength = np.int64(hand_category)
+    for rank in ranks:
+        strength = (strength << 4) | rank
+    return strength << 4 * (5 - len(ranks))
+
+
+def evaluate_batch(cards, base_cards=()):
+    """
+    Evaluate packed cards along the last axis.
+    :param cards: integer array of shape (..., n) with 5 <= n <= 7
+    :param base_cards: cards added to every set, e.g. a known partial board,
+    only counted once for the whole batch; n + len(base_cards) must be 5-7
+    :return: int64 array of shape (...) with the hand strengths
+    """
+    cards = np.asarray(cards, dtype=np.int64)
+    shape = cards.shape[:-1]
+    cards = cards.reshape(int(np.prod(shape)), cards.shape[-1])
+    counts, suit_masks = _histograms(cards)
+    if len(base_cards):
+        base_counts, base_suit_masks = _histograms(
+            np.asarray(base_cards, dtype=np.int64).reshape(1, -1))
+        counts += base_counts
+        suit_masks += base_suit_masks
+    return _score(counts, suit_masks).reshape(shape)
+
+
+def _histograms(cards):
+    """
+    :return: (N, 13) rank counts and (N, 4) rank masks of the suits of an
+    (N, n) card array
+    """
+    n = len(cards)
+    rows = np.arange(n)[:, None]
+    counts = np.bincount((rows * evaluator.RANKS + _CARD_RANK[cards]).ravel(),
+                         minlength=n * evaluator.RANKS)
+    # cards are unique, so summing the rank bits of a suit is the same as
+    # OR-ing them
+    suit_masks = np.bincount(
+        (rows * evaluator.SUITS + _CARD_SUIT[cards]).ravel(),
+        weights=_CARD_BIT[cards].ravel(), minlength=n * evaluator.SUITS)
+    return (counts.reshape(n, evaluator.RANKS),
+            suit_masks.astype(np.int64).reshape(n, evaluator.SUITS))
+
+
+def _score(counts, suit_masks):
+    """
+    :param counts: (N, 13) number of cards of every rank
+    :param suit_masks: (N, 4) rank mask of every suit
+    """
+    flushes = _BEST_FLUSH[suit_masks].max(axis=1)
+    straights = _STRAIGHT_TOP[np.bitwise_or.reduce(suit_masks, axis=1)]
+
+    mask = ((counts > 0) << _RANKS).sum(axis=1)
+    # order ranks by (count, rank), highest first
+    keys = np.sort(counts * 16 + _RANKS, axis=1)[:, ::-1]
+    top_counts = keys[:, :2] >> 4
+    r0, r1, r2, r3, r4 = (keys[:, i] & 0xF for i in range(5))
+
+    first, second = top_counts[:, 0], top_counts[:, 1]
+    conditions = [
+        flushes > 0,
+        first == 4,
+        (first == 3) & (second >= 2),
+        straights >= 0,
+        first == 3,
+        (first == 2) & (second == 2),
+        first == 2,
+    ]
+    choices = [
+        flushes,
+        _pack(evaluator.FOUR_OF_A_KIND, r0,
+              _HIGH_BIT[mask & ~(1 << r0)]),
+        _pack(evaluator.FULL_HOUSE, r0, r1),
+        _pack(evaluator.STRAIGHT, straights),
+        _pack(evaluator.THREE_OF_A_KIND, r0, r1, r2),
+        _pack(evaluator.TWO_PAIRS, r0, r1,
+              _HIGH_BIT[mask & ~((1 << r0) | (1 << r1))]),
+        _pack(evaluator.PAIR, r0, r1, r2, r3),
+    ]
+    strengths = np.select(conditions, choices,
+                          _pack(evaluator.HIGH_CARD, r0, r1, r2, r3, r4))
+    return strengths
+
+
+_combinations = {}
+
+
+def index_combinations(n, k):
+    """
+    :return: (comb(n, k), k) array of all k-combinations of range(n)
+    """
+    if (n, k) not in _combinations:
+        rows = list(combinations(range(n), k))
+        _combinations[n, k] = np.array(rows, dtype=np.int64).reshape(
+            len(rows), k)
+    return _combinations[n, k]
+
+
+def _incidence(combos, n):
+    """
+    :return: (len(combos), n) 0/1 matrix of the indices in every combination
+    """
+    incidence = np.zeros((len(combos), n), dtype=np.int64)
+    for column in combos.T:
+        incidence[np.arange(len(combos)), column] = 1
+    return incidence
+
+
+def remaining_cards(dead_cards):
+    """
+    :return: array of the packed cards not in dead_cards
+    """
+    alive = np.ones(evaluator.CARDS, dtype=bool)
+    alive[[evaluator.encode(card) for card in dead_cards]] = False
+    return np.flatnonzero(alive)
+
+
+def draw(remaining, rollouts, count, rng):
+    """
+    Draw count cards without replacement for every rollout.
+    :return: array of shape (rollouts, count)
+    """
+    if not count:
+        return np.empty((rollouts, 0), dtype=np.int64)
+    keys = rng.random((rollouts, len(remaining)))
+    picked = np.argpartition(keys, count - 1, axis=1)[:, :count]
+    # argpartition does not shuffle the picked cards, order them by key so
+    # the board and every seat get a uniformly random part of the draw
+    order = np.take_along_axis(keys, picked, axis=1).argsort(axis=1)
+    return remaining[np.take_along_axis(picked, order, axis=1)]
+
+
+def showdowns(pocket, community_cards, num_opponents, rollouts=1000,
+              rng=None):
+    """
+    Deal rollouts random completions of a spot, without replacement from
+    the cards that are not known, and score every seat.
+    :return: int64 array of shape (rollouts, num_opponents + 1), the hero's
+    strengths in the first column
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    pocket = [evaluator.encode(card) for card in pocket]
+    community_cards = [evaluator.encode(card) for card in community_cards]
+    if rollouts >= PARALLEL_ROLLOUTS and workers.parallel():
+        # every chunk gets its own random stream drawn from rng
+        chunks = workers.chunks(range(rollouts))
+        seeds = rng.integers(2 ** 63, size=len(chunks))
+        return np.concatenate(workers.map_chunks(_showdowns_chunk, [
+            (pocket, community_cards, num_opponents, len(chunk), seed)
+            for chunk, seed in zip(chunks, seeds)]))
+    to_flop = 5 - len(community_cards)
+    drawn = draw(remaining_cards(pocket + community_cards), rollouts,
+                 to_flop + 2 * num_opponents, rng)
+
+    boards = np.empty((rollouts, 5), dtype=np.int64)
+    boards[:, :len(community_cards)] = community_cards
+    boards[:, len(community_cards):] = drawn[:, :to_flop]
+
+    seats = np.empty((rollouts, num_opponents + 1, 7), dtype=np.int64)
+    seats[:, 0, :2] = pocket
+    seats[:, 1:, :2] = drawn[:, to_flop:].reshape(
+        rollouts, num_opponents, 2)
+    seats[:, :, 2:] = boards[:, None, :]
+    return evaluate_batch(seats)
+
+
+def _showdowns_chunk(job):
+    pocket, community_cards, num_opponents, rollouts, seed = job
+    return showdowns(pocket, community_cards, num_opponents, rollouts,
+                     np.random.default_rng(seed))
+
+
+def simulate(pocket, community_cards, num_opponents, rollouts=1000,
+             rng=None):
+    """
+    Monte Carlo showdowns of the hero's pocket against num_opponents random
+    hands.
+    :return: (win, tie, loss) boolean vectors, one entry per rollout
+    """
+    strengths = showdowns(pocket, community_cards, num_opponents, rollouts,
+                          rng)
+    hero = strengths[:, 0]
+    best_opponent = strengths[:, 1:].max(axis=1)
+    return hero > best_opponent, hero == best_opponent, hero < best_opponent
+
+
+def pot_shares(pocket, community_cards, num_opponents, rollouts=1000,
+               rng=None):
+    """
+    :return: array of the average share of the pot every seat wins, the
+    hero first; split pots are shared between the tied seats
+    """
+    strengths = showdowns(pocket, community_cards, num_opponents, rollouts,
+                          rng)
+    winners = strengths == strengths.max(axis=1, keepdims=True)
+    return (winners / winners.sum(axis=1, keepdims=True)).mean(axis=0)
+
+
+def win_ratio(pocket, community_cards, num_opponents, rollouts=1000,
+              rng=None):
+    """
+    :return: share of the rollouts the hero wins outright
+    """
+    win, _, _ = simulate(pocket, community_cards, num_opponents, rollouts,
+                         rng)
+    return win.mean()
+
+
+def enumeration_size(community_count, num_opponents):
+    """
+    :return: number of showdowns ``exact`` evaluates for a spot, None if
+    it cannot enumerate it
+    """
+    if num_opponents not in (1, 2) or community_count < 3:
+        return None
+    unseen = evaluator.CARDS - 2 - community_count
+    return comb(unseen, 5 - community_count) * comb(unseen, 2)
+
+
+def _disjoint_hands(members, incidence, num_opponents):
+    """
+    Count the ways to seat num_opponents (1 or 2) of the member hands of
+    every runout without two of them sharing a card. Two distinct hands
+    share at most one card, so the pairs sharing card c are the pairs of
+    the hands holding it.
+    """
+    count = members.sum(axis=1)
+    if num_opponents == 1:
+        return count
+    holding = members.astype(np.int64) @ incidence
+    return count * (count - 1) // 2 - (holding * (holding - 1) // 2).sum(
+        axis=1)
+
+
+def exact(pocket, community_cards, num_opponents):
+    """
+    Enumerate every runout of the board and every holding of one or two
+    opponents. Each (runout, opponent hand) strength is evaluated once, on
+    top of the precomputed known board, and the opponent combinations are
+    counted from those.
+    :return: (win, tie, loss) probabilities of the hero and the number of
+    showdowns evaluated
+    """
+    pocket = [evaluator.encode(card) for card in pocket]
+    community_cards = [evaluator.encode(card) for card in community_cards]
+    remaining = remaining_cards(pocket + community_cards)
+    runouts = index_combinations(len(remaining), 5 - len(community_cards))
+    hands = index_combinations(len(remaining), 2)
+    hand_incidence = _incidence(hands, len(remaining))
+
+    # the known board is counted once, only the runouts and the pockets
+    # are added to it
+    runout_cards = remaining[runouts]
+    hero = evaluate_batch(np.concatenate(
+        [np.broadcast_to(pocket, (len(runouts), 2)), runout_cards], axis=1),
+        community_cards)
+
+    # opponents cannot hold the cards of the runout
+    possible = (_incidence(runouts, len(remaining)) @ hand_incidence.T) == 0
+    runout_index, hand_index = np.nonzero(possible)
+    opponents = np.zeros(possible.shape, dtype=np.int64)
+    opponents[runout_index, hand_index] = evaluate_batch(np.concatenate(
+        [remaining[hands[hand_index]], runout_cards[runout_index]], axis=1),
+        community_cards)
+
+    hero = hero[:, None]
+    total = _disjoint_hands(possible, hand_incidence, num_opponents).sum()
+    won = _disjoint_hands(possible & (opponents < hero), hand_incidence,
+                          num_opponents).sum()
+    not_lost = _disjoint_hands(possible & (opponents <= hero),
+                               hand_incidence, num_opponents).sum()
+    return (won / total, (not_lost - won) / total, 1 - not_lost / total,
+            len(runout_index))
+
+
+def confidence_interval(wins, rollouts):
+    """
+    :return: half width of the 95% confidence interval of a win ratio,
+    using the Agresti-Coull estimate so that a spot won or lost in every
+    rollout does not get a zero width interval
+    """
+    n = rollouts + Z_95 ** 2
+    p = (wins + Z_95 ** 2 / 2) / n
+    return Z_95 * np.sqrt(p * (1 - p) / n)
+
+
+def estimate(pocket, community_cards, num_opponents, target_ci=0.03,
+             time_budget=None, max_rollouts=10000, batch=200, rng=None,
+             exact_threshold=EXACT_MAX_SHOWDOWNS):
+    """
+    Simulate batches of rollouts until the 95% confidence interval of the
+    win ratio is narrower than +/- target_ci, the time budget (seconds) is
+    spent or max_rollouts were played, whichever comes first.
+    Spots with at most exact_threshold showdowns are enumerated instead.
+    :return: Estimate of the win ratio with the rollouts used and the half
+    width of its confidence interval
+    """
+    size = enumeration_size(len(community_cards), num_opponents)
+    if size is not None and size <= exact_threshold:
+        win, _, _, showdowns = exact(pocket, community_cards, num_opponents)
+        return Estimate(float(win), showdowns, 0.0)
+    rng = np.random.default_rng() if rng is None else rng
+    deadline = None if time_budget is None else \
+        time.perf_counter() + time_budget
+    wins = rollouts = 0
+    while True:
+        size = min(batch, max_rollouts - rollouts)
+        win, _, _ = simulate(pocket, community_cards, num_opponents, size,
+                             rng)
+        wins += int(win.sum())
+        rollouts += size
+        ci = confidence_interval(wins, rollouts)
+        if ci <= target_ci or rollouts >= max_rollouts or \
+                (deadline is not None and time.perf_counter() >= deadline):
+            break
+    LOGGER.debug("Estimated %f +/- %f in %d rollouts", wins / rollouts, ci,
+                 rollouts)
+    return Estimate(wins / rollouts, rollouts, float(ci))
@@ -0,0 +1,146 @@
+"""
+Fixed layout feature encoding of HoldemAI decisions.
+
+Every decision is one float32 row of INPUT_SIZE columns:
+
+    SEAT        3  hands until the button, binary, most significant bit first
+    PLAYERS    16  two flags per seat: still in the hand, a reserved flag
+    POT         1  pot in big blinds
+    TO_CALL     1  amount to call in big blinds
+    LAST_RAISE  1  last raise in big blinds
+    WIN         1  win ratio
+    STACKS      8  stack of every seat
+
+Binary columns hold -1/1. The amounts are centered on their expected size
+and scaled by half the chips in play, the stacks on the mean stack. Seats
+past the number of players keep -1 flags and a 0 stack.
+
+Rows are written in place, into a reusable buffer or a row of a batch
+matrix, so encoding allocates nothing per decision.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+MAX_SEATS = 8
+SEAT_BITS = 3
+
+SEAT = 0
+PLAYERS = SEAT + SEAT_BITS
+POT = PLAYERS + 2 * MAX_SEATS
+TO_CALL = POT + 1
+LAST_RAISE = TO_CALL + 1
+WIN = LAST_RAISE + 1
+STACKS = WIN + 1
+INPUT_SIZE = STACKS + MAX_SEATS
+
+FEATURE_DTYPE = np.float32
+
+# -1/1 code of every seat number
+SEAT_CODES = np.array(
+    [[1 if seat >> bit & 1 else -1 for bit in reversed(range(SEAT_BITS))]
+     for seat in range(2 ** SEAT_BITS)], dtype=FEATURE_DTYPE)
+
+# one decision of one player
+# stacks and active hold an entry per player of the round, amounts are in
+# chips
+DecisionState = namedtuple('DecisionState', [
+    'seat', 'pot', 'to_call', 'last_raise', 'win_ratio', 'stacks', 'active',
+    'big_blind'])
+
+
+def probe_states(count, rng, big_blind, stack):
+    """
+    Random decisions to score networks on outside of a game, every other
+    one facing a bet.
+    :param stack: starting stack of every player
+    :return: list of count DecisionState
+    """
+    states = []
+    for index in range(count):
+        players = int(rng.integers(2, MAX_SEATS + 1))
+        stacks = rng.integers(1, 2 * stack, players)
+        active = rng.random(players) < 0.7
+        active[0] = True
+        to_call = int(rng.integers(1, 20)) * big_blind if index % 2 else 0
+        pot = int(rng.integers(players, 20 * players)) * big_blind + to_call
+        states.append(DecisionState(
+            int(rng.integers(players)), pot, to_call, to_call, rng.random(),
+            list(stacks), list(active), big_blind))
+    return states
+
+
+def buffer(rows=None):
+    """
+    :return: a single feature row, or a (rows, INPUT_SIZE) batch matrix
+    """
+    shape = INPUT_SIZE if rows is None else (rows, INPUT_SIZE)
+    return np.zeros(shape, dtype=FEATURE_DTYPE)
+
+
+def encode(out, state):
+    """
+    Write the features of a decision into a row.
+    :param out: (INPUT_SIZE,) float32 row, e.g. a row of a batch matrix
+    :return: out
+    """
+    stacks = state.stacks
+    players = len(stacks)
+    big_blind = state.big_blind
+    chip_range = sum(stacks) / big_blind / 2
+
+    out[SEAT:PLAYERS] = SEAT_CODES[state.seat % 2 ** SEAT_BITS]
+    flags = out[PLAYERS:POT]
+    flags.fill(-1)
+    flags[0:2 * players:2][np.asarray(state.active, dtype=bool)] = 1
+
+    # the average pot is assumed to be a big blind per player, calls and
+    # raises a third of it
+    out[POT] = (state.pot / big_blind - players) / chip_range
+    out[TO_CALL] = (state.to_call / big_blind - players / 3) / chip_range
+    out[LAST_RAISE] = (state.last_raise / big_blind - players / 3) / chip_range
+    out[WIN] = (state.win_ratio - 0.5) * 2
+
+    chip_mean = sum(stacks) / players / big_blind
+    out[STACKS:] = 0
+    out[STACKS:STACKS + players] = \
+        (np.asarray(stacks) / big_blind - chip_mean) / chip_range
+    return out
+
+
+def encode_batch(states, out=None):
+    """
+    Encode many decisions at once.
+    :param states: sequence of DecisionState
+    :param out: (len(states), INPUT_SIZE) float32 matrix to write into
+    :return: the feature matrix, one decision per row
+    """
+    n = len(states)
+    if out is None:
+        out = buffer(n)
+    stacks = np.zeros((n, MAX_SEATS))
+    active = np.zeros((n, MAX_SEATS), dtype=bool)
+    players = np.empty(n)
+    for row, state in enumerate(states):
+        players[row] = len(state.stacks)
+        stacks[row, :len(state.stacks)] = state.stacks
+        active[row, :len(state.active)] = state.active
+    seats, pots, to_call, last_raise, win_ratios, big_blinds = np.array(
+        [(s.seat, s.pot, s.to_call, s.last_raise, s.win_ratio, s.big_blind)
+         for s in states], dtype=float).reshape(n, 6).T
+    present = np.arange(MAX_SEATS) < players[:, None]
+    chip_range = stacks.sum(axis=1) / big_blinds / 2
+
+    out[:, SEAT:PLAYERS] = SEAT_CODES[seats.astype(int) % 2 ** SEAT_BITS]
+    out[:, PLAYERS:POT:2] = np.where(active, 1, -1)
+    out[:, PLAYERS + 1:POT:2] = -1
+    out[:, POT] = (pots / big_blinds - players) / chip_range
+    out[:, TO_CALL] = (to_call / big_blinds - players / 3) / chip_range
+    out[:, LAST_RAISE] = (last_raise / big_blinds - players / 3) / chip_range
+    out[:, WIN] = (win_ratios - 0.5) * 2
+
+    chip_mean = stacks.sum(axis=1) / players / big_blinds
+    out[:, STACKS:] = np.where(
+        present, (stacks / big_blinds[:, None] - chip_mean[:, None]) /
+        chip_range[:, None], 0)
+    return out
@@ -0,0 +1,84 @@
+"""
+Vectorized genetic operators.
+
+Every operator works on whole arrays: a single genome, a list of weight
+tensors flattened with ``population.to_genome`` or a (P, G) population
+matrix with one genome per row. Nothing loops over individual weights.
+"""
+import numpy as np
+
+
+def _rng(rng):
+    return np.random.default_rng() if rng is None else rng
+
+
+def uniform_crossover(parents1, parents2, rng=None):
+    """
+    Take every gene from either parent with equal probability.
+    """
+    mask = _rng(rng).random(np.shape(parents1)) < 0.5
+    return np.where(mask, parents1, parents2)
+
+
+def blend_crossover(parents1, parents2, rng=None, alpha=0.5):
+    """
+    BLX-alpha: every gene is drawn uniformly from the parents' interval,
+    widened by alpha times its length on both sides.
+    """
+    parents1 = np.asarray(parents1)
+    parents2 = np.asarray(parents2)
+    u = _rng(rng).uniform(-alpha, 1 + alpha, parents1.shape)
+    return parents1 + u * (parents2 - parents1)
+
+
+def gaussian_mutation(genomes, rng=None, rate=0.1, scale=0.1):
+    """
+    Add N(0, scale) noise to a share rate of the genes.
+    """
+    rng = _rng(rng)
+    genomes = np.asarray(genomes)
+    mask = rng.random(genomes.shape) < rate
+    return genomes + mask * rng.normal(0, scale, genomes.shape)
+
+
+def elite(fitness, n):
+    """
+    :return: indices of the n fittest individuals, fittest first
+    """
+    fitness = np.asarray(fitness)
+    n = min(n, len(fitness))
+    if not n:
+        return np.empty(0, dtype=np.int64)
+    top = np.argpartition(-fitness, n - 1)[:n]
+    return top[np.argsort(-fitness[top], kind='stable')]
+
+
+def tournament_selection(fitness, count, rng=None, size=2):
+    """
+    :return: count indices, each the fittest of size random individuals
+    """
+    fitness = np.asarray(fitness)
+    entrants = _rng(rng).integers(0, len(fitness), (count, size))
+    winners = np.argmax(fitness[entrants], axis=1)
+    return entrants[np.arange(count), winners]
+
+
+def next_generation(population, fitness, rng=None, n_elite=1,
+                    crossover=blend_crossover, rate=0.1, scale=0.1, size=None):
+    """
+    Breed a new population: the n_elite fittest genomes are kept unchanged,
+    the rest are mutated crossovers of tournament winners.
+    :param population: (P, G) genome matrix
+    :param fitness: (P,) fitness of every genome
+    :param size: number of genomes to return, by default P
+    """
+    rng = _rng(rng)
+    population = np.asarray(population)
+    size = len(population) if size is None else size
+    elites = population[elite(fitness, min(n_elite, size))]
+    count = size - len(elites)
+    parents1 = population[tournament_selection(fitness, count, rng)]
+    parents2 = population[tournament_selection(fitness, count, rng)]
+    children = gaussian_mutation(crossover(parents1, parents2, rng), rng,
+                                 rate, scale)
+    return np.concatenate([elites, children])
@@ -1,7 +1,10 @@
 from pokerbot.ai.table import Table, TableProxy
 from pokerbot.ai.playercontrol import PlayerControl, PlayerControlProxy
 from pokerbot.ai.teacher import Teacher, TeacherProxy
+from pokerbot.ai import utils
+from pokerbot import logs
 import argparse
+import logging
 import time
 
 seats = 8
@@ -11,11 +14,22 @@ if __name__=='__main__':
     parser.add_argument('pool_size', type=int, default=100)
     parser.add_argument('epochs', type=int, default=1)
     parser.add_argument('--quiet', dest='quiet', action='store_true')
-    parser.set_defaults(quiet=True)
+    parser.add_argument('--xmlrpc', dest='direct', action='store_false',
+                        help='run the table and players as XML-RPC servers instead of in-process')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='number of tables played in parallel')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.set_defaults(quiet=True, direct=True)
     args = parser.parse_args()
+    logs.set_level('ai-teacher', logging.INFO, stream=True)
+    logs.configure()
+    # repeat spots survive a restart
+    utils.use_naive_rank_cache()
 
-    teacher = Teacher(seats, int(args.pool_size/3), args.pool_size, args.epochs, args.quiet)
-    teacher_proxy = TeacherProxy(teacher)
+    teacher = Teacher(seats, int(args.pool_size/3), args.pool_size, args.epochs, args.quiet, args.direct,
+                      args.workers, args.seed)
+    if not args.direct:
+        teacher_proxy = TeacherProxy(teacher)
 
     teacher.start()
     teacher.join()
@@ -1,33 +1,42 @@
+import logging
+
 import numpy as np
 from pokerbot.ai.neural_network import NeuralNetwork
-from pokerbot.ai.analyzer import Analyzer, Card
+from pokerbot.ai.analyzer import Analyzer
+from pokerbot.ai import features
 from pokerbot.poker.player import Call, Fold, Bet, Check
 import random
-from pokerbot.deuces.deuces import Card
 
 from pokerbot.poker.player import BasePlayer
 
+LOGGER = logging.getLogger('ai-holdem')
+
 class HoldemAI(NeuralNetwork, BasePlayer):
 
     NAME = "Holdem AI"
+    DIM = [31, 20, 5]
+    ACTIONS = {'fold': Fold, 'call': Call, 'check': Check, 'raise': Bet}
 
-    def __init__(self, name, starting_money = 1000, ID = '46e292f0-28bd-4953-9d70-d1ee109130af'):
-        NeuralNetwork.__init__(self, [31, 20, 5], ID)
+    def __init__(self, name, starting_money = 1000, ID = '46e292f0-28bd-4953-9d70-d1ee109130af', rng = None):
+        NeuralNetwork.__init__(self, HoldemAI.DIM, ID)
         BasePlayer.__init__(self, name, starting_money)
-        self.analyzer = Analyzer()
+        self.analyzer = Analyzer(rng)
+        self.inputs = features.buffer()
 
     def interact(self, _game):
         action = self.act(_game)
         round_ = _game.current_round
-        print("Action: ", action)
-        if action[0] == 'fold':
-            return Fold(self, round_)
-        if action[0] == 'call':
-            return Call(self, round_)
-        if action[0] == 'check':
-            return Check(self, round_)
-        if action[0] == 'raise':
-            return Bet(self, round_)
+        LOGGER.debug("Action: %s", action)
+        context = round_.decision_context(self)
+        action = HoldemAI.ACTIONS[action[0]]
+        if not context.allows(action):
+            # e.g. a raise the stack does not cover, stay in the hand if
+            # the round allows it
+            for fallback in (Call, Check, Fold):
+                if context.allows(fallback):
+                    action = fallback
+                    break
+        return action(self, round_)
 
     def get_amount(self, _min, _max):
         return random.randint(_min, _max)
@@ -35,24 +44,35 @@ class HoldemAI(NeuralNetwork, BasePlayer):
     #remove after interact is completed
     def act(self, _game):
         parsed = self.input_parser(_game)
-        activated = list(self.activate(parsed))
+        activated = list(self.activate(parsed)[:, 0])
         # output vector interpreted as (raise, call, check, fold, bet_ammount)
         activated[-1] = self.rescale_output(activated[-1])
         return self.output_parser(activated, _game)
 
+    def activate_states(self, states):
+        # network outputs of many decisions at once, one row per DecisionState
+        return self.activate_batch(features.encode_batch(states))
+
+    @staticmethod
+    def fold_ratio(outputs, to_call):
+        """
+        :param outputs: (..., N, 5) network outputs of N decisions
+        :param to_call: (N,) amount to call of every decision
+        :return: share of the decisions facing a bet that output_parser
+        turns into a fold
+        """
+        facing = np.asarray(to_call) > 0
+        # raise, call and fold confidences
+        choices = outputs[..., facing, :][..., [0, 1, 3]]
+        return (choices.argmax(axis=-1) == 2).mean(axis=-1)
+
     def convert_cards(self, cards):
-        return [Card.new(card.parse()) for card in cards]
+        return [card.to_deuces() for card in cards]
 
     def get_win_percent(self, num_opponents, my_cards, community_cards):
-        self.analyzer.set_num_opponents(num_opponents)
-        self.analyzer.set_pocket_cards(*my_cards)
-        for card in community_cards:
-            self.analyzer.community_card(card)
-
         # computes win percentage as proxy for hand data and community data
-        win_percent = self.analyzer.analyze()
-        self.analyzer.reset()
-        return win_percent
+        self.analyzer.set_hand(my_cards, community_cards, num_opponents)
+        return self.analyzer.analyze()
 
     def get_hands_until_dealer(self, round_, active_players):
         result = 0
@@ -64,99 +84,27 @@ class HoldemAI(NeuralNetwork, BasePlayer):
             index = round_.players.index(current_player)
             current_player = round_.players[(index + 1) % len(round_.players)]
 
-    # parses table_state from TableProxy into clean (mostly binary) data for neural network
-    def input_parser(self, _game):
-        inputs = 31 * [0]
+    def decision_state(self, _game):
         round_ = _game.current_round
-        big_blind = round_.small_blind * 2
         players = round_.players
         active_players = round_.active_players
-        num_opponents = len(active_players) - 1
-
-        my_cards = self.convert_cards(self.pocket)
-        community_cards = self.convert_cards(round_.community_cards)
-
-        #HERE STARTS
-        hand = self.convert_cards(self.pocket)
-        community = self.convert_cards(round_.community_cards)
-        my_seat = self.get_hands_until_dealer(round_, active_players) % 8
-        pot = round_.pot.total_pot_money / big_blind
-        tocall = round_.pot.amount_to_call(self) / big_blind
-        lastraise = round_.pot.last_raise / big_blind
-
+        win_percent = self.get_win_percent(len(active_players) - 1,
+                                           self.pocket, round_.community_cards)
+        LOGGER.debug("Win percent: %s", win_percent)
+        return features.DecisionState(
+            self.get_hands_until_dealer(round_, active_players),
+            round_.pot.total_pot_money, round_.decision_context(self).to_call,
+            round_.pot.last_raise, win_percent,
+            [p.money for p in players], [p in active_players for p in players],
+            round_.small_blind * 2)
+
+    # encodes the decision into the network input, see features for the layout
+    # the returned row is reused by the next call
+    def input_parser(self, _game):
         # make note of our own stack
         self.my_stack = self.money
-
-        # setup analyzer
-        self.analyzer.set_num_opponents(num_opponents)
-        self.analyzer.set_pocket_cards(*hand)
-        for card in community:
-            self.analyzer.community_card(card)
-
-        # computes win percentage as proxy for hand data and community data
-        win_percent = self.analyzer.analyze()
-        print("Win percent: ", win_percent)
-        self.analyzer.reset()
-
-        # # binary data
-        # hand_bin = [j for i in [HoldemAI.card_to_binlist(c) for c in hand] for j in i]
-        # community = community + [0]*(5-len(community))
-        # comm_bin = [j for i in [HoldemAI.card_to_binlist(c) for c in community] for j in i]
-        my_seat_bin = HoldemAI.bin_to_binlist(bin(my_seat)[2:].zfill(3))
-
-        # continuous data
-        # normalize chip data by bigblind
-        #for p in players:
-        #    p[1] = p[1]/bigblind
-        #pot = pot/bigblind
-        #tocall = tocall/bigblind
-        #lastraise = lastraise/bigblind
-
-        self.chip_mean = sum([p.money for p in players]) / len(players) / big_blind
-        self.chip_range = self.chip_mean * len(players) / 2
-        print("Chip Mean: ", self.chip_mean)
-        print("Chip Range: ", self.chip_range)
-
-        # avg pot size in 8-person cash table No Limit Hold'em is reported to be ~6-10 big blinds
-        # add: compute rolling average
-        pot_centered = (pot - len(players)) / self.chip_range
-        print("Pot: ", pot)
-        print("Pot centered: ", pot_centered)
-
-        # average to call size will be assumed to be 1/3 of average pot (educated guess)
-        # add: compute rolling average
-        tocall_centered = (tocall - len(players) / 3) / self.chip_range
-
-        # treated same as tocall
-        lastraise_centered = (lastraise - len(players) / 3) / self.chip_range
-
-        # center win percentage
-        win_percent_centered = (win_percent - 0.5) * 2
-
-        # combine binary and continuous data into one vector
-
-        # my_seat_bin  uses 3 inputs
-        inputs_bin = my_seat_bin
-
-        # pot_centered, tocall_centered, lastraise_centered, win_percent_centered each use 1 input
-        inputs_cont = [pot_centered, tocall_centered, lastraise_centered, win_percent_centered]
-
-        # each player addes 1 continuous input, and 2 binary inputs
-        for p in players:
-            p2 = HoldemAI.bin_to_binlist(bin(p in active_players)[2:])
-            p3 = HoldemAI.bin_to_binlist(bin(False)[2:])
-            inputs_bin = inputs_bin + p2 + p3
-            inputs_cont = inputs_cont + [(p.money / big_blind - self.chip_mean) / self.chip_range]
-        if len(players) < 8:
-            inputs_bin = inputs_bin + (8 - len(players)) * [0, 0]
-            inputs_cont = inputs_cont + (8 - len(players)) * [0]
-
-        inputs = HoldemAI.center_bin(inputs_bin) + inputs_cont
-        if len(inputs) < 31:
-            inputs = inputs + (31 - len(inputs)) * [0]
-
-        print("Starts Here")
-        print(*inputs, sep='\n')
+        inputs = features.encode(self.inputs, self.decision_state(_game))
+        LOGGER.debug("Inputs: %s", inputs)
         return inputs
 
     def rescale_output(self,num):
@@ -166,15 +114,16 @@ class HoldemAI(NeuralNetwork, BasePlayer):
     # parses output for PlayerControl
     def output_parser(self, response, _game):
         round_ = _game.current_round
-        tocall = round_.pot.amount_to_call(self)
+        context = round_.decision_context(self)
+        tocall = context.to_call
         my_stack = self.money
         bigblind = round_.small_blind * 2
-        minraise = round_.pot.minimum_to_bet(self)
+        minraise = context.min_bet
 
         bet_size = response[-1]
         bet_size += bigblind -(bet_size % bigblind)
         bet_size = max(bet_size, my_stack)
-        print(response)
+        LOGGER.debug("Response: %s", response)
         # response[0:4] = [raise_confidence, call_confidence, check_confidence, fold_confidence]
         if tocall > 0:
             # choose between raise, call, fold
@@ -196,21 +145,8 @@ class HoldemAI(NeuralNetwork, BasePlayer):
             # 0 - Raise
             # 2 - Check
             move_idx = np.argmax(response[:1] + response[2:-2])
-            print("MoveID: ", move_idx)
+            LOGGER.debug("Move index: %d", move_idx)
             if move_idx == 0:
                 return ('raise', bet_size)
             else:
                 return ('check', 0)
-
-    # takes card from deuces Card class (reprsented by int) and gives its 29 digit binary representation in a list, first 3 bits are unused
-    @staticmethod
-    def card_to_binlist(card):
-        return [ord(b)-48 for b in bin(card)[2:].zfill(29)]
-
-    @staticmethod
-    def bin_to_binlist(bin_num):
-        return [ord(b)-48 for b in bin_num]
-
-    @staticmethod
-    def center_bin(num):
-        return list(map(lambda x: -1 if x==0 else x, num))
@@ -0,0 +1,119 @@
+"""
+Fitness and hall of fame ledger on embedded SQLite.
+
+Replaces the append-only fitness.log / hof_id.log text files. Scores are
+updated in place through an upsert on the agent's primary key and the
+top-k query walks an index on the score, so per-epoch bookkeeping does not
+depend on how much history the ledger holds.
+"""
+import logging
+import os
+import sqlite3
+from threading import Lock
+
+LOGGER = logging.getLogger('ai-ledger')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS fitness (
+    agent TEXT PRIMARY KEY,
+    score INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS fitness_score ON fitness (score);
+CREATE TABLE IF NOT EXISTS hall_of_fame (
+    agent TEXT PRIMARY KEY
+);
+"""
+
+
+class FitnessLedger(object):
+    def __init__(self, path='fitness.db'):
+        self.path = path
+        self._lock = Lock()
+        # the Teacher thread and the XML-RPC teacher proxy share the ledger
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(SCHEMA)
+
+    def add(self, agent, delta):
+        self.add_many([(agent, delta)])
+
+    def add_many(self, deltas):
+        """
+        :param deltas: iterable of (agent, fitness delta) pairs
+        """
+        with self._lock:
+            self._connection.executemany(
+                "INSERT INTO fitness (agent, score) VALUES (?, ?) "
+                "ON CONFLICT (agent) DO UPDATE SET score = score + excluded.score",
+                [(str(agent), delta) for agent, delta in deltas])
+
+    def score(self, agent):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT score FROM fitness WHERE agent = ?",
+                (str(agent),)).fetchone()
+        return row[0] if row else None
+
+    def top(self, n):
+        """
+        :return: list of the n fittest (agent, score) pairs, fittest first
+        """
+        with self._lock:
+            return self._connection.execute(
+                "SELECT agent, score FROM fitness ORDER BY score DESC LIMIT ?",
+                (n,)).fetchall()
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM fitness").fetchone()[0]
+
+    def add_to_hall_of_fame(self, agents):
+        with self._lock:
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO hall_of_fame (agent) VALUES (?)",
+                [(str(agent),) for agent in agents])
+
+    def hall_of_fame(self):
+        """
+        :return: set of the hall of fame agents
+        """
+        with self._lock:
+            return set(row[0] for row in self._connection.execute(
+                "SELECT agent FROM hall_of_fame"))
+
+    def hall_of_fame_scores(self):
+        """
+        :return: dict of the hall of fame agents' scores, 0 if unscored
+        """
+        with self._lock:
+            return dict(self._connection.execute(
+                "SELECT h.agent, COALESCE(f.score, 0) FROM hall_of_fame h "
+                "LEFT JOIN fitness f ON f.agent = h.agent"))
+
+    def commit(self):
+        with self._lock:
+            self._connection.commit()
+
+    def close(self):
+        self.commit()
+        self._connection.close()
+
+    def import_logs(self, fitness_log, hof_log):
+        """
+        Import the text logs written before the ledger existed.
+        fitness.log holds '<score> <agent>' lines, appended every epoch, so
+        the last line of an agent holds its score. hof_id.log holds one
+        agent per line.
+        """
+        if os.path.exists(fitness_log):
+            with open(fitness_log) as f:
+                scores = dict((agent, int(score)) for score, agent in
+                              (line.split() for line in f if line.strip()))
+            self.add_many(scores.items())
+        if os.path.exists(hof_log):
+            with open(hof_log) as f:
+                self.add_to_hall_of_fame(line.strip() for line in f
+                                         if line.strip())
+        self.commit()
+        LOGGER.info("Imported %d agents from %s and %s", len(self),
+                    fitness_log, hof_log)
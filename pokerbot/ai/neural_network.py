@@ -1,39 +1,79 @@
 import numpy as np
 import os
-import sys
+
+from pokerbot.ai.population import PopulationStore, genome_size
 
 class NeuralNetwork(object):
     SAVE_DIR = os.getcwd() + '/pokerbot/data/'
-    def __init__(self, dim, networkID, slope = 0.1):
+    # one population store per network dim, shared by the whole process
+    _stores = {}
+    _readonly = False
+
+    @classmethod
+    def get_store(cls, dim):
+        key = tuple(dim)
+        if key not in cls._stores:
+            cls._stores[key] = PopulationStore(cls.SAVE_DIR, dim, cls._readonly)
+        return cls._stores[key]
+
+    @classmethod
+    def reset_stores(cls, readonly = False):
+        # drop the open stores, they are reopened on next use
+        cls._stores = {}
+        cls._readonly = readonly
+
+    def __init__(self, dim, networkID, slope = 0.1, weights = None, biases = None):
         self.networkID = networkID
         self.dim = list(dim)
         self.num_layers = len(self.dim)
         self.slope = slope
         self.path = NeuralNetwork.SAVE_DIR + str(networkID)
-        try:
-            self.weights = np.load(NeuralNetwork.SAVE_DIR + str(networkID)+'_weights.npy')
-            self.biases = np.load(NeuralNetwork.SAVE_DIR + str(networkID)+'_biases.npy')
-        except Exception as e:
-            print("ERROR")
-            print(e)
-            sys.exit()
+        if weights is not None and biases is not None:
+            # in-memory network, nothing to load
+            self.weights = list(weights)
+            self.biases = list(biases)
+            return
+        stored = self.store.read(networkID)
+        if stored is None:
+            stored = self.load_legacy()
+        if stored is not None:
+            self.weights, self.biases = stored
+        else:
+            # unknown agents start out as random networks
             self.weights = [np.random.randn(y,x)/np.sqrt(x) for x,y in zip(self.dim[:-1], self.dim[1:])]
             self.biases = [np.random.randn(y,1) for y in self.dim[1:]]
 
+    @property
+    def store(self):
+        return NeuralNetwork.get_store(self.dim)
+
+    def load_legacy(self):
+        # networks saved as two .npy files per agent before the population store
+        try:
+            weights = np.load(self.path + '_weights.npy', allow_pickle=True)
+            biases = np.load(self.path + '_biases.npy', allow_pickle=True)
+        except IOError:
+            return None
+        return list(weights), list(biases)
+
     def activate(self, inputs):
-        a = np.array([inputs]).transpose()
-        assert a.shape == (self.dim[0],1)
+        # single decision, returned as a column vector
+        # float32 feature rows are passed on as a view, not copied
+        return self.activate_batch(np.asarray(inputs)[None, :]).T
+
+    def activate_batch(self, inputs):
+        # inputs is an (N, dim[0]) matrix, one decision per row, of any
+        # float dtype
+        a = inputs
         for b, w in zip(self.biases, self.weights):
-            a = NeuralNetwork.sigmoid(np.dot(w,a)+b, self.slope)
+            a = NeuralNetwork.sigmoid(np.dot(a, w.T) + b.T, self.slope)
         return a
 
     def save(self):
-        np.save(NeuralNetwork.SAVE_DIR + str(self.networkID)+'_weights.npy', self.weights)
-        np.save(NeuralNetwork.SAVE_DIR + str(self.networkID)+'_biases.npy', self.biases)
+        self.store.write(self.networkID, self.weights, self.biases)
 
     def delete(self):
-        os.remove(NeuralNetwork.SAVE_DIR + str(self.networkID)+'_weights.npy')
-        os.remove(NeuralNetwork.SAVE_DIR + str(self.networkID)+'_biases.npy')
+        self.store.delete(self.networkID)
 
     def print_weights(self):
         for w in self.weights:
@@ -84,3 +124,96 @@ class NeuralNetwork(object):
     @staticmethod
     def sigmoid_prime(x, slope):
         return slope*(1- (np.tanh(slope*x)**2))
+
+
+class NetworkStack(object):
+    """
+    Networks of identical dim with their weights stacked into 3-D tensors,
+    so a whole population is evaluated with one einsum per layer.
+    """
+    def __init__(self, dim, weights, biases, slopes, ids=None):
+        """
+        :param weights: per layer (P, y, x) tensors
+        :param biases: per layer (P, y) matrices
+        :param slopes: (P,) sigmoid slopes
+        """
+        self.dim = list(dim)
+        self.weights = weights
+        self.biases = biases
+        self.slopes = np.asarray(slopes, dtype=float)[:, None, None]
+        self.ids = list(range(len(self.slopes))) if ids is None else list(ids)
+        self.index = dict((networkID, i) for i, networkID in enumerate(self.ids))
+
+    @classmethod
+    def from_networks(cls, networks):
+        networks = list(networks)
+        dim = networks[0].dim
+        if any(n.dim != dim for n in networks):
+            raise ValueError("Can only stack networks with identical dim")
+        layers = range(len(dim) - 1)
+        return cls(dim,
+                   [np.stack([n.weights[l] for n in networks]) for l in layers],
+                   [np.stack([n.biases[l][:, 0] for n in networks]) for l in layers],
+                   [n.slope for n in networks],
+                   [n.networkID for n in networks])
+
+    @classmethod
+    def from_genomes(cls, dim, genomes, ids=None, slope=0.1):
+        """
+        Stack the rows of a (P, genome_size) matrix as laid out by the
+        population store, without building a network per genome.
+        """
+        genomes = np.asarray(genomes)
+        if genomes.shape[1] != genome_size(dim):
+            raise ValueError("Genomes do not match dim %s" % (dim,))
+        weights, biases = [], []
+        offset = 0
+        for x, y in zip(dim[:-1], dim[1:]):
+            weights.append(genomes[:, offset:offset + y * x].reshape(-1, y, x))
+            offset += y * x
+        for y in dim[1:]:
+            biases.append(genomes[:, offset:offset + y])
+            offset += y
+        return cls(dim, weights, biases, np.full(len(genomes), slope), ids)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def activate(self, inputs):
+        """
+        :param inputs: (P, N, dim[0]) - N decisions for each of the P networks,
+        or (P, dim[0]) - a single decision per network
+        :return: (P, N, dim[-1]) or (P, dim[-1]) outputs
+        """
+        a = np.asarray(inputs)
+        single = a.ndim == 2
+        if single:
+            a = a[:, None, :]
+        for w, b in zip(self.weights, self.biases):
+            a = np.tanh(self.slopes * (np.einsum('pyx,pnx->pny', w, a) + b[:, None, :]))
+        return a[:, 0, :] if single else a
+
+    def activate_shared(self, inputs):
+        """
+        Evaluate every network on the same decisions.
+        :param inputs: (N, dim[0]) matrix, e.g. from features.encode_batch
+        :return: (P, N, dim[-1]) outputs
+        """
+        a = np.asarray(inputs)
+        for layer, (w, b) in enumerate(zip(self.weights, self.biases)):
+            product = np.einsum('pyx,nx->pny', w, a) if layer == 0 else \
+                np.einsum('pyx,pnx->pny', w, a)
+            a = np.tanh(self.slopes * (product + b[:, None, :]))
+        return a
+
+
+def stack_networks(networks):
+    """
+    Group networks by dim.
+    :return: dict of tuple(dim) -> NetworkStack
+    """
+    groups = {}
+    for network in networks:
+        groups.setdefault(tuple(network.dim), []).append(network)
+    return dict((dim, NetworkStack.from_networks(group))
+                for dim, group in groups.items())
@@ -1,7 +1,7 @@
 import xmlrpc.client
 
 class Player(object):
-    def __init__(self, host, port, playerID, name, stack, emptyplayer = False):
+    def __init__(self, host, port, playerID, name, stack, emptyplayer = False, control = None):
         self._host = host
         self._port = port
         self._name = name
@@ -10,7 +10,6 @@ class Player(object):
         self.hand = []
         self.stack = stack
         self.currentbet = 0
-        self.lastsidepot = 0
         self._seat = -1
         self.handrank = None
 
@@ -23,7 +22,11 @@ class Player(object):
         self.sitting_out = True
 
         self._address = 'http://%s:%s' % (host, port)
-        self.server = xmlrpc.client.ServerProxy(self._address)
+        # in-process players are called directly instead of over XML-RPC
+        if control is not None:
+            self.server = control
+        else:
+            self.server = xmlrpc.client.ServerProxy(self._address)
 
     def get_seat(self):
         return self._seat
@@ -37,7 +40,6 @@ class Player(object):
         self.betting = False
         self.isallin = False
         self.currentbet = 0
-        self.lastsidepot = 0
         self.playing_hand = (self.stack != 0)
 
     def bet(self, bet_size):
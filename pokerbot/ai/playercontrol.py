@@ -1,3 +1,4 @@
+import logging
 import numpy as np
 import uuid
 from threading import Thread
@@ -8,21 +9,30 @@ from xmlrpc.server import SimpleXMLRPCServer
 from pokerbot.ai.holdemai import HoldemAI
 from pokerbot.deuces.deuces import Card
 
+LOGGER = logging.getLogger('ai-playercontrol')
+
 # xmlrpc.client.Marshaller.dispatch[long] = lambda _, v, w: w("<value><i8>%d</i8></value>" % v)
 # xmlrpc.client.Marshaller.dispatch[type(0)] = lambda _, v, w: w("<value><i8>%d</i8></value>" % v)
 
 class PlayerControl(object):
-    def __init__(self, host, port, playerID, ai_flag = False, ai_type = -1, name = 'Alice', stack = 2000):
-        self.server = xmlrpc.client.ServerProxy('http://0.0.0.0:8000')
+    def __init__(self, host, port, playerID, ai_flag = False, ai_type = -1, name = 'Alice', stack = 2000, table = None, rng = None):
+        # with a local table moves are dispatched in-process, without XML-RPC
+        self._table = table
+        if table is not None:
+            self.server = table
+        else:
+            self.server = xmlrpc.client.ServerProxy('http://0.0.0.0:8000')
         self.daemon = True
 
         self._ai_flag = ai_flag
+        # random generator of the networks' win ratio estimates
+        self.rng = rng
         self.playerID = playerID
 
         if self._ai_flag:
             self._ai_type = ai_type
             if self._ai_type == 0:
-                self.ai = HoldemAI("Name", uuid.uuid4())
+                self.ai = HoldemAI("Name", ID = str(uuid.uuid4()), rng = self.rng)
                 # print(self.ai.networkID)
         self._name = name
         self.host = host
@@ -39,11 +49,11 @@ class PlayerControl(object):
 
     def save_ai_state(self):
         if self._ai_flag and self._ai_type == 0:
-            print('AI type NEURAL NETWORK won (', self.get_ai_id(), ')')
+            LOGGER.info('AI type NEURAL NETWORK won (%s)', self.get_ai_id())
             # self.writer.write([self.ai.networkID, consec_wins])
             self.ai.save()
         else:
-            print('AI type ', self._ai_type, 'won')
+            LOGGER.info('AI type %s won', self._ai_type)
 
     def delete_ai(self):
         if self._ai_type == 0:
@@ -53,11 +63,14 @@ class PlayerControl(object):
         if ai_id == 'unchanged':
             pass
         else:
-            self.ai = HoldemAI("Name", ai_id) # defaults to random network if ai_id not recognized
+            self.ai = HoldemAI("Name", ID = ai_id, rng = self.rng) # defaults to random network if ai_id not recognized
 
     def add_player(self):
         # print('Player', self.playerID, 'joining game')
-        self.server.add_player(self.host, self.port, self.playerID, self._name, self._stack)
+        if self._table is not None:
+            self._table.add_player(self.host, self.port, self.playerID, self._name, self._stack, self)
+        else:
+            self.server.add_player(self.host, self.port, self.playerID, self._name, self._stack)
 
     def remove_player(self):
         self.server.remove_player(self.playerID)
@@ -0,0 +1,163 @@
+"""
+Population weight store.
+
+All genomes (the flattened weights and biases of a network) of one network
+shape live in a single memory-mapped .npy file, one row per agent:
+
+    id      - the agent uuid, empty for rows that were never used
+    live    - False once the agent was deleted (tombstone)
+    genome  - weights followed by biases, layer by layer
+
+The uuid -> row index is rebuilt from the id column when the store is
+opened, so writing or deleting an agent only touches its own row. Deleted
+rows are reclaimed by ``compact``.
+"""
+import logging
+import os
+
+import numpy as np
+
+LOGGER = logging.getLogger('ai-population')
+
+ID_LENGTH = 36
+INITIAL_CAPACITY = 1024
+
+
+def genome_size(dim):
+    return sum(y * x + y for x, y in zip(dim[:-1], dim[1:]))
+
+
+def to_genome(weights, biases):
+    return np.concatenate([np.ravel(w) for w in weights] +
+                          [np.ravel(b) for b in biases])
+
+
+def from_genome(genome, dim):
+    """
+    :return: (weights, biases) lists shaped like NeuralNetwork's
+    """
+    weights, biases = [], []
+    offset = 0
+    for x, y in zip(dim[:-1], dim[1:]):
+        weights.append(np.array(genome[offset:offset + y * x]).reshape(y, x))
+        offset += y * x
+    for y in dim[1:]:
+        biases.append(np.array(genome[offset:offset + y]).reshape(y, 1))
+        offset += y
+    return weights, biases
+
+
+class PopulationStore(object):
+    def __init__(self, directory, dim, readonly=False):
+        self.dim = list(dim)
+        self.readonly = readonly
+        self.path = os.path.join(
+            directory, 'population_%s.npy' % '-'.join(str(d) for d in dim))
+        self.dtype = np.dtype([('id', 'S%d' % ID_LENGTH), ('live', '?'),
+                               ('genome', 'f8', (genome_size(dim),))])
+        self.index = {}
+        self.size = 0
+        self.tombstones = 0
+        self._rows = None
+        self.open()
+
+    def open(self):
+        if os.path.exists(self.path):
+            self._rows = np.load(self.path, mmap_mode='r' if self.readonly else 'r+')
+        else:
+            # the file is only created by the first write
+            self._rows = np.zeros(0, dtype=self.dtype)
+        ids = self._rows['id']
+        used = np.flatnonzero(ids != b'')
+        self.size = int(used[-1]) + 1 if len(used) else 0
+        live = self._rows['live'][:self.size]
+        self.index = dict((ids[row].decode(), int(row))
+                          for row in np.flatnonzero(live))
+        self.tombstones = self.size - len(self.index)
+
+    def _create(self, path, capacity):
+        return np.lib.format.open_memmap(path, mode='w+', dtype=self.dtype,
+                                         shape=(capacity,))
+
+    def __contains__(self, uuid):
+        return str(uuid) in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    @property
+    def capacity(self):
+        return len(self._rows)
+
+    def genomes(self):
+        """
+        :return: (uuids, genomes) of all live agents, genomes as an
+        (agents, genome_size) array
+        """
+        rows = sorted(self.index.items(), key=lambda item: item[1])
+        return ([uuid for uuid, _ in rows],
+                self._rows['genome'][[row for _, row in rows]])
+
+    def read(self, uuid):
+        """
+        :return: (weights, biases) of an agent, None if it is not stored
+        """
+        row = self.index.get(str(uuid))
+        if row is None:
+            return None
+        return from_genome(self._rows['genome'][row], self.dim)
+
+    def read_genomes(self, uuids):
+        """
+        :return: (len(uuids), genome_size) array of the agents' genomes
+        """
+        return self._rows['genome'][[self.index[str(uuid)] for uuid in uuids]]
+
+    def write(self, uuid, weights, biases):
+        self.write_genome(uuid, to_genome(weights, biases))
+
+    def write_genome(self, uuid, genome):
+        uuid = str(uuid)
+        row = self.index.get(uuid)
+        if row is None:
+            if self.size == self.capacity:
+                self._grow()
+            row = self.size
+            self.size += 1
+            self._rows['id'][row] = uuid.encode()
+            self._rows['live'][row] = True
+            self.index[uuid] = row
+        self._rows['genome'][row] = genome
+
+    def delete(self, uuid):
+        row = self.index.pop(str(uuid), None)
+        if row is None:
+            raise KeyError(uuid)
+        self._rows['live'][row] = False
+        self.tombstones += 1
+
+    def _grow(self):
+        self._replace(self._rows[:self.size], max(INITIAL_CAPACITY, 2 * self.capacity))
+
+    def _replace(self, rows, capacity):
+        temp_path = self.path + '.tmp'
+        new_rows = self._create(temp_path, capacity)
+        new_rows[:len(rows)] = rows
+        new_rows.flush()
+        del new_rows
+        self._rows = None
+        os.replace(temp_path, self.path)
+        self.open()
+
+    def compact(self):
+        """
+        Drop the rows of deleted agents, keeping the live ones in order.
+        """
+        live = self._rows[:self.size][self._rows['live'][:self.size]]
+        LOGGER.info("Compacting population: %d live, %d deleted",
+                    len(live), self.tombstones)
+        self._replace(live, max(INITIAL_CAPACITY, len(live)))
+
+    def flush(self):
+        if isinstance(self._rows, np.memmap):
+            self._rows.flush()
@@ -0,0 +1,137 @@
+"""
+Precomputed preflop tables for the 169 canonical starting hands.
+
+A starting hand is identified by its two ranks and whether it is suited,
+which gives a 13x13 grid: pairs on the diagonal, suited hands above it
+(high rank row, low rank column) and offsuit hands below it.
+
+The tables are generated offline and shipped in pokerbot/data:
+    python -m pokerbot.ai.preflop [rollouts]
+
+* ``preflop_equity.npy`` - (169, MAX_OPPONENTS) outright win ratio against
+  1 to MAX_OPPONENTS random hands, the same quantity ``Analyzer.analyze``
+  estimates
+* ``preflop_naive_rank.npy`` - (169,) average hand category over all flops,
+  the preflop value of ``utils.naive_rank``
+
+Both are memory-mapped on first use instead of being read into memory.
+"""
+from itertools import combinations
+import logging
+import os
+import sys
+
+import numpy as np
+
+from pokerbot.ai import equity
+from pokerbot.poker import evaluator
+
+LOGGER = logging.getLogger('ai-preflop')
+
+MAX_OPPONENTS = 7
+HANDS = evaluator.RANKS * evaluator.RANKS
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
+EQUITY_FILE = os.path.join(DATA_DIR, 'preflop_equity.npy')
+NAIVE_RANK_FILE = os.path.join(DATA_DIR, 'preflop_naive_rank.npy')
+
+_tables = {}
+
+
+def hand_index(card1, card2):
+    """
+    :return: canonical index (0-168) of a starting hand
+    """
+    card1, card2 = evaluator.encode(card1), evaluator.encode(card2)
+    high, low = sorted((evaluator.CARD_RANK[card1],
+                        evaluator.CARD_RANK[card2]), reverse=True)
+    if evaluator.CARD_SUIT[card1] == evaluator.CARD_SUIT[card2]:
+        return high * evaluator.RANKS + low
+    return low * evaluator.RANKS + high
+
+
+def representative(index):
+    """
+    :return: a pair of packed cards for a canonical hand index
+    """
+    row, column = divmod(index, evaluator.RANKS)
+    suits = (0, 0) if row > column else (0, 1)
+    return (row * evaluator.SUITS + suits[0],
+            column * evaluator.SUITS + suits[1])
+
+
+def _load(path):
+    if path not in _tables:
+        try:
+            _tables[path] = np.load(path, mmap_mode='r')
+        except IOError:
+            LOGGER.warning("Preflop table %s is missing, run "
+                           "'python -m pokerbot.ai.preflop'", path)
+            _tables[path] = None
+    return _tables[path]
+
+
+def equity_table():
+    return _load(EQUITY_FILE)
+
+
+def naive_rank_table():
+    return _load(NAIVE_RANK_FILE)
+
+
+def win_ratio(pocket, num_opponents):
+    """
+    :return: precomputed win ratio of a pocket against num_opponents random
+    hands, None if it is not in the table
+    """
+    table = equity_table()
+    if table is None or not 1 <= num_opponents <= MAX_OPPONENTS:
+        return None
+    return float(table[hand_index(*pocket), num_opponents - 1])
+
+
+def naive_rank(pocket):
+    """
+    :return: precomputed preflop naive rank of a pocket, None if missing
+    """
+    table = naive_rank_table()
+    if table is None:
+        return None
+    return float(table[hand_index(*pocket)])
+
+
+def generate_equity(rollouts, rng):
+    table = np.zeros((HANDS, MAX_OPPONENTS))
+    for index in range(HANDS):
+        pocket = representative(index)
+        for opponents in range(1, MAX_OPPONENTS + 1):
+            table[index, opponents - 1] = equity.win_ratio(
+                pocket, [], opponents, rollouts, rng)
+        LOGGER.info("%d/%d hands done", index + 1, HANDS)
+    return table
+
+
+def generate_naive_rank():
+    table = np.zeros(HANDS)
+    for index in range(HANDS):
+        pocket = representative(index)
+        flops = np.array(list(combinations(
+            equity.remaining_cards(pocket), 3)))
+        hands = np.empty((len(flops), 5), dtype=np.int64)
+        hands[:, :2] = pocket
+        hands[:, 2:] = flops
+        table[index] = (equity.evaluate_batch(hands) >>
+                        evaluator.CATEGORY_SHIFT).mean()
+    return table
+
+
+def main(rollouts=20000):
+    rng = np.random.default_rng(0)
+    np.save(NAIVE_RANK_FILE, generate_naive_rank())
+    np.save(EQUITY_FILE, generate_equity(rollouts, rng))
+    _tables.clear()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -1,11 +1,8 @@
 import logging
 import random
-from pokerbot.ai import utils
-import multiprocessing
+from pokerbot.ai import utils, preflop
 from pokerbot.poker.player import Call, Fold, Bet, Check
 
-pool = multiprocessing.Pool(max(multiprocessing.cpu_count() // 2, 1))
-
 LOGGER = logging.getLogger("ai-strategies")
 
 
@@ -16,17 +13,28 @@ class CFRDistribution:
         self.fold = int(fold * 100)
         self.bet = int(bet * 100)
         self.check = int(check * 100)
-        self.distributions = {
-            self.call: Call,
-            self.fold: Fold,
-            self.bet: Bet,
-            self.check: Check
-        }
+        # (weight, action) pairs, equal weights must not collapse
+        self.distributions = [
+            (self.call, Call),
+            (self.fold, Fold),
+            (self.bet, Bet),
+            (self.check, Check)
+        ]
 
-    def decision(self):
-        s = random.randint(1, sum((self.call, self.fold, self.bet, self.check,)))
-        print(self.distributions)
-        for (weight, value) in self.distributions.items():
+    def decision(self, actions=None):
+        """
+        :param actions: the legal actions to choose from, all by default
+        """
+        LOGGER.debug("Distribution: %s", self.distributions)
+        choices = [(weight, value) for weight, value in self.distributions
+                   if actions is None or value in actions]
+        total = sum(weight for weight, _ in choices)
+        if not total:
+            if not choices:
+                raise Exception("Error while fetching decision")
+            return random.choice(choices)[1]
+        s = random.randint(1, total)
+        for (weight, value) in choices:
             s -= weight
             if s <= 0:
                 return value
@@ -41,26 +49,37 @@ class PokerStrategy:
         self.check_bias = check_bias
 
     def rank(self, _game):
+        """
+        :return: one of the betting player's legal actions
+        """
         raise Exception("not implemented")
 
 
 def make_args_from_cards(cards):
-    return tuple((c.value, c.suit) for c in cards)
+    # cards are packed ints, send them to the workers as plain ints
+    return tuple(int(c) for c in cards)
 
 
 class SimpleSaneStrategy(PokerStrategy):
     def rank(self, _game):
         _round = _game.current_round
         # ranks are 0 - 8 in naive rank
-        v = utils.naive_rank(make_args_from_cards(_round.betting_player.pocket),
-                                                     make_args_from_cards(_round.community_cards))
+        v = None
+        if not _round.community_cards:
+            v = preflop.naive_rank(_round.betting_player.pocket)
+        elif len(_round.community_cards) == 5:
+            # nothing is left to come, the made hand is the naive rank
+            v = _round.betting_player.hand_state.category
+        if v is None:
+            v = utils.naive_rank(make_args_from_cards(_round.betting_player.pocket),
+                                 make_args_from_cards(_round.community_cards))
         if _round.community_cards:
             # if community cards exist - remove their detached value from hand value
             community_v =utils.naive_rank(make_args_from_cards(_round.community_cards), tuple())
             v = v - community_v
         else:
             LOGGER.info("no community cards, fetching hand value")
-        LOGGER.info("v: %f" % v)
+        LOGGER.info("v: %f", v)
         if v < 0.7:
             dist = CFRDistribution(0.05, 0.7, 0.05, 0.2)
         elif v < 1:
@@ -71,8 +90,10 @@ class SimpleSaneStrategy(PokerStrategy):
             dist = CFRDistribution(0.35, 0.1, 0.25, 0.4)
         else:
             dist = CFRDistribution(0.45, 0.05, 0.3, 0.1)
-        LOGGER.info("ai player dist: %s" % dist)
-        return dist.decision()
+        LOGGER.info("ai player dist: %s", dist)
+        # sample only what the round allows, not until it allows it
+        return dist.decision(
+            _round.decision_context(_round.betting_player).actions)
 
 # def randomize_sample(community_count):
 #     _deck = deck.Deck()
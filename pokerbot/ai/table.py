@@ -1,3 +1,4 @@
+import logging
 import time
 import uuid
 from threading import Thread, Lock
@@ -6,11 +7,17 @@ from xmlrpc.server import SimpleXMLRPCServer
 
 from pokerbot.deuces.deuces import Card, Deck, Evaluator
 from pokerbot.ai.player import Player
+from pokerbot.poker.potstate import PotState
+from pokerbot.poker.seats import SeatRing
+from pokerbot.poker import showdown
+from pokerbot import logs
+
+LOGGER = logging.getLogger('ai-table')
 
 class Table(object):
     BLIND_INCREMENTS = [[10,25],[25,50],[50,100],[75,150],[100,200],[150,300],[200,400],[300,600],[400,800],[500,10000],[600,1200],[800,1600],[1000,2000]]
 
-    def __init__(self, seats = 8, quiet = False, training = False):
+    def __init__(self, seats = 8, quiet = False, training = False, teacher = None):
         self._blind_index = 0
         [self._smallblind, self._bigblind] = [2, 4]
         self._deck = Deck()
@@ -21,9 +28,9 @@ class Table(object):
         self._button = 0
         self._discard = []
 
-        self._side_pots = [0]*seats
-        self._current_sidepot = 0 # index of _side_pots
-        self._totalpot = 0
+        self._pot = PotState()
+        # turn order of the current hand
+        self._turns = None
 
         self._tocall = 0
         self._lastraise = 0
@@ -34,9 +41,16 @@ class Table(object):
         self.emptyseats = seats
         self._player_dict = {}
 
-        self.teacher = xmlrpc.client.ServerProxy('http://0.0.0.0:8080')
+        # a local teacher is notified directly, otherwise through TeacherProxy
+        if teacher is not None:
+            self.teacher = teacher
+        else:
+            self.teacher = xmlrpc.client.ServerProxy('http://0.0.0.0:8080')
 
         self._quiet = quiet
+        if not quiet:
+            # the hand progress used to be printed unconditionally
+            logs.set_level('ai-table', logging.INFO, stream=True)
         self._training = training
         self._run_thread = Thread(target = self.run, args=())
         self._run_thread.daemon = True
@@ -66,11 +80,11 @@ class Table(object):
             # if not answer:
             self.start_hand(players)
             self._number_of_hands += 1
-            if not self._quiet:
-                print('Starting game number: ', self._number_of_hands)
+            if LOGGER.isEnabledFor(logging.INFO):
+                LOGGER.info('Starting game number: %d', self._number_of_hands)
                 for p in self._seats:
                     if p.playing_hand:
-                        print('Player ',p.playerID, ' stack size: ', p.stack)
+                        LOGGER.info('Player %s stack size: %d', p.playerID, p.stack)
 
             # increment blinds every 15 hands (based on avg hands/hour of 30)
             if (self._number_of_hands % 15) == 0 and self._number_of_hands < 60:
@@ -84,7 +98,7 @@ class Table(object):
                 break
 
             if self._number_of_hands == 200:
-                print('no winner in 200 hands')
+                LOGGER.warning('no winner in 200 hands')
                 break
 
     def start_hand(self, players):
@@ -92,19 +106,20 @@ class Table(object):
         assert sum([p.stack for p in players]) == 2000*len(self._seats)
         self.new_round()
         self._round=0
+        turns = self._turns = SeatRing(players)
 
         player = self._first_to_act(players)
 
         self.post_smallblind(player)
-        player = self._next(players, player)
+        player = turns.after(player)
         self.post_bigblind(player)
-        player = self._next(players, player)
+        player = turns.next_to_act(player)
 
         self._tocall = self._bigblind
 
         # rounds
         self._round = 0
-        while self._round<4 and len(players)>1:
+        while self._round<4 and len(turns.active)>1:
             if self._round == 0:
                 self.deal()
             elif self._round == 1:
@@ -114,53 +129,40 @@ class Table(object):
             elif self._round ==3:
                 self.river()
 
-            folded_players = []
-            while not player.playedthisround and len([p for p in players if not p.isallin]) >=1:
-                if player.isallin:
-                    # print('player ', player.playerID, 'is all in, skipping their turn')
-                    player = self._next(players, player)
-                    continue
+            # the ring skips folded and all-in players, None once everybody
+            # acted since the last raise
+            while player is not None:
                 # print('requesting move from ',player.playerID)
                 move = player.server.player_move(self.output_state(player))
 
                 if move[0] == 'call':
                     self.player_bet(player, self._tocall)
-                    if not self._quiet:
-                        print('Player', player.playerID, move)
-                    player = self._next(players, player)
+                    turns.act(player)
                 elif move[0] == 'check':
                     self.player_bet(player, player.currentbet)
-                    if not self._quiet:
-                        print('Player', player.playerID, move)
-                    player = self._next(players, player)
+                    turns.act(player)
                 elif move[0] == 'raise':
                     self.player_bet(player, move[1]+player.currentbet)
-                    if not self._quiet:
-                        print('Player', player.playerID, move)
-                    for p in players:
-                        if p != player:
-                            p.playedthisround = False
-                    player = self._next(players, player)
+                    turns.act(player, raised=True)
                 elif move[0] == 'fold':
                     player.playing_hand = False
-                    folded_player = player
-                    if not self._quiet:
-                        print('Player', player.playerID, move)
-                    player = self._next(players, player)
-                    players.remove(folded_player)
-                    folded_players.append(folded_player)
-                    # break if a single player left
-                    if len(players) ==1:
-                        break
-
-            player = self._first_to_act(players)
-            self.resolve_sidepots(players + folded_players)
+                    self._pot.fold(player)
+                    turns.fold(player)
+                LOGGER.info('Player %s %s', player.playerID, move)
+                # break if a single player left
+                if len(turns.active) == 1:
+                    break
+                player = turns.next_to_act(player)
+
+            turns.new_street()
+            player = self._first_to_act(turns.active)
+            if not turns.is_waiting(player):
+                player = turns.next_to_act(player)
             self.new_round()
-            if not self._quiet:
-                print('totalpot', self._totalpot)
-            assert sum([p.stack for p in self._seats]) + self._totalpot == 2000*len(self._seats)
+            LOGGER.info('totalpot %d', self._pot.total)
+            assert sum([p.stack for p in self._seats]) + self._pot.total == 2000*len(self._seats)
 
-        self.resolve_game(players)
+        self.resolve_game(turns.active)
         self.reset()
 
     def increment_blinds(self):
@@ -169,16 +171,12 @@ class Table(object):
         #[self._smallblind, self._bigblind] = Table.BLIND_INCREMENTS[self._blind_index]
 
     def post_smallblind(self, player):
-        if not self._quiet:
-            print('player ', player.playerID, 'small blind', self._smallblind)
+        LOGGER.info('player %s small blind %d', player.playerID, self._smallblind)
         self.player_bet(player, self._smallblind)
-        player.playedthisround = False
 
     def post_bigblind(self, player):
-        if not self._quiet:
-            print('player ', player.playerID, 'big blind', self._bigblind)
+        LOGGER.info('player %s big blind %d', player.playerID, self._bigblind)
         self.player_bet(player, self._bigblind)
-        player.playedthisround = False
         self._lastraise = self._bigblind
 
     def player_bet(self, player, total_bet):
@@ -186,26 +184,26 @@ class Table(object):
         # total_bet is the total contribution by player to pot in this round
         relative_bet = min(player.stack, total_bet - player.currentbet)
         player.bet(relative_bet + player.currentbet)
+        self._pot.add(player, relative_bet, player.isallin)
+        if player.isallin:
+            self._turns.go_all_in(player)
 
-        self._totalpot += relative_bet
         self._tocall = max(self._tocall, total_bet)
         if self._tocall >0:
             self._tocall = max(self._tocall, self._bigblind)
         self._lastraise = max(self._lastraise, relative_bet  - self._lastraise)
 
     def _first_to_act(self, players):
-        if self._round == 0 and len(players) == 2:
-            return self._next(sorted(players + [self._seats[self._button]], key=lambda x:x.get_seat()), self._seats[self._button])
+        button = self._seats[self._button]
+        if self._round == 0 and len(players) == 2 and button in players:
+            # heads up the button acts first
+            return button
         try:
             first = [player for player in players if player.get_seat() > self._button][0]
         except IndexError:
             first = players[0]
         return first
 
-    def _next(self, players, current_player):
-        idx = players.index(current_player)
-        return players[(idx+1) % len(players)]
-
     def deal(self):
         for player in self._seats:
             if player.playing_hand:
@@ -223,9 +221,9 @@ class Table(object):
         self._discard.append(self._deck.draw(1)) #burn
         self.community.append(self._deck.draw(1))
 
-    def add_player(self, host, port, playerID, name, stack):
+    def add_player(self, host, port, playerID, name, stack, control = None):
         if playerID not in self._player_dict:
-            new_player = Player(host, port, playerID, name, stack)
+            new_player = Player(host, port, playerID, name, stack, control = control)
             for i,player in enumerate(self._seats):
                 if player.emptyplayer:
                     self._seats[i] = new_player
@@ -250,34 +248,6 @@ class Table(object):
         except ValueError:
             pass
 
-    def resolve_sidepots(self, players_playing):
-        players = [p for p in players_playing if p.currentbet]
-        if not self._quiet:
-            print('current bets: ', [p.currentbet for p in players])
-            print('playing hand: ', [p.playing_hand for p in players])
-        if not players:
-            return
-        try:
-            smallest_bet = min([p.currentbet for p in players if p.playing_hand])
-        except ValueError:
-            for p in players:
-                self._side_pots[self._current_sidepot] += p.currentbet
-                p.currentbet = 0
-            return
-
-        smallest_players_allin = [p for p,bet in zip(players, [p.currentbet for p in players]) if bet == smallest_bet and p.isallin]
-
-        for p in players:
-            self._side_pots[self._current_sidepot] += min(smallest_bet, p.currentbet)
-            p.currentbet -= min(smallest_bet, p.currentbet)
-            p.lastsidepot = self._current_sidepot
-
-        if smallest_players_allin:
-            self._current_sidepot += 1
-            self.resolve_sidepots(players)
-        if not self._quiet:
-            print('sidepots: ', self._side_pots)
-
     def new_round(self):
         for player in self._player_dict.values():
             player.currentbet = 0
@@ -289,47 +259,29 @@ class Table(object):
     def resolve_game(self, players):
         # print('Community cards: ', end='')
         # Card.print_pretty_cards(self.community)
-        if len(players)==1:
-            players[0].refund(sum(self._side_pots))
-            # print('Player', players[0].playerID, 'wins the pot (',sum(self._side_pots),')')
-            self._totalpot = 0
-        else:
-            # compute hand ranks
+        # compute hand ranks, deuces ranks the best hand lowest
+        strengths = {}
+        if len(players) > 1:
             for player in players:
                 player.handrank = self._evaluator.evaluate(player.hand, self.community)
-
-            # trim side_pots to only include the non-empty side pots
-            temp_pots = [pot for pot in self._side_pots if pot>0]
-
-            # compute who wins each side pot and pay winners
-            for pot_idx,_ in enumerate(temp_pots):
-                # print('players last pots', [(p.playerID, p.lastsidepot) for p in players])
-
-                # find players involved in given side_pot, compute the winner(s)
-                pot_contributors = [p for p in players if p.lastsidepot >= pot_idx]
-                winning_rank = min([p.handrank for p in pot_contributors])
-                winning_players = [p for p in pot_contributors if p.handrank == winning_rank]
-
-                for player in winning_players:
-                    split_amount = int(self._side_pots[pot_idx]/len(winning_players))
-                    if not self._quiet:
-                        print('Player', player.playerID, 'wins side pot (',int(self._side_pots[pot_idx]/len(winning_players)),')')
-                    player.refund(split_amount)
-                    self._side_pots[pot_idx] -= split_amount
-
-                # any remaining chips after splitting go to the winner in the earliest position
-                if self._side_pots[pot_idx]:
-                    earliest = self._first_to_act([player for player in winning_players])
-                    earliest.refund(self._side_pots[pot_idx])
+                strengths[player] = -player.handrank
+
+        # odd chips go to the winners in the earliest position
+        order = sorted(players, key=lambda p: (p.get_seat() <= self._button, p.get_seat()))
+        result = showdown.resolve(self._pot, strengths, order)
+        for award in result.pots:
+            LOGGER.info('Players %s win side pot %d %s', [p.playerID for p in award.winners],
+                        award.amount, award.shares)
+        for player, amount in result.winnings.items():
+            player.refund(amount)
+        return result
 
     def reset(self):
         for player in self._seats:
             if not player.emptyplayer and not player.sitting_out:
                 player.reset_hand()
         self.community = []
-        self._current_sidepot = 0
-        self._totalpot = 0
-        self._side_pots = [0]*len(self._seats)
+        self._pot.reset()
         self._deck.shuffle()
 
         self._button = (self._button + 1) % len(self._seats)
@@ -341,7 +293,7 @@ class Table(object):
         'community':self.community,
         'my_seat':current_player.get_seat(),
         'pocket_cards':current_player.hand,
-        'pot':self._totalpot,
+        'pot':self._pot.total,
         'button':self._button,
         'tocall':(self._tocall-current_player.currentbet),
         'stack':current_player.stack,
@@ -1,4 +1,6 @@
+import logging
 import numpy as np
+import os
 import random
 import uuid
 
@@ -7,28 +9,60 @@ from threading import Thread, Lock
 from xmlrpc.server import SimpleXMLRPCServer
 
 from pokerbot.ai.table import Table, TableProxy
-from pokerbot.ai.neural_network import NeuralNetwork
+from pokerbot.ai.neural_network import NeuralNetwork, NetworkStack
+from pokerbot.ai.holdemai import HoldemAI
 from pokerbot.ai.playercontrol import PlayerControl, PlayerControlProxy
+from pokerbot.ai.tournament import TournamentRunner
+from pokerbot.ai import features, genetics
+from pokerbot.ai.ledger import FitnessLedger
+
+LOGGER = logging.getLogger('ai-teacher')
+
+# number of probe decisions children are screened on before they play
+PROBE_DECISIONS = 200
 
 class Teacher(Thread):
-    def __init__(self, seats, n_hof, n_total, n_epochs, quiet = False):
+    def __init__(self, seats, n_hof, n_total, n_epochs, quiet = False, direct = False, workers = 1, seed = 0):
         super(Teacher, self).__init__()
 
         self.seats = seats
         self.n_hof = n_hof
         self.n_total = n_total
         self.n_epochs = n_epochs
-        self.table = TableProxy(Table(seats, quiet, True))
+        # direct mode keeps the table and all players in this process and
+        # dispatches moves as plain method calls instead of XML-RPC requests
+        self.direct = direct
         self.players = []
 
         self.log_file = 'hof_id.log'
         self.fitness_log = 'fitness.log'
+        self.ledger_file = 'fitness.db'
+        self.store = NeuralNetwork.get_store(HoldemAI.DIM)
+        self.rng = np.random.default_rng(seed)
+        self.mutation_rate = 0.1
+        self.mutation_scale = 0.1
+        # shared probe decisions at the tables' first blind level, every
+        # player starts with 2000 chips
+        probe = features.probe_states(PROBE_DECISIONS, self.rng,
+                                      Table.BLIND_INCREMENTS[0][1], 2000)
+        self.probe_inputs = features.encode_batch(probe)
+        self.probe_to_call = np.array([state.to_call for state in probe])
+
+        # with several workers every batch of tables is played in parallel
+        # by the tournament runner instead of the local table
+        self.runner = None
+        if workers > 1:
+            self.runner = TournamentRunner(seats, workers, quiet, seed)
+        else:
+            if direct:
+                self.table = Table(seats, quiet, True, self)
+            else:
+                self.table = TableProxy(Table(seats, quiet, True))
+            self.add_checkcallbot()
+            self.add_randombot()
+            self.add_nncontrollers()
 
-        self.add_checkcallbot()
-        self.add_randombot()
-        self.add_nncontrollers()
-
-        self.read_in_fitness_log()
+        self.open_ledger()
         # self._run_thread = Thread(target = self.run, args=())
         # self._run_thread.daemon = True
         # self._run_thread.start()
@@ -43,33 +77,64 @@ class Teacher(Thread):
             self.create_test_pool()
             self.winner_pool = []
 
-            print('HoF size:', len(self.hof))
-            print('Test pool size: ', len(self.test_pool))
-
-            while len(self.test_pool)+len(self.winner_pool) >= 6:
-                while len(self.test_pool) >= 6:
-                    self.reset_game()
-                    self.table.run_game()
-                    # self.print_dic()
-                    print('Test pool size: ', len(self.test_pool))
-                print('Adding winners to test pool')
+            LOGGER.info('HoF size: %d', len(self.hof))
+            LOGGER.info('Test pool size: %d', len(self.test_pool))
+
+            while len(self.test_pool)+len(self.winner_pool) >= self.agents_per_table:
+                if self.runner is not None:
+                    self.play_tables()
+                else:
+                    while len(self.test_pool) >= self.agents_per_table:
+                        self.reset_game()
+                        self.table.run_game()
+                        LOGGER.info('Test pool size: %d', len(self.test_pool))
+                LOGGER.info('Adding winners to test pool')
                 self.test_pool += self.winner_pool
                 self.winner_pool = []
-            print('Done with this batch of subjects, saving fitness')
+            LOGGER.info('Done with this batch of subjects, saving fitness')
             self.log_winners(self.test_pool)
-            # self.consolodate_fitness()
             self.print_fittest(10)
+            if self.store.tombstones > len(self.store):
+                self.store.compact()
+            self.store.flush()
             epoch += 1
-        print('finished')
+        if self.runner is not None:
+            self.runner.close()
+        self.ledger.commit()
+        LOGGER.info('finished')
+
+    @property
+    def agents_per_table(self):
+        if self.runner is not None:
+            return self.runner.agents_per_table
+        # the check/call and random bots take two seats of the local table
+        return self.seats - 2
+
+    def play_tables(self):
+        # workers read the networks from the store, make the children visible
+        self.store.flush()
+        # merge the results of all tables played in parallel
+        for result in self.runner.play(self.test_pool):
+            self.ledger.add_many(result.fitness.items())
+            for p in result.fitness:
+                if p != result.winner and p not in self.hof and p in self.store:
+                    self.store.delete(p)
+            if result.winner is not None:
+                self.store.write(result.winner, *result.genome)
+                self.winner_pool.append(result.winner)
+        LOGGER.info('Test pool size: %d', len(self.test_pool))
 
     def read_in_hof(self):
-        with open(self.log_file) as f:
-            self.hof = f.read().splitlines()
+        # set for membership tests, sorted list for sampling
+        self.hof = self.ledger.hall_of_fame()
+        self.hof_ids = sorted(self.hof)
 
-    def read_in_fitness_log(self):
-        with open(self.fitness_log, 'r') as f:
-            fit_list = [line.strip().split(' ') for line in open(self.fitness_log)]
-            self.fitness_dic = dict([(item[1], int(item[0])) for item in fit_list])
+    def open_ledger(self):
+        new_ledger = not os.path.exists(self.ledger_file)
+        self.ledger = FitnessLedger(self.ledger_file)
+        if new_ledger:
+            # carry over the text logs of older runs
+            self.ledger.import_logs(self.fitness_log, self.log_file)
 
     def create_test_pool(self):
         self.test_pool = []
@@ -82,66 +147,70 @@ class Teacher(Thread):
 
         # shuffle pool
         random.shuffle(self.test_pool)
-        for p in self.test_pool:
-            if p not in self.fitness_dic:
-                self.fitness_dic[p] = 0
-
-    def consolodate_fitness(self):
-        with open(self.fitness_log, 'r+') as f:
-            fit_list = [line.strip().split(' ') for line in open(self.fitness_log)]
-            temp_dic = dict([(item[1], 0) for item in fit_list])
-            for item in fit_list:
-                temp_dic[item[1]] += int(item[0])
-            f.seek(0)
-            for k,v in temp_dic.items():
-                f.write(str(v) + ' ' + str(k) + '\n')
-            f.truncate()
+        self.ledger.add_many((p, 0) for p in self.test_pool)
 
     def print_fittest(self, n):
-        fit_list = [line.strip().split(' ') for line in open(self.fitness_log)]
-        fit_sorted = sorted(fit_list, key=lambda item: int(item[0]))
-        print('Top ', n, 'fittest networks:')
-        for i in range(1,min(n+1, len(fit_sorted))):
-            print(fit_sorted[-i])
-
+        LOGGER.info('Top %d fittest networks:', n)
+        for agent, score in self.ledger.top(n):
+            LOGGER.info('%d %s', score, agent)
 
     def log_winners(self, players):
-        with open(self.log_file, 'a') as f:
-            for p in players:
-                f.write(p + '\n')
-        self._write_fitness_log(players)
-
-    def _write_fitness_log(self, players):
-        with open(self.fitness_log, 'a') as f:
-            for p in players:
-                f.write(str(self.fitness_dic[p]) + ' ' + p + '\n')
+        self.ledger.add_to_hall_of_fame(players)
+        self.ledger.commit()
 
-    def print_dic(self):
-        for p in self.fitness_dic:
-            print(p,':',self.fitness_dic[p])
+    def hof_fitness(self):
+        """
+        :return: (agents, fitness) of the stored hall of fame agents
+        """
+        scores = self.ledger.hall_of_fame_scores()
+        agents = [agent for agent in self.hof_ids if agent in self.store]
+        return agents, np.array([scores[agent] for agent in agents])
 
     def add_hof(self, n):
-        for _ in range(min(n, len(self.hof))):
-            self.test_pool.append(random.choice(self.hof))
+        # elitism: the n fittest hall of fame agents play again unchanged
+        agents, fitness = self.hof_fitness()
+        self.test_pool += [agents[i] for i in genetics.elite(fitness, n)]
 
     def add_random(self, n):
         for _ in range(n):
             self.test_pool.append(str(uuid.uuid4()))
 
     def add_children(self, n):
-        for _ in range(min(n, len(self.hof))):
-            try:
-                p1,p2 = random.sample(self.hof, 2)
-                self.test_pool.append(str(self.child(p1, p2)))
-            except:
-                print('hall of fame too small to create child agents')
+        # breed n children of the hall of fame in a single generation step,
+        # parents are picked by tournament selection on their fitness
+        agents, fitness = self.hof_fitness()
+        if len(agents) < 2:
+            LOGGER.warning('hall of fame too small to create child agents')
+            return
+        genomes = genetics.next_generation(
+            self.store.read_genomes(agents), fitness, self.rng, n_elite=0,
+            rate=self.mutation_rate, scale=self.mutation_scale, size=n)
+        genomes = genomes[self.screen(genomes)]
+        for genome in genomes:
+            child = str(uuid.uuid4())
+            self.store.write_genome(child, genome)
+            self.test_pool.append(child)
+
+    def screen(self, genomes):
+        """
+        Score genomes on the probe decisions in one stacked forward pass.
+        Children that fold to every probe bet can not win a table, the pool
+        is filled up with random agents instead.
+        :return: mask of the genomes worth playing
+        """
+        outputs = NetworkStack.from_genomes(HoldemAI.DIM, genomes) \
+            .activate_shared(self.probe_inputs)
+        keep = HoldemAI.fold_ratio(outputs, self.probe_to_call) < 1
+        LOGGER.info('Screened out %d of %d children', len(keep) - keep.sum(),
+                    len(keep))
+        return keep
 
     # cleanup
     def add_winner(self, winner_uuid):
         for p in self.players:
             if p.get_ai_id() not in [None,1,2,3,'1','2','3']:
                 if p.get_ai_id() != winner_uuid:
-                    self.fitness_dic[str(p.get_ai_id())] -= 1
+                    self.ledger.add(p.get_ai_id(), -1)
                     if p.get_ai_id() not in self.hof:
                         try:
                             p.delete_ai()
@@ -149,28 +218,10 @@ class Teacher(Thread):
                             pass
                 elif p.get_ai_id() == winner_uuid:
                     p.save_ai_state()
-                    self.fitness_dic[str(p.get_ai_id())] += 7
+                    self.ledger.add(p.get_ai_id(), 7)
                     self.winner_pool.append(winner_uuid)
                     random.shuffle(self.test_pool)
 
-    def child(self, p1, p2):
-        child_uuid = uuid.uuid4()
-        try:
-            weight1 = np.load(NeuralNetwork.SAVE_DIR + p1 + '_weights.npy')
-            weight2 = np.load(NeuralNetwork.SAVE_DIR + p2 + '_weights.npy')
-            biases1 = np.load(NeuralNetwork.SAVE_DIR + p1 + '_biases.npy')
-            biases2 = np.load(NeuralNetwork.SAVE_DIR + p2 + '_biases.npy')
-
-            child_weights = average_arrays(weight1, weight2)
-            child_biases = average_arrays(biases1, biases2)
-
-            np.save(NeuralNetwork.SAVE_DIR + str(child_uuid) + '_weights.npy', child_weights)
-            np.save(NeuralNetwork.SAVE_DIR + str(child_uuid) + '_biases.npy', child_biases)
-        except:
-            pass
-
-        return child_uuid
-
     def reset_game(self):
         for p in self.players:
             if p.get_ai_id() not in [-1, None, 1,2,3]:
@@ -178,16 +229,22 @@ class Teacher(Thread):
             else:
                 p.rejoin()
 
+    def add_controller(self, port, playerID, ai_type):
+        if self.direct:
+            self.players.append(PlayerControl('localhost', port, playerID, True, ai_type, table = self.table))
+        else:
+            self.players.append(PlayerControlProxy(PlayerControl('localhost', port, playerID, True, ai_type)))
+
     def add_checkcallbot(self):
-        self.players.append(PlayerControlProxy(PlayerControl('localhost', 8000+2, 2, True, 2)))
+        self.add_controller(8000+2, 2, 2)
 
     def add_randombot(self):
         # random bot
-        self.players.append(PlayerControlProxy(PlayerControl('localhost', 8000+3, 3, True, 3)))
+        self.add_controller(8000+3, 3, 3)
 
     def add_nncontrollers(self):
         for i in range(4,self.seats+2):
-            self.players.append(PlayerControlProxy(PlayerControl('localhost', 8000+i, i, True, 0)))
+            self.add_controller(8000+i, i, 0)
 
 class TeacherProxy(object):
     def __init__(self, teacher):
@@ -204,15 +261,3 @@ class TeacherProxy(object):
 
     def add_winner(self, winner_uuid):
         self._teacher.add_winner(winner_uuid)
-
-def average_arrays(weights1, weights2):
-    for w1,w2 in zip(weights1,weights2):
-        assert w1.shape == w2.shape
-    child = [np.zeros(w.shape) for w in weights1]
-    for w1,w2,w3 in zip(weights1,weights2,child):
-        for a1,a2,a3 in zip(w1,w2,w3):
-            for b1,b2,b3 in zip(a1,a2,a3):
-                r1 = (1+np.random.randn())/2
-                r2 = (1+np.random.randn())/2
-                b3 = r1*b1 + r2*b2
-    return child
@@ -0,0 +1,128 @@
+"""
+Parallel multi-table runner for the Teacher.
+
+The agents of a test pool are sharded into independent tables which are
+played in a process pool. Every table runs in direct mode (no XML-RPC) and
+is seeded from the runner seed and its table number: the bots draw from the
+seeded global generators, the networks' win ratio estimates from a per
+table generator, and the estimate cache is cleared before every table. A
+run is thus reproducible for a given seed regardless of the number of
+workers and of which tables a worker played before.
+
+Workers only read the population store. The winner's genome is returned
+with the result and the Teacher, as the single writer, saves winners and
+deletes losers.
+"""
+from collections import namedtuple
+import logging
+import random
+
+import numpy as np
+
+from pokerbot.ai import analyzer
+from pokerbot.ai import workers as worker_pool
+from pokerbot.ai.table import Table
+from pokerbot.ai.neural_network import NeuralNetwork
+from pokerbot.ai.playercontrol import PlayerControl
+
+LOGGER = logging.getLogger('ai-tournament')
+
+# fitness awarded to the winner of a table and taken from everyone else
+WIN_FITNESS = 7
+LOSS_FITNESS = -1
+
+# agent ids of the bots filling the first two seats of every table
+BOT_IDS = (2, 3)
+
+TableJob = namedtuple('TableJob', ['seed', 'agents', 'seats', 'quiet'])
+TableResult = namedtuple('TableResult', ['winner', 'fitness', 'genome'])
+
+
+class _WinnerRecorder(object):
+    def __init__(self):
+        self.winner = None
+
+    def add_winner(self, winner_uuid):
+        self.winner = winner_uuid
+
+
+def play_table(job):
+    """
+    Play a single table until it has a winner.
+    :return: TableResult with the winner (None for a bot or no winner), the
+    fitness delta of every agent at the table and the winner's
+    (weights, biases)
+    """
+    random.seed(job.seed)
+    np.random.seed(job.seed % 2 ** 32)
+    rng = np.random.default_rng(job.seed)
+    # estimates cached by an earlier table of this worker would leak its
+    # random draws into this one
+    analyzer.post_flop_cache.clear()
+    NeuralNetwork.reset_stores(readonly=True)
+
+    recorder = _WinnerRecorder()
+    table = Table(job.seats, job.quiet, True, recorder)
+    PlayerControl('localhost', 8000 + BOT_IDS[0], BOT_IDS[0], True, 2,
+                  table=table)
+    PlayerControl('localhost', 8000 + BOT_IDS[1], BOT_IDS[1], True, 3,
+                  table=table)
+    controls = [
+        PlayerControl('localhost', 8000 + i, i, True, 0, table=table, rng=rng)
+        for i in range(4, job.seats + 2)]
+    for control, agent in zip(controls, job.agents):
+        control.rejoin_new(agent)
+    table.run_game()
+
+    winner = recorder.winner
+    if winner not in job.agents:
+        winner = None
+    fitness = {}
+    genome = None
+    for control in controls:
+        agent = control.get_ai_id()
+        if agent == winner:
+            genome = (control.ai.weights, control.ai.biases)
+            fitness[agent] = WIN_FITNESS
+        else:
+            fitness[agent] = LOSS_FITNESS
+    return TableResult(winner, fitness, genome)
+
+
+class TournamentRunner(object):
+    def __init__(self, seats, workers=None, quiet=True, seed=0):
+        self.seats = seats
+        self.quiet = quiet
+        self.seed = seed
+        self.tables_played = 0
+        # tables always run in worker processes, which open the network
+        # store read-only
+        worker_pool.configure(processes=workers)
+
+    @property
+    def agents_per_table(self):
+        return self.seats - len(BOT_IDS)
+
+    def shard(self, pool):
+        """
+        Pop full tables worth of agents off the pool.
+        """
+        jobs = []
+        while len(pool) >= self.agents_per_table:
+            agents = [pool.pop() for _ in range(self.agents_per_table)]
+            jobs.append(TableJob(self.seed + self.tables_played + len(jobs),
+                                 agents, self.seats, self.quiet))
+        return jobs
+
+    def play(self, pool):
+        """
+        Play every full table of the pool in parallel.
+        :return: list of TableResult, in table order
+        """
+        jobs = self.shard(pool)
+        self.tables_played += len(jobs)
+        LOGGER.info("Playing %d tables", len(jobs))
+        return worker_pool.get_pool().map(play_table, jobs, chunksize=1)
+
+    def close(self):
+        worker_pool.shutdown()
@@ -1,8 +1,13 @@
-from pokerbot.poker.deck import Deck, Card, Suits
+from pokerbot.poker.deck import Card, Suits
 import itertools
 from pokerbot.poker.hands import Hand
+from pokerbot.poker import evaluator
+from pokerbot.ai import equity, preflop, workers
+from pokerbot.ai.cache import EquityCache, canonical_key
 
+import atexit
 import logging
+import os
 
 LOGGER = logging.getLogger("ai-utils")
 
@@ -11,23 +16,94 @@ def generate_possible_hands(pocket, community_cards):
     return [Hand.get_hand(cards) for cards in itertools.combinations(community_cards + pocket, r=5)]
 
 def get_best_possible_hand(pocket, community_cards):
-    return max(generate_possible_hands(pocket, community_cards))
+    return evaluator.best_hand_rank(pocket, community_cards)
+
+# smallest enumeration that is split across the worker pool: a board costs
+# about 0.8us serially, a warm pool round trip about 0.5ms, so from about
+# 4ms of work up splitting pays off. Covers the preflop and single
+# community card spots (C(50, 3) and C(49, 3) boards), later streets have at
+# most C(47, 2) = 1081 boards and stay in-process.
+PARALLEL_BOARDS = 5000
+
+NAIVE_RANK_CACHE_SIZE = 100000
+
+# file the entry points keep the naive rank cache in, set
+# POKERBOT_NAIVE_RANK_CACHE to another path, or to nothing to keep the cache
+# in memory only
+NAIVE_RANK_CACHE_FILE = os.path.join(preflop.DATA_DIR, 'naive_rank_cache.pkl')
+CACHE_ENVIRONMENT_VARIABLE = 'POKERBOT_NAIVE_RANK_CACHE'
+
+# naive ranks by the suit canonical set of known cards
+naive_rank_cache = EquityCache(NAIVE_RANK_CACHE_SIZE)
+_atexit_registered = False
+
+
+def use_naive_rank_cache(path=None):
+    """
+    Keep the naive rank cache in a file: load it now and save it at exit.
+    :param path: cache file, by default from the POKERBOT_NAIVE_RANK_CACHE
+    environment variable or NAIVE_RANK_CACHE_FILE, empty for no file
+    Calling it again with the same path keeps the current cache.
+    """
+    global naive_rank_cache, _atexit_registered
+    if path is None:
+        path = os.environ.get(CACHE_ENVIRONMENT_VARIABLE,
+                              NAIVE_RANK_CACHE_FILE)
+    path = path or None
+    if naive_rank_cache.path != path:
+        naive_rank_cache = EquityCache(NAIVE_RANK_CACHE_SIZE, path)
+    if not _atexit_registered:
+        atexit.register(save_naive_rank_cache)
+        _atexit_registered = True
+    return naive_rank_cache
+
+
+def save_naive_rank_cache():
+    """
+    Save the current naive rank cache, if it is kept in a file.
+    """
+    if naive_rank_cache.path is not None:
+        naive_rank_cache.save()
+
+
+def _rank_sum(job):
+    """
+    Vectorized kernel: the summed hand categories of the known cards
+    completed with every row of boards.
+    """
+    known, boards = job
+    strengths = equity.evaluate_batch(boards, known)
+    return int((strengths >> evaluator.CATEGORY_SHIFT).sum())
+
 
 def naive_rank(pocket, community_cards):
+    """
+    :return: average hand category of the known cards over every way to
+    complete them with up to three more cards
+    """
+    known = [evaluator.encode(card) for card in pocket] + \
+        [evaluator.encode(card) for card in community_cards]
+    # the rank only depends on the set of known cards
+    key = canonical_key(known, (), 0)
+    cached = naive_rank_cache.get(key)
+    if cached is not None:
+        return cached
+
     LOGGER.info("Evaluating")
-    pocket = [Card(v, s) for v, s in pocket]
-    community_cards = [Card(v, s) for v, s in community_cards]
-    unopened_slots = min(3, 7 - len(pocket) - len(community_cards))
-    deck = Deck()
-    deck.removeall(pocket + community_cards)
-    count = 0
-    _rank = 0
-    for possibility in itertools.combinations(deck.cards, r=unopened_slots):
-        _rank += max(generate_possible_hands(pocket, community_cards + list(possibility))).rank
-        count += 1
-    LOGGER.debug("Evaluated %d hands" % count)
-
-    return _rank / count
+    remaining = equity.remaining_cards(known)
+    unopened_slots = min(3, 7 - len(known))
+    boards = remaining[equity.index_combinations(len(remaining),
+                                                 unopened_slots)]
+    if len(boards) >= PARALLEL_BOARDS and workers.parallel():
+        _rank = sum(workers.map_chunks(_rank_sum, [
+            (known, chunk) for chunk in workers.chunks(boards)]))
+    else:
+        _rank = _rank_sum((known, boards))
+    LOGGER.debug("Evaluated %d hands", len(boards))
+
+    result = _rank / len(boards)
+    naive_rank_cache.put(key, result)
+    return result
 
 
 if "__main__" == __name__:
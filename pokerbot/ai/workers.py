@@ -0,0 +1,100 @@
+"""
+Shared worker pool of the AI package.
+
+Nothing is started at import time. The process pool is created on the
+first ``map_chunks`` that has enough work to split, with the size and start
+method set by ``configure``, and is shut down at interpreter exit or by
+``shutdown``. Inside pool workers (daemonic processes, which cannot have
+children) and with a single process configured, ``map_chunks`` runs
+in-process.
+"""
+import atexit
+import logging
+import multiprocessing
+
+LOGGER = logging.getLogger('ai-workers')
+
+_config = {
+    'processes': None,
+    'start_method': None,
+}
+_pool = None
+_atexit_registered = False
+
+
+def configure(processes=None, start_method=None):
+    """
+    :param processes: pool size, None for half of the cores
+    :param start_method: 'fork', 'spawn' or 'forkserver', None for the
+    platform default
+    A running pool is shut down, the next map_chunks starts one with the new
+    settings.
+    """
+    shutdown()
+    _config['processes'] = processes
+    _config['start_method'] = start_method
+
+
+def processes():
+    if _config['processes'] is not None:
+        return _config['processes']
+    return max(multiprocessing.cpu_count() // 2, 1)
+
+
+def parallel():
+    """
+    :return: True if map_chunks spreads work over a process pool
+    """
+    return processes() > 1 and not multiprocessing.current_process().daemon
+
+
+def get_pool():
+    """
+    :return: the shared pool, started on first use
+    """
+    global _pool, _atexit_registered
+    if _pool is None:
+        context = multiprocessing.get_context(_config['start_method'])
+        LOGGER.info("Starting %d %s workers", processes(),
+                    context.get_start_method())
+        _pool = context.Pool(processes())
+        if not _atexit_registered:
+            atexit.register(shutdown)
+            _atexit_registered = True
+    return _pool
+
+
+def map_chunks(function, iterable, chunksize=None):
+    """
+    Map a picklable, module level function over the iterable, in the pool
+    if there is one to use.
+    :return: list of the results, in order
+    """
+    if not parallel():
+        return [function(item) for item in iterable]
+    return get_pool().map(function, iterable, chunksize)
+
+
+def chunks(items, count=None):
+    """
+    Split a sequence into about count (default: one per worker) contiguous
+    slices.
+    """
+    count = processes() if count is None else count
+    size = max(-(-len(items) // max(count, 1)), 1)
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+def shutdown(wait=True):
+    """
+    Stop the pool, letting queued tasks finish if wait is set.
+    """
+    global _pool
+    if _pool is None:
+        return
+    pool, _pool = _pool, None
+    if wait:
+        pool.close()
+    else:
+        pool.terminate()
+    pool.join()
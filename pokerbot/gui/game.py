@@ -6,6 +6,7 @@ import logging
 import os
 
 from pokerbot.poker import poker as ppoker, player as players
+from pokerbot.poker.deck import Card
 
 FORMAT = '%(name)s - %(message)s'
 logging.basicConfig(format=FORMAT, level=logging.ERROR)
@@ -134,7 +135,7 @@ class BetButton(tk.OptionMenu):
             self.bet_var.set("Bet ...")
             minimum, maximum = _round.pot.minimum_to_bet(player), player.money
             step = max((maximum - minimum) // 10, 1)
-            LOGGER.info("minimum: %d, maximum: %d, step: %d" % (minimum, maximum, step))
+            LOGGER.info("minimum: %d, maximum: %d, step: %d", minimum, maximum, step)
 
             def bet(_amount):
                 return lambda: player.queue.put(players.Bet(player, _round, _amount))
@@ -233,7 +234,7 @@ class GUIHumanPlayer(players.BasePlayer):
 
     def __init__(self, name, money):
         super(GUIHumanPlayer, self).__init__(name, money)
-        LOGGER.debug("Creating Human player %s" % self.name)
+        LOGGER.debug("Creating Human player %s", self.name)
         self.queue = queue.Queue()
         self.player_frame = None
         self.gui = None
@@ -323,18 +324,19 @@ class Game(object):
             LOGGER.info("processing event: %s", message) # too much output
 
             if message:
-                LOGGER.debug("Got event: %s" % str(message))
+                LOGGER.debug("Got event: %s", message)
                 _round = self.game_logic.current_round
                 for player_frame in self.player_frames.values():
                     player = player_frame.player
                     if _round:
-                        LOGGER.debug("Populating: %s" % player.name)
+                        LOGGER.debug("Populating: %s", player.name)
                         player_frame.refresh(_round)
-                    LOGGER.debug("refreshing community cards %s" % str(_round.community_cards))
+                    LOGGER.debug("refreshing community cards %s", _round.community_cards)
                     for label, card in zip(self.community_cards, _round.community_cards + [''] * 5):
                         label['text'] = card
-                        if card:
-                            LOGGER.debug("setting color to: %s" % card.color())
+                        # the deuce of hearts packs to 0, test for the padding
+                        if isinstance(card, Card):
+                            LOGGER.debug("setting color to: %s", card.color())
                             label['fg'] = card.color()
                 self.refresh_logs()
             self.frame.pack()
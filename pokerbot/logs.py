@@ -0,0 +1,63 @@
+"""
+Logging switches shared by the poker engine and the AIs.
+
+Every module logs to its own named logger ('poker-main', 'ai-holdem', ...)
+with %-style arguments, so a message is only formatted once a record passes
+its logger's level check. Arguments that are expensive to build are wrapped
+in ``lazy``. Loggers inherit the root level (WARNING unless configured), so
+a production run formats nothing on the decision path.
+
+Single modules are switched with ``set_level`` or, without touching code,
+with the POKERBOT_LOG environment variable read by ``configure``:
+
+    POKERBOT_LOG=ai-holdem=DEBUG,poker-main=INFO python play_game.py
+"""
+import logging
+import os
+import sys
+
+ENVIRONMENT_VARIABLE = 'POKERBOT_LOG'
+
+
+class lazy(object):
+    """
+    Log argument computed only when the record is formatted.
+    """
+    __slots__ = ('function', 'args')
+
+    def __init__(self, function, *args):
+        self.function = function
+        self.args = args
+
+    def __str__(self):
+        return str(self.function(*self.args))
+
+    __repr__ = __str__
+
+
+def set_level(name, level, stream=False):
+    """
+    Switch a module's logger to level.
+    :param stream: also print its records to stdout, for output that used
+    to be printed unconditionally
+    """
+    logger = logging.getLogger(name)
+    logger.setLevel(level)
+    if stream and not getattr(logger, '_pokerbot_stream', False):
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.propagate = False
+        logger._pokerbot_stream = True
+    return logger
+
+
+def configure(spec=None):
+    """
+    Apply a comma separated list of logger=LEVEL switches, by default
+    from the POKERBOT_LOG environment variable.
+    """
+    spec = os.environ.get(ENVIRONMENT_VARIABLE, '') if spec is None else spec
+    for switch in filter(None, (item.strip() for item in spec.split(','))):
+        name, _, level = switch.partition('=')
+        set_level(name, level.upper() or logging.DEBUG)
@@ -1,5 +1,6 @@
 # coding=utf-8
-from random import shuffle, randint
+from array import array
+import random
 
 
 class Suits:
@@ -25,34 +26,50 @@ parsed = {
 
 test = ['T', 'J', 'Q', 'K', 'A']
 
+SUIT_INDEX = dict((suit, index) for index, suit in enumerate(Suits.SUITS))
+CARD_COUNT = 52
 
-class Card(object):
-    def __init__(self, value, suit):
-        self.value = value
-        self.suit = suit
+# suit bits of the deuces encoding, in Suits.SUITS order
+DEUCES_SUITS = (2, 4, 8, 1)
+DEUCES_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+
+class Card(int):
+    """
+    A card packed into an int in the range 0-51: (value - 2) * 4 plus the
+    index of the suit in Suits.SUITS. There is a single instance of every
+    card (see CARDS), so creating a card allocates nothing and cards hash
+    and compare as plain ints.
+    """
+    __slots__ = ()
+
+    def __new__(cls, value, suit):
+        return CARDS[(value - 2) * 4 + SUIT_INDEX[suit]]
+
+    def __getnewargs__(self):
+        return self.value, self.suit
 
     @staticmethod
-    def random_cards(count=1):
-        return [Card(randint(2, 14), Suits.SUITS[randint(0, 3)]) for i in
-            range(count)]
+    def from_index(index):
+        return CARDS[index]
 
-    def __gt__(self, other):
-        if not isinstance(other, Card):
-            return False
-        return self.value > other.value
+    @staticmethod
+    def from_deuces(deuces_card):
+        return FROM_DEUCES[deuces_card]
+
+    @property
+    def value(self):
+        return (self >> 2) + 2
 
-    def __eq__(self, other):
-        is_card_eq = self.value == other.value and self.suit == other.suit
-        return isinstance(other, Card) and is_card_eq
+    @property
+    def suit(self):
+        return Suits.SUITS[self & 3]
 
     def __repr__(self):
-        return str(self.value) + symbols[self.suit]
+        return NAMES[self]
 
     def __str__(self):
-        return str(self.value) + symbols[self.suit]
-
-    def __hash__(self):
-        return hash(self.value) ^ hash(self.suit)
+        return NAMES[self]
 
     def color(self):
         if self.suit in (Suits.HEARTS, Suits.DIAMONDS):
@@ -67,23 +84,119 @@ class Card(object):
     def parse(self):
         return str(self.parse_value()) + parsed[self.suit]
 
+    def to_deuces(self):
+        return DEUCES[self]
+
+
+CARDS = tuple(int.__new__(Card, index) for index in range(CARD_COUNT))
+NAMES = tuple(str(card.value) + symbols[card.suit] for card in CARDS)
+
+# the cards in the bit format of the deuces library:
+# xxxbbbbb bbbbbbbb cdhsrrrr xxpppppp (rank bit, suit bit, rank, rank prime)
+DEUCES = tuple(
+    1 << (16 + (card >> 2)) | DEUCES_SUITS[card & 3] << 12 |
+    (card >> 2) << 8 | DEUCES_PRIMES[card >> 2] for card in range(CARD_COUNT))
+FROM_DEUCES = dict((deuces_card, CARDS[index])
+                   for index, deuces_card in enumerate(DEUCES))
+
 
 class Deck(object):
-    def __init__(self):
-        self.cards = [
-            Card(value, suit) for value in
-            range(2, 14) for suit in Suits.SUITS]
-        self.shuffle()
+    """
+    The cards live in a preallocated byte array of packed cards: the ones in
+    front of the cursor were dealt, the ones between the cursor and size are
+    still in the deck and the ones after size were excluded.
+
+    Cards are picked at random as they are dealt (a partial Fisher-Yates
+    shuffle), so only the dealt cards are ever shuffled and putting them back
+    only rewinds the cursor. Dealing does not allocate anything but the
+    returned list.
+    """
+
+    def __init__(self, rng=None):
+        self._randrange = (rng or random).randrange
+        self._cards = array('B', range(CARD_COUNT))
+        self._cursor = 0
+        self._size = CARD_COUNT
+
+    def __len__(self):
+        return self._size - self._cursor
+
+    @property
+    def cards(self):
+        """
+        :return: list of the cards still in the deck
+        """
+        return [CARDS[card] for card in self._cards[self._cursor:self._size]]
+
+    def _deal(self):
+        cards = self._cards
+        cursor = self._cursor
+        if cursor == self._size:
+            raise IndexError("draw from an empty deck")
+        swap = self._randrange(cursor, self._size)
+        card = cards[swap]
+        cards[swap] = cards[cursor]
+        cards[cursor] = card
+        self._cursor = cursor + 1
+        return CARDS[card]
 
     def shuffle(self):
-        shuffle(self.cards)
+        self.reset()
+
+    def reset(self):
+        """
+        Put the dealt cards back. Excluded cards stay out of the deck.
+        """
+        self._cursor = 0
+
+    def restore(self):
+        """
+        Put the dealt and the excluded cards back.
+        """
+        self._cursor = 0
+        self._size = CARD_COUNT
 
     def draw(self, number=1):
-        drawn, self.cards = self.cards[:number], self.cards[number:]
-        return drawn
+        deal = self._deal
+        return [deal() for _ in range(number)]
 
     def draw_single(self):
-        return self.cards.pop()
+        return self._deal()
+
+    def draw_into(self, buffer, start=0, number=None):
+        """
+        Deal into buffer[start:start + number], e.g. a reused list or numpy
+        array, instead of returning a new list.
+        """
+        deal = self._deal
+        stop = len(buffer) if number is None else start + number
+        for i in range(start, stop):
+            buffer[i] = deal()
+        return buffer
+
+    def exclude(self, dead_cards):
+        """
+        Take dead cards (e.g. known pocket and community cards) out of the
+        deck until it is restored. The remaining cards keep their order.
+        :return: number of cards left in the deck
+        """
+        mask = 0
+        for card in dead_cards:
+            mask |= 1 << card
+        cards = self._cards
+        kept = self._cursor
+        dead = array('B')
+        for i in range(self._cursor, self._size):
+            card = cards[i]
+            if mask >> card & 1:
+                dead.append(card)
+            else:
+                cards[kept] = card
+                kept += 1
+        # the excluded cards move behind the deck
+        cards[kept:self._size] = dead
+        self._size = kept
+        return len(self)
 
     def removeall(self, cards):
         '''
@@ -91,6 +204,5 @@ class Deck(object):
         :param cards: cards to remove from the deck
         :return: sequence of remaining cards
         '''
-        remaining = set(self.cards) - set(cards)
-        self.cards = list(remaining)
-        return remaining
+        self.exclude(cards)
+        return self.cards
@@ -0,0 +1,262 @@
+"""
+Integer based hand evaluator.
+
+Cards are packed into integers in the range 0-51 (``rank * 4 + suit``, where
+rank 0 is a deuce and rank 12 an ace) and hands are scored with precomputed
+lookup tables, in the spirit of Cactus Kev's evaluator:
+
+* 5 suited cards are looked up by their 13 bit rank mask in ``FLUSHES``
+* 5 distinct ranks are looked up by their rank mask in ``UNIQUE5``
+* everything else (pairs and better) is looked up by the product of the
+  primes assigned to each rank in ``PRODUCTS``
+
+Six and seven card sets are scored in a single pass (see ``evaluate7``) from
+per suit rank masks and a rank histogram, without expanding the 21 five card
+combinations.
+
+The result of an evaluation is a single integer strength - the higher, the
+better. The hand category (see ``HIGH_CARD`` ... ``STRAIGHT_FLUSH``) is stored
+in the top bits and can be read back with ``category``.
+"""
+from collections import Counter
+from itertools import combinations_with_replacement
+import logging
+
+from pokerbot.poker.deck import Suits
+
+LOGGER = logging.getLogger('poker-evaluator')
+
+HIGH_CARD = 0
+PAIR = 1
+TWO_PAIRS = 2
+THREE_OF_A_KIND = 3
+STRAIGHT = 4
+FLUSH = 5
+FULL_HOUSE = 6
+FOUR_OF_A_KIND = 7
+STRAIGHT_FLUSH = 8
+
+CATEGORY_NAMES = (
+    "High Card",
+    "Pair",
+    "Two Pairs",
+    "Three of a Kind",
+    "Straight",
+    "Flush",
+    "Full House",
+    "Four of a Kind",
+    "Straight Flush",
+)
+
+RANKS = 13
+SUITS = 4
+CARDS = RANKS * SUITS
+CATEGORY_SHIFT = 20
+
+PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+SUIT_INDEX = dict((suit, index) for index, suit in enumerate(Suits.SUITS))
+
+# per card lookups, indexed by the packed card
+CARD_RANK = tuple(card // SUITS for card in range(CARDS))
+CARD_SUIT = tuple(card % SUITS for card in range(CARDS))
+CARD_BIT = tuple(1 << rank for rank in CARD_RANK)
+CARD_SUIT_BIT = tuple(1 << suit for suit in CARD_SUIT)
+CARD_PRIME = tuple(PRIMES[rank] for rank in CARD_RANK)
+
+# rank masks of all straights, from the ace high one down to the wheel
+STRAIGHTS = tuple(0b11111 << low for low in range(RANKS - 5, -1, -1)) + \
+    (0b1000000001111,)
+STRAIGHT_TOPS = tuple(range(RANKS - 1, 3, -1)) + (3,)
+
+
+def encode(card):
+    """
+    Pack a card into an integer in the range 0-51.
+    Integers are returned unchanged.
+    """
+    if isinstance(card, int):
+        return card
+    return (card.value - 2) * SUITS + SUIT_INDEX[card.suit]
+
+
+def category(strength):
+    """
+    :return: the hand category (HIGH_CARD ... STRAIGHT_FLUSH) of a strength
+    """
+    return strength >> CATEGORY_SHIFT
+
+
+def category_name(strength):
+    return CATEGORY_NAMES[category(strength)]
+
+
+def _pack(hand_category, ranks):
+    strength = hand_category
+    for rank in ranks:
+        strength = (strength << 4) | rank
+    return strength << 4 * (5 - len(ranks))
+
+
+def _straight_top(mask):
+    for straight, top in zip(STRAIGHTS, STRAIGHT_TOPS):
+        if mask & straight == straight:
+            return top
+    return None
+
+
+def _score(ranks, suited):
+    """
+    Slow reference scoring of five ranks, used to build the tables.
+    """
+    counts = Counter(ranks)
+    groups = sorted(counts.items(), key=lambda item: (item[1], item[0]),
+                    reverse=True)
+    ordered = [rank for rank, _ in groups]
+    pattern = [count for _, count in groups]
+    if len(counts) == 5:
+        top = _straight_top(sum(1 << rank for rank in ranks))
+        if top is not None:
+            return _pack(STRAIGHT_FLUSH if suited else STRAIGHT, [top])
+        return _pack(FLUSH if suited else HIGH_CARD, ordered)
+    if pattern[0] == 4:
+        return _pack(FOUR_OF_A_KIND, ordered)
+    if pattern == [3, 2]:
+        return _pack(FULL_HOUSE, ordered)
+    if pattern[0] == 3:
+        return _pack(THREE_OF_A_KIND, ordered)
+    if pattern[:2] == [2, 2]:
+        return _pack(TWO_PAIRS, ordered)
+    return _pack(PAIR, ordered)
+
+
+def _build_tables():
+    flushes = [0] * (1 << RANKS)
+    unique5 = [0] * (1 << RANKS)
+    products = {}
+    for ranks in combinations_with_replacement(range(RANKS), 5):
+        if max(Counter(ranks).values()) > 4:
+            continue
+        if len(set(ranks)) == 5:
+            mask = sum(1 << rank for rank in ranks)
+            flushes[mask] = _score(ranks, True)
+            unique5[mask] = _score(ranks, False)
+        else:
+            product = 1
+            for rank in ranks:
+                product *= PRIMES[rank]
+            products[product] = _score(ranks, False)
+    return flushes, unique5, products
+
+FLUSHES, UNIQUE5, PRODUCTS = _build_tables()
+
+
+def _build_mask_tables():
+    straight_tops = [-1] * (1 << RANKS)
+    best_flushes = [0] * (1 << RANKS)
+    for mask in range(1 << RANKS):
+        top = _straight_top(mask)
+        if top is not None:
+            straight_tops[mask] = top
+        ranks = [rank for rank in range(RANKS - 1, -1, -1) if mask >> rank & 1]
+        if len(ranks) < 5:
+            continue
+        if top is not None:
+            best_flushes[mask] = _pack(STRAIGHT_FLUSH, [top])
+        else:
+            best_flushes[mask] = _pack(FLUSH, ranks[:5])
+    return straight_tops, best_flushes
+
+# highest straight contained in a rank mask (-1 for none) and the best
+# flush or straight flush of a suit mask holding five ranks or more
+STRAIGHT_TOP, BEST_FLUSH = _build_mask_tables()
+
+
+def evaluate5(c1, c2, c3, c4, c5):
+    """
+    Evaluate exactly five packed cards.
+    """
+    if CARD_SUIT_BIT[c1] & CARD_SUIT_BIT[c2] & CARD_SUIT_BIT[c3] & \
+            CARD_SUIT_BIT[c4] & CARD_SUIT_BIT[c5]:
+        return FLUSHES[CARD_BIT[c1] | CARD_BIT[c2] | CARD_BIT[c3] |
+                       CARD_BIT[c4] | CARD_BIT[c5]]
+    strength = UNIQUE5[CARD_BIT[c1] | CARD_BIT[c2] | CARD_BIT[c3] |
+                       CARD_BIT[c4] | CARD_BIT[c5]]
+    if strength:
+        return strength
+    return PRODUCTS[CARD_PRIME[c1] * CARD_PRIME[c2] * CARD_PRIME[c3] *
+                    CARD_PRIME[c4] * CARD_PRIME[c5]]
+
+
+def evaluate7(cards):
+    """
+    Evaluate 5 to 7 packed cards in a single pass.
+    With at most seven cards a flush excludes a full house or quads, so the
+    suit masks are checked first and the rank histogram decides the rest.
+    """
+    suit_masks = [0, 0, 0, 0]
+    counts = [0] * RANKS
+    for card in cards:
+        suit_masks[CARD_SUIT[card]] |= CARD_BIT[card]
+        counts[CARD_RANK[card]] += 1
+    return evaluate_histogram(counts, suit_masks)
+
+
+def evaluate_histogram(counts, suit_masks):
+    """
+    Evaluate up to seven cards given as the number of cards of every rank
+    and the rank mask of every suit. Fewer than five cards are scored as
+    the best partial hand they make (e.g. a pocket pair as a pair).
+    """
+    for suit_mask in suit_masks:
+        strength = BEST_FLUSH[suit_mask]
+        if strength:
+            return strength
+
+    quads, trips, pairs, singles = [], [], [], []
+    groups = (None, singles, pairs, trips, quads)
+    for rank in range(RANKS - 1, -1, -1):
+        count = counts[rank]
+        if count:
+            # only a repeated card makes more than four of a rank
+            if count > 4:
+                raise ValueError("Got %d cards of rank %d" % (count, rank))
+            groups[count].append(rank)
+
+    if quads:
+        kicker = max(trips[:1] + pairs[:1] + singles[:1] + quads[1:2])
+        return _pack(FOUR_OF_A_KIND, [quads[0], kicker])
+    if trips and len(trips) + len(pairs) > 1:
+        return _pack(FULL_HOUSE, [trips[0], max(trips[1:2] + pairs[:1])])
+    top = STRAIGHT_TOP[suit_masks[0] | suit_masks[1] |
+                       suit_masks[2] | suit_masks[3]]
+    if top >= 0:
+        return _pack(STRAIGHT, [top])
+    if trips:
+        return _pack(THREE_OF_A_KIND, trips + singles[:2])
+    if len(pairs) > 1:
+        return _pack(TWO_PAIRS, pairs[:2] + [max(pairs[2:3] + singles[:1])])
+    if pairs:
+        return _pack(PAIR, pairs + singles[:3])
+    return _pack(HIGH_CARD, singles[:5])
+
+
+def evaluate(cards):
+    """
+    Evaluate the best five card hand out of 5, 6 or 7 cards.
+    :param cards: packed cards or Card objects
+    :return: comparable integer strength, higher is better
+    """
+    cards = [encode(card) for card in cards]
+    if len(cards) == 5:
+        return evaluate5(*cards)
+    if not 5 < len(cards) <= 7:
+        raise ValueError("Can only evaluate 5 to 7 cards, got %d" %
+                         len(cards))
+    return evaluate7(cards)
+
+
+def best_hand_rank(pocket, community_cards):
+    """
+    Strength of the best hand a pocket makes with the community cards.
+    """
+    return evaluate(list(pocket) + list(community_cards))
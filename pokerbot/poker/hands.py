@@ -1,6 +1,7 @@
-from collections import Counter
 import logging
 
+from pokerbot.poker import evaluator
+
 LOGGER = logging.getLogger('poker-hands')
 LOGGER.setLevel(logging.ERROR)
 
@@ -10,58 +11,44 @@ class InvalidHandException(Exception):
 
 
 class Hand(object):
+    """
+    Display view over a five card hand.
+    The ranking itself is done by the integer evaluator, comparing two hands
+    compares their strengths.
+    """
 
     rank = -1
 
-    def __init__(self, cards):
+    def __init__(self, cards, strength=None):
         if len(cards) != 5:
             raise InvalidHandException("Card count was not 5!")
         self.cards = sorted(cards)
-        self._values_counter = Counter([card.value for card in self.cards])
+        if strength is None:
+            strength = evaluator.evaluate(self.cards)
+        self.strength = strength
 
     def __gt__(self, other):
+        return self.strength > other.strength
 
-        LOGGER.debug("Comparing: %s and %s" % (self, other))
-        if self.rank != other.rank:
-            return self.rank > other.rank
-
-        return self._compare_same(other)
-
-    def _compare_cards_high_to_low(self, other):
-        card, other_card = None, None
-        for card, other_card in zip(self.cards, other.cards):
-            if card.value != other_card.value:
-                break
+    def __lt__(self, other):
+        return self.strength < other.strength
 
-        return card.value > other_card.value
+    def __eq__(self, other):
+        return isinstance(other, Hand) and self.strength == other.strength
 
-    def _compare_same(self, other):
-        raise NotImplementedError("Can not compare an abstract hand!")
+    def __hash__(self):
+        return hash(self.strength)
 
     @staticmethod
     def get_hand(cards):
-        cards = sorted(cards)
-        classification_candidates = [
-            StraightFlush,
-            FourOfAKind,
-            FullHouse,
-            Flush,
-            Straight,
-            ThreeOfAKind,
-            TwoPairs,
-            Pair,
-        ]
-        for candidate in classification_candidates:
-            if candidate.is_valid(cards):
-                LOGGER.debug("%s: %s" % (candidate.__name__, str(cards)))
-                return candidate(cards)
-
-        # nothing identified, play using highest cards
-        return HighCard(cards)
+        strength = evaluator.evaluate(cards)
+        hand = HANDS[evaluator.category(strength)](cards, strength)
+        LOGGER.debug("%s: %s", hand.__class__.__name__, hand)
+        return hand
 
-    @staticmethod
-    def is_valid(cards):
-        raise NotImplemented("is_valid not implemented for abstract hand!")
+    @classmethod
+    def is_valid(cls, cards):
+        return evaluator.category(evaluator.evaluate(cards)) == cls.rank
 
     def __repr__(self):
         return "%s - %s" % (self.__class__, ','.join([
@@ -70,188 +57,60 @@ class Hand(object):
     def __str__(self):
         return ", ".join(str(c) for c in self.cards)
 
-    def _filter_most_common(self):
-        return list(filter(
-            lambda a: a.value != self._values_counter.most_common(1)[0][0],
-            self.cards))
-
-    def _compare_highest(self, other):
-        return self.cards[-1] > other.cards[-1]
-
 
 class StraightFlush(Hand):
 
-    rank = 8
-
-    def __init__(self, cards):
-        super(StraightFlush, self).__init__(cards)
-
-    @staticmethod
-    def is_valid(cards):
-        return Flush.is_valid(cards) and Straight.is_valid(cards)
-
-    def _compare_same(self, other):
-        return self._compare_highest(other)
+    rank = evaluator.STRAIGHT_FLUSH
 
 
 class FourOfAKind(Hand):
 
-    rank = 7
-
-    def __init__(self, cards):
-        super(FourOfAKind, self).__init__(cards)
-
-    @staticmethod
-    def is_valid(cards):
-        counter = Counter([card.value for card in cards])
-        return max(counter.values()) == 4
-
-    def __repeated_card4(self):
-        return self._values_counter.most_common(1)[0]
-
-    def _compare_same(self, other):
-        if self.__repeated_card4() == other.__repeated_card4():
-            return self._filter_most_common() > other._filter_most_common()
-        return self.__repeated_card4() > other.__repeated_card4()
+    rank = evaluator.FOUR_OF_A_KIND
 
 
 class FullHouse(Hand):
 
-    rank = 6
-
-    def __init__(self, cards):
-        super(FullHouse, self).__init__(cards)
-
-    @staticmethod
-    def is_valid(cards):
-        counter = Counter([card.value for card in cards])
-        return 2 in counter.values() and 3 in counter.values()
-
-    def __repeated_card3(self):
-        return self._values_counter.most_common(1)[0]
-
-    def _compare_same(self, other):
-        if self.__repeated_card3() == other.__repeated_card3():
-            first = self._values_counter.most_common(2)[1]
-            second = other._values_counter.most_common(2)[1]
-            return first > second
-        return self.__repeated_card3() > other.__repeated_card3()
+    rank = evaluator.FULL_HOUSE
 
 
 class Flush(Hand):
 
-    rank = 5
-
-    def __init__(self, cards):
-        super(Flush, self).__init__(cards)
-
-    @staticmethod
-    def is_valid(cards):
-        return all(card.suit == cards[0].suit for card in cards)
-
-    def _compare_same(self, other):
-        return self._compare_highest(other)
+    rank = evaluator.FLUSH
 
 
 class Straight(Hand):
 
-    rank = 4
-
-    def __init__(self, cards):
-        super(Straight, self).__init__(cards)
-
-    @staticmethod
-    def is_valid(cards):
-        values = sorted([card.value for card in cards])
-        if values[-1] == 14 and values[0] == 2:
-            return values[1:4] == [3, 4, 5]
-        return values == range(values[0], values[0] + 5)
-
-    def _compare_same(self, other):
-        self._compare_highest(other)
+    rank = evaluator.STRAIGHT
 
 
 class ThreeOfAKind(Hand):
 
-    rank = 3
-
-    def __init__(self, cards):
-        super(ThreeOfAKind, self).__init__(cards)
-
-    @staticmethod
-    def is_valid(cards):
-        counter = Counter([card.value for card in cards])
-        return max(counter.values()) == 3
-
-    def __repeated_card3(self):
-        return self._values_counter.most_common(1)[0]
-
-    def _compare_same(self, other):
-        if self.__repeated_card3() == other.__repeated_card3():
-            first = self._filter_most_common()
-            second = other._filter_most_common()
-            return first > second
-        return self.__repeated_card3() > other.__repeated_card3()
+    rank = evaluator.THREE_OF_A_KIND
 
 
 class TwoPairs(Hand):
 
-    rank = 2
-
-    def __init__(self, cards):
-        super(TwoPairs, self).__init__(cards)
-
-    @staticmethod
-    def is_valid(cards):
-        counter = Counter([card.value for card in cards])
-        return sorted(counter.values())[-2:] == [2, 2]
-
-    def __repeated_cards2_2(self):
-        return self._values_counter.most_common(2)
-
-    def _compare_same(self, other):
-        high_pair, low_pair = sorted(self.__repeated_cards2_2())
-        other_high_pair, other_low_pair = sorted(other.__repeated_cards2_2())
-        if high_pair != other_high_pair:
-            return high_pair > other_high_pair
-        if low_pair != other_low_pair:
-            return low_pair > other_low_pair
-        first = self._values_counter.most_common(3)[-1]
-        second = other._values_counter.most_common(3)[-1]
-        return first > second
+    rank = evaluator.TWO_PAIRS
 
 
 class Pair(Hand):
 
-    rank = 1
-
-    def __init__(self, cards):
-        super(Pair, self).__init__(cards)
-
-    @staticmethod
-    def is_valid(cards):
-        counter = Counter([card.value for card in cards])
-        return max(counter.values()) == 2
-
-    def __repeated_cards2(self):
-        return self._values_counter.most_common(1)[0]
-
-    def _compare_same(self, other):
-        if self.__repeated_cards2() != other.__repeated_cards2():
-            return self.__repeated_cards2() > other.__repeated_cards2()
-        return self._filter_most_common() > other._filter_most_common()
+    rank = evaluator.PAIR
 
 
 class HighCard(Hand):
 
-    rank = 0
+    rank = evaluator.HIGH_CARD
 
-    def __init__(self, cards):
-        super(HighCard, self).__init__(cards)
-
-    @staticmethod
-    def is_valid(cards):
-        return
 
-    def _compare_same(self, other):
-        return self._compare_highest(other)
+HANDS = (
+    HighCard,
+    Pair,
+    TwoPairs,
+    ThreeOfAKind,
+    Straight,
+    Flush,
+    FullHouse,
+    FourOfAKind,
+    StraightFlush,
+)
@@ -0,0 +1,91 @@
+"""
+Incremental hand state of a single player.
+
+The pocket and every community card are added one at a time and folded
+into a rank histogram, per suit rank masks and suit counts, so a new card
+costs O(1). The made hand strength is evaluated from those on demand and
+cached until the next card, and the straight and flush draws are read from
+the same masks.
+"""
+from pokerbot.poker import evaluator
+from pokerbot.poker.evaluator import CARD_BIT, CARD_RANK, CARD_SUIT
+
+# a hand is complete once the pocket and the whole board were added
+FULL_HAND = 7
+
+RANK_BITS = tuple(1 << rank for rank in range(evaluator.RANKS))
+
+
+class HandState(object):
+    __slots__ = ('cards', 'counts', 'suit_masks', 'suit_counts', 'rank_mask',
+                 '_strength')
+
+    def __init__(self, cards=()):
+        self.cards = []
+        self.counts = [0] * evaluator.RANKS
+        self.suit_masks = [0] * evaluator.SUITS
+        self.suit_counts = [0] * evaluator.SUITS
+        self.rank_mask = 0
+        self._strength = None
+        for card in cards:
+            self.add(card)
+
+    def __len__(self):
+        return len(self.cards)
+
+    def add(self, card):
+        card = evaluator.encode(card)
+        suit = CARD_SUIT[card]
+        self.cards.append(card)
+        self.counts[CARD_RANK[card]] += 1
+        self.suit_masks[suit] |= CARD_BIT[card]
+        self.suit_counts[suit] += 1
+        self.rank_mask |= CARD_BIT[card]
+        self._strength = None
+
+    def copy(self):
+        return HandState(self.cards)
+
+    def holds(self, cards):
+        """
+        :return: True if exactly these cards were added, in this order
+        """
+        return len(cards) == len(self.cards) and all(
+            evaluator.encode(card) == held
+            for card, held in zip(cards, self.cards))
+
+    @property
+    def strength(self):
+        """
+        :return: strength of the best hand made so far, comparable with
+        evaluator.evaluate
+        """
+        if self._strength is None:
+            self._strength = evaluator.evaluate_histogram(self.counts,
+                                                          self.suit_masks)
+        return self._strength
+
+    @property
+    def category(self):
+        return evaluator.category(self.strength)
+
+    @property
+    def flush_draw(self):
+        """
+        True with four cards of a suit and more cards to come.
+        """
+        return len(self.cards) < FULL_HAND and \
+            max(self.suit_counts) == 4
+
+    @property
+    def straight_outs(self):
+        """
+        :return: number of ranks that would complete a straight that is not
+        made yet - 2 for an open ended draw, 1 for a gutshot
+        """
+        if len(self.cards) >= FULL_HAND or \
+                evaluator.STRAIGHT_TOP[self.rank_mask] >= 0:
+            return 0
+        return sum(1 for bit in RANK_BITS
+                   if not self.rank_mask & bit and
+                   evaluator.STRAIGHT_TOP[self.rank_mask | bit] >= 0)
@@ -1,8 +1,11 @@
+from collections import namedtuple
 from itertools import combinations
 import os
 import sys
 import logging
 from pokerbot.poker.hands import Hand
+from pokerbot.poker.evaluator import best_hand_rank
+from pokerbot.poker.handstate import HandState
 import random
 
 
@@ -43,10 +46,10 @@ class Fold(Action):
 
     @staticmethod
     def is_valid(player, round_):
-        return player not in round_.folded_players
+        return round_.decision_context(player).allows(Fold)
 
     def apply(self):
-        self.round.folded_players.append(self.player)
+        self.round.fold(self.player)
 
     def __str__(self):
         return "Player %s folds" % self.player
@@ -58,8 +61,7 @@ class Check(Action):
 
     @staticmethod
     def is_valid(player, round_):
-        pot = round_.pot
-        return pot.player_bet(player) == pot.current_bet
+        return round_.decision_context(player).allows(Check)
 
     def apply(self):
         self.player.checked = True
@@ -76,11 +78,11 @@ class Call(AmountableAction):
         super(Call, self).__init__(
             player,
             round_,
-            round_.pot.amount_to_call(player))
+            round_.decision_context(player).to_call)
 
     @staticmethod
     def is_valid(player, round_):
-        return player.money >= round_.pot.amount_to_call(player) > 0
+        return round_.decision_context(player).allows(Call)
 
     def apply(self):
         self.player.bet(self.amount, self.round)
@@ -96,10 +98,10 @@ class Bet(AmountableAction):
     MAX_RAISE = 30
 
     def __init__(self, player, round_, amount=None):
-        bet_min = round_.pot.minimum_to_bet(player)
-        bet_max = round_.pot.maximum_to_bet(player, round_)
-        bet_max = min(bet_min + Bet.MAX_RAISE, bet_max)
-        LOGGER.info("Setting bet limits to %d-%d" % (bet_min, bet_max))
+        context = round_.decision_context(player)
+        bet_min = context.min_bet
+        bet_max = min(bet_min + Bet.MAX_RAISE, context.max_bet)
+        LOGGER.info("Setting bet limits to %d-%d", bet_min, bet_max)
 
         while (amount is None) or (bet_min > amount or amount > bet_max):
             try:
@@ -107,14 +109,13 @@ class Bet(AmountableAction):
             except ValueError as e:
                 LOGGER.error("Error while getting ammount: %s", str(e))
                 sys.exit(0)
-        LOGGER.debug("Player %s bet: %d" % (player, amount))
+        LOGGER.debug("Player %s bet: %d", player, amount)
 
         super(Bet, self).__init__(player, round_, amount)
 
     @staticmethod
     def is_valid(player, round_):
-        bet_max = round_.pot.maximum_to_bet(player, round_)
-        return bet_max >= round_.pot.minimum_to_bet(player) > 0
+        return round_.decision_context(player).allows(Bet)
 
     def apply(self):
         self.player.money -= self.amount
@@ -124,6 +125,47 @@ class Bet(AmountableAction):
         return "Player %s bets %d" % (self.player.name, self.amount)
 
 
+# actions in the order they are offered, bit i of a legal action mask
+# stands for ACTIONS[i]
+ACTIONS = (Check, Call, Bet, Fold)
+ACTION_BITS = dict((action, 1 << index)
+                   for index, action in enumerate(ACTIONS))
+
+
+class DecisionContext(namedtuple('DecisionContext', [
+        'player', 'legal', 'to_call', 'min_bet', 'max_bet'])):
+    """
+    What a player may do on their turn, computed once per decision.
+    legal is the mask of the legal ACTIONS, to_call the amount to call and
+    min_bet/max_bet the range a Bet may take.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def for_player(cls, player, round_):
+        pot = round_.pot
+        to_call = pot.amount_to_call(player)
+        min_bet = pot.minimum_to_bet(player)
+        max_bet = pot.maximum_to_bet(player)
+        legal = 0
+        if to_call == 0:
+            legal |= ACTION_BITS[Check]
+        if player.money >= to_call > 0:
+            legal |= ACTION_BITS[Call]
+        if max_bet >= min_bet > 0:
+            legal |= ACTION_BITS[Bet]
+        if not round_.is_folded(player):
+            legal |= ACTION_BITS[Fold]
+        return cls(player, legal, to_call, min_bet, max_bet)
+
+    def allows(self, action):
+        return bool(self.legal & ACTION_BITS[action])
+
+    @property
+    def actions(self):
+        return [action for action in ACTIONS if self.legal & ACTION_BITS[action]]
+
+
 class NotEnoughMoneyException(Exception):
     pass
 
@@ -137,8 +179,8 @@ class BasePlayer(object):
         BasePlayer.ids += 1
         self.name = name
         self.pocket = None
+        self.hand_state = None
         self.money = starting_money
-        self.first_bet = False
         self.checked = False
         self.last_bet = 0
 
@@ -150,6 +192,10 @@ class BasePlayer(object):
 
     def set_pocket(self, card1, card2):
         self.pocket = [card1, card2]
+        self.hand_state = HandState(self.pocket)
+
+    def add_community_card(self, card):
+        self.hand_state.add(card)
 
     def bet(self, amount, round_):
         if amount > self.money:
@@ -169,7 +215,7 @@ class BasePlayer(object):
         :return:
                 amount of money actually taken
         """
-        LOGGER.info("Forcing %s to bet %d" % (self.name, amount))
+        LOGGER.info("Forcing %s to bet %d", self.name, amount)
         amount = min(amount, self.money)
         self.bet(amount, round_)
         return amount
@@ -186,10 +232,10 @@ class BasePlayer(object):
         return round_.is_folded(self)
 
     def can_bet(self, round_):
-        return len(round_.active_players) > 1 and self.money > 0 and \
-            self.first_bet or (
-                not self.is_folded(round_) and
-                round_.pot.amount_to_call(self) > 0)
+        # still in the hand with chips behind and yet to act since the
+        # street started or the last raise
+        return len(round_.active_players) > 1 and \
+            round_.seats.is_waiting(self)
 
     @staticmethod
     def generate_possible_hands(pocket, community_cards):
@@ -204,15 +250,19 @@ class BasePlayer(object):
         best_hand = max(self.possible_hands(community_cards))
         return best_hand
 
+    def best_hand_rank(self, community_cards):
+        # the hand state follows the round's board as it is opened
+        state = self.hand_state
+        if state is not None and \
+                state.holds(list(self.pocket) + list(community_cards)):
+            return state.strength
+        return best_hand_rank(self.pocket, community_cards)
+
     def available_actions(self, _round):
-        LOGGER.debug("fetching available moves")
         if not _round:
             LOGGER.debug("0 moves for false round")
             return []
-        LOGGER.debug("round is ok, fetching moves")
-        return list(filter(
-            lambda x: x.is_valid(self, _round),
-            [Check, Call, Bet, Fold]))
+        return _round.decision_context(self).actions
 
     def choose_action_message(self, round_):
         return os.linesep.join([
@@ -1,7 +1,11 @@
 from random import choice
-from collections import defaultdict
 import logging
 from pokerbot.poker.deck import Deck
+from pokerbot.poker.evaluator import category_name
+from pokerbot.poker.player import DecisionContext
+from pokerbot.poker.potstate import PotState
+from pokerbot.poker.seats import SeatRing
+from pokerbot.poker import showdown
 from multiprocessing import Queue
 
 LOGGER = logging.getLogger('poker-main')
@@ -17,50 +21,50 @@ class Events:
 
 
 class Pot(object):
-    def __init__(self, small_blind):
-        self.bets = defaultdict(int)
+    def __init__(self, small_blind, players=()):
+        self.state = PotState()
+        for player in players:
+            self.state.seat(player, player.money)
         self.last_raise = small_blind * 2
-        self.total_pot_money = 0
+
+    @property
+    def bets(self):
+        return self.state.contributions
+
+    @property
+    def total_pot_money(self):
+        return self.state.total
 
     @property
     def current_bet(self):
-        return max(self.bets.values())
+        return self.state.current_bet
 
     def player_bet(self, player):
-        return self.bets[player]
+        return self.state.contribution(player)
 
     def amount_to_call(self, player):
-        return self.current_bet - self.bets[player]
+        return self.state.amount_to_call(player)
 
     def minimum_to_bet(self, player):
-        LOGGER.debug("current bet: %d, last raise: %d, player_bet: %d" % (
-            self.current_bet, self.last_raise, self.player_bet(player)
-        ))
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug("current bet: %d, last raise: %d, player_bet: %d",
+                         self.current_bet, self.last_raise,
+                         self.player_bet(player))
         return max(0, self.amount_to_call(player) + 2)
 
-    def maximum_to_bet(self, player, round_):
-        max_raise = min([player1.money - self.minimum_to_bet(player1)
-            for player1 in round_.active_players])
+    def maximum_to_bet(self, player):
+        # every active player can still raise by what the shortest of them
+        # has left after calling the minimum bet, their chips in the pot
+        # and behind add up to the stack they started the hand with
+        max_raise = self.state.cap - self.current_bet - 2
         return min(self.minimum_to_bet(player) + max_raise, player.money)
 
-    def take_pot_for_player(self, player):
-        player_bet = self.player_bet(player)
-
-        winnings = 0
-        # take amount from all bets
-        for player, bet in self.bets.items():
-            # see how much is possible to take from player
-            possible_to_take = min(bet, player_bet)
-            winnings += possible_to_take
-            # remove as much as possible from player
-            self.bets[player] -= possible_to_take
-
-        return winnings
+    def fold(self, player):
+        self.state.fold(player)
 
     def bet(self, player, amount):
-        LOGGER.info("%s bets %d" % (player, amount))
-        self.bets[player] += amount
-        self.total_pot_money += amount
+        LOGGER.info("%s bets %d", player, amount)
+        self.state.add(player, amount, player.money == 0)
         self.last_raise = amount - self.amount_to_call(player)
 
 
@@ -69,14 +73,19 @@ class Round(object):
         self.game = game
         self.event_queue = event_queue
         self.players = players[:]
-        self.folded_players = []
+        self.seats = SeatRing(self.players)
         self.small_blind = small_blind
         self.betting_player = None
-        self.deck = Deck()
+        # the game's deck is reused by every round
+        self.deck = game.deck
+        self.deck.restore()
         self.community_cards = []
         self.button_player = button_player
-        self.pot = Pot(self.small_blind)
+        self.pot = Pot(self.small_blind, self.players)
         self.action_log = []
+        self.showdown = None
+        # what the betting player may do, published once per turn
+        self.decision = None
         LOGGER.info("Dealing cards")
         for player in self.players:
             player.set_pocket(self.deck.draw_single(), self.deck.draw_single())
@@ -84,18 +93,37 @@ class Round(object):
     def bet(self, player, amount):
         self.event_queue.put(Events.PLAYER_BET)
         self.pot.bet(player, amount)
+        if player.money == 0:
+            self.seats.go_all_in(player)
+
+    def fold(self, player):
+        self.seats.fold(player)
+        self.pot.fold(player)
 
     def is_folded(self, player):
-        return player in self.folded_players
+        return self.seats.is_folded(player)
+
+    @property
+    def folded_players(self):
+        return [player for player in self.players if self.is_folded(player)]
 
     @property
     def active_players(self):
-        return [player for player in
-                self.players if player not in self.folded_players]
+        # cached by the seat ring until the next fold, do not modify
+        return self.seats.active
 
     def after(self, player):
-        index = self.players.index(player)
-        return self.players[(index + 1) % len(self.players)]
+        return self.seats.after(player)
+
+    def decision_context(self, player):
+        """
+        :return: player.DecisionContext of the player, the published one on
+        the player's turn
+        """
+        context = self.decision
+        if context is None or context.player is not player:
+            context = DecisionContext.for_player(player, self)
+        return context
 
     def take_blinds(self):
         LOGGER.info("Taking blinds from players")
@@ -111,8 +139,8 @@ class Round(object):
 
     def winner(self):
         # check if only a single player is left
-        if len(self.players) - len(self.folded_players) == 1:
-            return self.players[0]
+        if len(self.active_players) == 1:
+            return self.active_players[0]
         return None
 
     def pre_flop_betting(self):
@@ -140,38 +168,39 @@ class Round(object):
         self.place_bets()
 
     def next_betting_player(self):
-        start = self.betting_player
-        candidate = self.after(start)
-        while candidate is not start:
-            if candidate.can_bet(self):
-                LOGGER.info("Found betting player %s" % candidate)
-                return candidate
-            LOGGER.info("Skipping player %s" % candidate)
-            candidate = self.after(candidate)
-        return None
+        # nobody bets once everybody else folded
+        if len(self.active_players) < 2:
+            return None
+        candidate = self.seats.next_to_act(self.betting_player)
+        LOGGER.info("Found betting player %s", candidate)
+        return candidate
 
     def place_bets(self):
         # when no betting players are left
         # self.betting_player will be set to None
 
-        # set player first_bet to True to indicate this player is yet to bet
-        for player in self.active_players:
-            player.first_bet = True
+        # every player who neither folded nor went all in is yet to bet
+        self.seats.new_street()
 
         if not self.betting_player.can_bet(self):
-            LOGGER.info("Skipping player: %s" % str(self.betting_player))
+            LOGGER.info("Skipping player: %s", self.betting_player)
             self.betting_player = self.next_betting_player()
 
         while self.betting_player is not None:
             LOGGER.info("player %s is choosing an action",
                         self.betting_player)
-            self.betting_player.first_bet = False
             self.event_queue.put(Events.PLAYER_BETTING)
+            self.decision = DecisionContext.for_player(self.betting_player,
+                                                       self)
             action = self.betting_player.interact(self.game)
-            LOGGER.info("%s chose Action: %s" % (
-                self.betting_player, action.__class__.__name__))
+            LOGGER.info("%s chose Action: %s", self.betting_player,
+                        action.__class__.__name__)
             self.action_log.append(action)
+            current_bet = self.pot.current_bet
             action.apply()
+            self.decision = None
+            self.seats.act(self.betting_player,
+                           self.pot.current_bet > current_bet)
             self.betting_player = self.next_betting_player()
 
         LOGGER.info("Done betting for pre_flop_round")
@@ -192,14 +221,14 @@ class Round(object):
         self.pre_river_betting()
         self.open_river_cards()
         self.final_betting()
-        LOGGER.info("Round winners:")
-        for winner_ in self.get_round_winners():
-            LOGGER.info("%s" % winner_)
         return dict(self.finish_round())
 
     def open_card(self):
         self.event_queue.put(Events.CARD_OPENED)
-        self.community_cards.append(self.deck.draw_single())
+        card = self.deck.draw_single()
+        self.community_cards.append(card)
+        for player in self.players:
+            player.add_community_card(card)
 
     def open_flop_cards(self):
         self.open_card()
@@ -212,24 +241,36 @@ class Round(object):
     def open_river_cards(self):
         self.open_card()
 
+    def seat_order(self):
+        """
+        :return: the round's players starting left of the button
+        """
+        index = self.players.index(self.button_player) + 1
+        return self.players[index:] + self.players[:index]
+
+    def resolve_showdown(self):
+        """
+        Evaluate every live hand once and award the pot.
+        :return: showdown.Showdown, kept as self.showdown
+        """
+        if self.showdown is None:
+            strengths = dict(
+                (player, player.best_hand_rank(self.community_cards))
+                for player in self.active_players)
+            self.showdown = showdown.resolve(self.pot.state, strengths,
+                                             self.seat_order())
+        return self.showdown
+
     def finish_round(self):
         self.event_queue.put(Events.ROUND_FINISHED)
-        for winner_ in self.get_round_winners():
-            winnings = self.pot.take_pot_for_player(winner_)
-            LOGGER.info("Giving winnings (%d) to player: %s [%s]" % (
-                winnings,
-                winner_.name,
-                winner_.best_hand(self.community_cards)))
+        result = self.resolve_showdown()
+        for winner_, winnings in result.winnings.items():
+            LOGGER.info("Giving winnings (%d) to player: %s [%s]", winnings,
+                        winner_.name,
+                        category_name(result.strengths[winner_]))
             winner_.money += winnings
             yield winner_, winnings
 
-    def get_round_winners(self):
-        return sorted(
-            set(self.players) - set(self.folded_players),
-            key=lambda x: x.best_hand(self.community_cards),
-            reverse=True
-        )
-
 
 class Poker(object):
     def __init__(self, players):
@@ -240,12 +281,14 @@ class Poker(object):
         # list of all players in game
         self.players = players
 
+        self.seats = SeatRing(self.players)
         self.button_player = choice(self.players)
         self.small_blind = 15
         self.rounds = []
         self.log = ["STARTING GAME..."]
         self.current_round = None
         self.event_queue = Queue()
+        self.deck = Deck()
 
     def winner(self):
         """
@@ -254,8 +297,7 @@ class Poker(object):
         return self.players[0] if len(self.players) == 1 else None
 
     def after(self, player):
-        player_index = (self.players.index(player) + 1) % len(self.players)
-        return self.players[player_index]
+        return self.seats.after(player)
 
     def advance_button_player(self):
         self.button_player = self.after(self.button_player)
@@ -267,10 +309,10 @@ class Poker(object):
         LOGGER.debug("Starting game")
         while self.winner() is None:
             self.event_queue.put(Events.GAME_STARTED)
-            LOGGER.info("Playing round #%d" % (len(self.rounds) + 1))
+            LOGGER.info("Playing round #%d", len(self.rounds) + 1)
             LOGGER.info("Players are:")
             for player in self.players:
-                LOGGER.info("%s" % player)
+                LOGGER.info("%s", player)
             round_ = Round(
                 self.players,
                 self.button_player,
@@ -280,23 +322,25 @@ class Poker(object):
             winnings = round_.play()
             self.rounds.append(round_)
 
+            strengths = round_.showdown.strengths
             for player, winning in winnings.items():
-                hand = player.best_hand(round_.community_cards)
+                strength = strengths[player]
                 self.log.append("Round %d - %s won %d with %s [%s]" % (
                     len(self.rounds) + 1,
                     player.name,
                     winning,
-                    hand.__class__.__name__,
-                    str(hand)))
+                    category_name(strength),
+                    ", ".join(str(c) for c in player.pocket)))
             # move button (before possibly removing button player)
             self.advance_button_player()
 
             # set up players
-            for player in self.players:
-                if player.money == 0:
-                    LOGGER.info("Player %s finished the game" % str(player))
-                    self.finished_players.append(player)
-                    self.players.remove(player)
+            for player in [p for p in self.players if p.money == 0]:
+                LOGGER.info("Player %s finished the game", player)
+                self.finished_players.append(player)
+                self.players.remove(player)
+            if len(self.seats) != len(self.players):
+                self.seats = SeatRing(self.players)
 
         winner = self.winner()
         self.log.append("%s won the game." % winner)
@@ -0,0 +1,113 @@
+"""
+Incremental pot state of a single hand.
+
+Every bet is added as it is made: the per player contributions, the
+running highest contribution and the total are updated in O(1) and the
+contribution levels of all-in players are kept sorted, so betting queries
+never scan the table. Side pots are built from those in a single pass over
+the sorted contributions once the betting is over.
+
+Shared by the poker engine (poker.Pot) and the training table
+(ai.table.Table).
+"""
+from bisect import bisect_left, insort
+from collections import namedtuple
+
+# one layer of the pot and the live players competing for it, in the order
+# they first put chips in
+SidePot = namedtuple('SidePot', ['amount', 'players'])
+
+
+class PotState(object):
+    __slots__ = ('contributions', 'current_bet', 'total', 'folded',
+                 'all_in_levels', 'stacks', '_cap')
+
+    def __init__(self):
+        self.contributions = {}
+        self.current_bet = 0
+        self.total = 0
+        self.folded = set()
+        self.all_in_levels = []
+        # chips every seated player started the hand with
+        self.stacks = {}
+        self._cap = None
+
+    def reset(self):
+        self.__init__()
+
+    def seat(self, player, stack):
+        """
+        Register the chips a player starts the hand with, see cap.
+        """
+        self.stacks[player] = stack
+        self._cap = None
+
+    def add(self, player, amount, all_in=False):
+        contribution = self.contributions.get(player, 0) + amount
+        self.contributions[player] = contribution
+        self.total += amount
+        if contribution > self.current_bet:
+            self.current_bet = contribution
+        if all_in:
+            index = bisect_left(self.all_in_levels, contribution)
+            if index == len(self.all_in_levels) or \
+                    self.all_in_levels[index] != contribution:
+                insort(self.all_in_levels, contribution)
+
+    def fold(self, player):
+        self.folded.add(player)
+        if self._cap is not None and self.stacks.get(player) == self._cap:
+            self._cap = None
+
+    def contribution(self, player):
+        return self.contributions.get(player, 0)
+
+    def amount_to_call(self, player):
+        return self.current_bet - self.contributions.get(player, 0)
+
+    @property
+    def cap(self):
+        """
+        :return: the smallest starting stack of the seated players still in
+        the hand, the most any of them can have in the pot
+        """
+        if self._cap is None:
+            self._cap = min([stack for player, stack in self.stacks.items()
+                             if player not in self.folded] or [0])
+        return self._cap
+
+    def side_pots(self):
+        """
+        :return: list of SidePot, the main pot first. Chips put in above
+        the highest live contribution belong to the last pot.
+        """
+        live = [player for player in self.contributions
+                if player not in self.folded]
+        if not live:
+            return [SidePot(self.total, ())] if self.total else []
+        top = max(self.contributions[player] for player in live)
+        levels = self.all_in_levels[:bisect_left(self.all_in_levels, top)]
+        levels.append(top)
+
+        amounts = sorted(self.contributions.values())
+        pots = []
+        previous = 0
+        taken = 0
+        i = 0
+        for level in levels:
+            # contributions below the level end in this layer, the rest
+            # all put (level - previous) chips in it
+            amount = 0
+            while i < len(amounts) and amounts[i] < level:
+                amount += amounts[i] - previous
+                i += 1
+            amount += (len(amounts) - i) * (level - previous)
+            pots.append(SidePot(amount, tuple(
+                player for player in live
+                if self.contributions[player] >= level)))
+            taken += amount
+            previous = level
+        if taken < self.total:
+            last = pots[-1]
+            pots[-1] = SidePot(last.amount + self.total - taken, last.players)
+        return pots
@@ -0,0 +1,94 @@
+"""
+Seat ring of a single hand.
+
+The players sit in a fixed ring. Seat numbers are looked up in a dict and
+the folded, all-in and acted states are bitmasks over the seats, so moving
+around the table and finding the next player to act are a few integer
+operations regardless of the table size.
+"""
+
+
+class SeatRing(object):
+    __slots__ = ('players', 'seats', 'full', 'folded', 'all_in', 'acted',
+                 '_active')
+
+    def __init__(self, players):
+        self.players = list(players)
+        self.seats = dict((player, seat) for seat, player in
+                          enumerate(self.players))
+        self.full = (1 << len(self.players)) - 1
+        self.folded = 0
+        self.all_in = 0
+        # players who acted since the street started or the last raise
+        self.acted = 0
+        self._active = None
+
+    def __len__(self):
+        return len(self.players)
+
+    def bit(self, player):
+        return 1 << self.seats[player]
+
+    def after(self, player):
+        seat = self.seats[player] + 1
+        return self.players[seat if seat < len(self.players) else 0]
+
+    def fold(self, player):
+        self.folded |= self.bit(player)
+        self._active = None
+
+    def is_folded(self, player):
+        return bool(self.folded & self.bit(player))
+
+    def go_all_in(self, player):
+        self.all_in |= self.bit(player)
+
+    def is_all_in(self, player):
+        return bool(self.all_in & self.bit(player))
+
+    def new_street(self):
+        self.acted = 0
+
+    def act(self, player, raised=False):
+        """
+        Record a player's action, a raise makes everybody else act again.
+        """
+        if raised:
+            self.acted = self.bit(player)
+        else:
+            self.acted |= self.bit(player)
+
+    @property
+    def active(self):
+        """
+        :return: list of the players who did not fold, in seat order
+        """
+        if self._active is None:
+            self._active = [player for seat, player in enumerate(self.players)
+                            if not self.folded >> seat & 1]
+        return self._active
+
+    def waiting(self):
+        """
+        :return: bitmask of the players who still have to act this street
+        """
+        return self.full & ~(self.folded | self.all_in | self.acted)
+
+    def is_waiting(self, player):
+        return bool(self.waiting() & self.bit(player))
+
+    def next_to_act(self, player):
+        """
+        :return: the first waiting player after player, player itself last,
+        None if nobody is waiting
+        """
+        waiting = self.waiting()
+        if not waiting:
+            return None
+        seat = self.seats[player]
+        later = waiting >> (seat + 1)
+        if later:
+            seat += (later & -later).bit_length()
+        else:
+            seat = (waiting & -waiting).bit_length() - 1
+        return self.players[seat]
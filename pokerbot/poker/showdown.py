@@ -0,0 +1,52 @@
+"""
+Showdown resolution of a finished hand.
+
+Every live player's hand is evaluated once, by the caller, and passed in as
+a strength. The side pots of the hand's PotState are then awarded layer by
+layer to the strongest eligible hands. A split pot gives its odd chips one
+at a time to the winners in seat order, starting left of the button.
+
+The returned Showdown is the single record of the hand's outcome, read by
+logging, the GUI and fitness accounting alike.
+"""
+from collections import OrderedDict, namedtuple
+
+# one side pot: its size, the players eligible for it, the winners and the
+# chips each of them gets
+PotAward = namedtuple('PotAward', ['amount', 'players', 'winners', 'shares'])
+
+# strengths: live player -> strength, pots: list of PotAward, main pot
+# first, winnings: player -> chips won over all pots, in the order they
+# were won
+Showdown = namedtuple('Showdown', ['strengths', 'pots', 'winnings'])
+
+
+def resolve(pot, strengths, order=None):
+    """
+    :param pot: PotState of the finished hand
+    :param strengths: live player -> hand strength, higher wins. Only used
+    for pots contested by more than one player.
+    :param order: players in the order odd chips are handed out, by default
+    the order they first put chips in
+    :return: Showdown
+    """
+    position = dict((player, index) for index, player in
+                    enumerate(pot.contributions if order is None else order))
+    pots = []
+    winnings = OrderedDict()
+    for side_pot in pot.side_pots():
+        players = side_pot.players
+        if len(players) > 1:
+            best = max(strengths[player] for player in players)
+            winners = sorted((player for player in players
+                              if strengths[player] == best),
+                             key=lambda player: position.get(player, 0))
+        else:
+            winners = list(players)
+        share, odd_chips = divmod(side_pot.amount, len(winners))
+        shares = [share + (index < odd_chips) for index in range(len(winners))]
+        for winner, amount in zip(winners, shares):
+            winnings[winner] = winnings.get(winner, 0) + amount
+        pots.append(PotAward(side_pot.amount, players, tuple(winners),
+                             tuple(shares)))
+    return Showdown(strengths, pots, winnings)
@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+
+from pokerbot.ai.cache import EquityCache, canonical_key
+from pokerbot.poker.deck import Card, Suits
+
+
+class TestCanonicalKey(unittest.TestCase):
+
+    def test_suit_isomorphic_spots_share_a_key(self):
+        first = canonical_key(
+            [Card(14, Suits.HEARTS), Card(13, Suits.HEARTS)],
+            [Card(12, Suits.HEARTS), Card(7, Suits.CLUBS),
+             Card(2, Suits.DIAMONDS)], 2)
+        second = canonical_key(
+            [Card(13, Suits.SPADES), Card(14, Suits.SPADES)],
+            [Card(2, Suits.CLUBS), Card(12, Suits.SPADES),
+             Card(7, Suits.HEARTS)], 2)
+        self.assertEqual(first, second)
+
+    def test_different_spots_differ(self):
+        pocket = [Card(14, Suits.HEARTS), Card(13, Suits.HEARTS)]
+        flop = [Card(12, Suits.HEARTS), Card(7, Suits.CLUBS),
+                Card(2, Suits.DIAMONDS)]
+        offsuit = [Card(14, Suits.HEARTS), Card(13, Suits.CLUBS)]
+        self.assertNotEqual(canonical_key(pocket, flop, 2),
+                            canonical_key(offsuit, flop, 2))
+        self.assertNotEqual(canonical_key(pocket, flop, 2),
+                            canonical_key(pocket, flop, 3))
+
+
+class TestEquityCache(unittest.TestCase):
+
+    def test_lru_eviction_and_counters(self):
+        cache = EquityCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.put('c', 3)
+        self.assertNotIn('b', cache)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(cache.hit_ratio, 0.5)
+
+    def test_lookup_computes_once(self):
+        cache = EquityCache()
+        calls = []
+        pocket = [Card(14, Suits.HEARTS), Card(13, Suits.HEARTS)]
+        flop = [Card(12, Suits.HEARTS), Card(7, Suits.CLUBS),
+                Card(2, Suits.DIAMONDS)]
+        for _ in range(3):
+            cache.lookup(pocket, flop, 1, lambda: calls.append(1) or 0.5)
+        self.assertEqual(len(calls), 1)
+
+    def test_persistence(self):
+        path = os.path.join(tempfile.mkdtemp(), 'equity.cache')
+        cache = EquityCache(path=path)
+        cache.put(('key',), 0.25)
+        cache.save()
+        self.assertEqual(EquityCache(path=path).get(('key',)), 0.25)
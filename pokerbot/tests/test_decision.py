@@ -0,0 +1,72 @@
+import random
+import unittest
+from unittest import mock
+
+from pokerbot.ai.holdemai import HoldemAI
+from pokerbot.ai.strategies import CFRDistribution
+from pokerbot.poker.player import (Bet, Call, Check, DecisionContext, Fold,
+                                   RandomPlayer)
+from pokerbot.poker.poker import Poker, Round
+
+
+class TestDecisionContext(unittest.TestCase):
+
+    def setUp(self):
+        self.players = [RandomPlayer(name, 200) for name in 'abc']
+        game = Poker(self.players)
+        self.round = Round(self.players, self.players[0], 15,
+                           game.event_queue, game)
+        self.round.take_blinds()
+
+    def test_blinds(self):
+        small, big = self.players[1], self.players[2]
+        context = self.round.decision_context(small)
+        self.assertEqual(context.to_call, 15)
+        self.assertEqual(context.actions, [Call, Bet, Fold])
+        context = self.round.decision_context(big)
+        self.assertEqual(context.to_call, 0)
+        self.assertEqual(context.actions, [Check, Bet, Fold])
+        self.assertEqual(context.min_bet, 2)
+        self.assertEqual(context.max_bet, 170)
+
+    def test_published_context_is_reused(self):
+        player = self.players[0]
+        context = DecisionContext.for_player(player, self.round)
+        self.round.decision = context
+        self.assertIs(self.round.decision_context(player), context)
+        self.assertIsNot(self.round.decision_context(self.players[1]),
+                         context)
+
+    def test_short_stack_can_not_call(self):
+        self.players[0].money = 10
+        context = DecisionContext.for_player(self.players[0], self.round)
+        self.assertEqual(context.actions, [Fold])
+        self.assertFalse(Call.is_valid(self.players[0], self.round))
+
+    def test_illegal_raise_falls_back_to_call(self):
+        # covers the call, not the minimum raise
+        player = HoldemAI('holdem', 31)
+        players = [player] + self.players[1:]
+        game = Poker(players)
+        game.current_round = Round(players, player, 15, game.event_queue,
+                                   game)
+        game.current_round.take_blinds()
+        with mock.patch.object(HoldemAI, 'act', return_value=('raise', 100)):
+            action = player.interact(game)
+        self.assertIsInstance(action, Call)
+
+
+class TestCFRDistribution(unittest.TestCase):
+
+    def test_equal_weights_are_kept(self):
+        dist = CFRDistribution(0.35, 0.1, 0.2, 0.35)
+        self.assertEqual(len(dist.distributions), 4)
+        random.seed(0)
+        for _ in range(200):
+            dist.decision()
+
+    def test_decision_is_legal(self):
+        dist = CFRDistribution(0.45, 0.05, 0.3, 0.1)
+        random.seed(1)
+        for _ in range(100):
+            self.assertIn(dist.decision([Check, Fold]), [Check, Fold])
@@ -0,0 +1,72 @@
+import pickle
+import random
+import unittest
+
+from pokerbot.poker.deck import Card, Deck, Suits, CARDS
+
+
+class TestCard(unittest.TestCase):
+
+    def test_packed_int(self):
+        self.assertEqual(Card(2, Suits.HEARTS), 0)
+        self.assertEqual(Card(14, Suits.SPADES), 51)
+        self.assertIs(Card(14, Suits.SPADES), CARDS[51])
+        for card in CARDS:
+            self.assertIs(Card(card.value, card.suit), card)
+
+    def test_deuces_conversion(self):
+        # deuces' Card.new('As'), Card.new('2h') and Card.new('Tc')
+        self.assertEqual(Card(14, Suits.SPADES).to_deuces(), 268442665)
+        self.assertEqual(Card(2, Suits.HEARTS).to_deuces(), 73730)
+        self.assertEqual(Card(10, Suits.CLUBS).to_deuces(), 16812055)
+        for card in CARDS:
+            self.assertIs(Card.from_deuces(card.to_deuces()), card)
+
+    def test_pickle(self):
+        card = Card(12, Suits.DIAMONDS)
+        self.assertIs(pickle.loads(pickle.dumps(card)), card)
+
+
+class TestDeck(unittest.TestCase):
+
+    def test_full_deck(self):
+        self.assertEqual(sorted(Deck().cards), list(CARDS))
+
+    def test_draw_without_replacement(self):
+        deck = Deck(random.Random(0))
+        drawn = deck.draw(50) + [deck.draw_single(), deck.draw_single()]
+        self.assertEqual(sorted(drawn), list(CARDS))
+        self.assertEqual(len(deck), 0)
+        self.assertRaises(IndexError, deck.draw_single)
+
+    def test_reset(self):
+        deck = Deck(random.Random(0))
+        deck.draw(10)
+        deck.reset()
+        self.assertEqual(len(deck), 52)
+        self.assertEqual(sorted(deck.draw(52)), list(CARDS))
+
+    def test_exclude(self):
+        deck = Deck(random.Random(0))
+        dead = [Card(14, Suits.HEARTS), Card(14, Suits.SPADES), 7]
+        self.assertEqual(deck.exclude(dead), 49)
+        self.assertEqual(deck.cards, [card for card in CARDS
+                                      if card not in dead])
+        deck.draw(5)
+        deck.reset()
+        self.assertEqual(len(deck), 49)
+        self.assertFalse(set(deck.draw(49)) & set(dead))
+        deck.restore()
+        self.assertEqual(sorted(deck.cards), list(CARDS))
+
+    def test_draw_into(self):
+        deck = Deck(random.Random(0))
+        buffer = [None] * 7
+        deck.draw_into(buffer, 2)
+        self.assertEqual(buffer[:2], [None, None])
+        self.assertEqual(len(set(buffer[2:])), 5)
+        self.assertEqual(len(deck), 47)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+from itertools import combinations
+import random
+import unittest
+
+import numpy as np
+
+from pokerbot.ai import equity
+from pokerbot.ai.analyzer import Analyzer
+from pokerbot.ai.cache import EquityCache
+from pokerbot.poker import evaluator
+from pokerbot.poker.deck import Card, Suits
+
+
+class TestEvaluateBatch(unittest.TestCase):
+
+    def test_matches_scalar_evaluator(self):
+        rng = random.Random(3)
+        for count in (5, 6, 7):
+            sets = [rng.sample(range(evaluator.CARDS), count)
+                    for _ in range(3000)]
+            expected = [evaluator.evaluate(cards) for cards in sets]
+            self.assertEqual(list(equity.evaluate_batch(sets)), expected)
+
+    def test_base_cards(self):
+        rng = random.Random(4)
+        sets = [rng.sample(range(4, evaluator.CARDS), 3) for _ in range(500)]
+        base = [0, 1, 2, 3]
+        expected = [evaluator.evaluate(cards + base) for cards in sets]
+        self.assertEqual(list(equity.evaluate_batch(sets, base)), expected)
+
+    def test_keeps_leading_shape(self):
+        cards = np.arange(2 * 3 * 7).reshape(2, 3, 7)
+        self.assertEqual(equity.evaluate_batch(cards).shape, (2, 3))
+
+
+class TestSimulate(unittest.TestCase):
+
+    def test_outcomes_partition_rollouts(self):
+        win, tie, loss = equity.simulate(
+            [Card(14, Suits.HEARTS), Card(14, Suits.SPADES)], [], 7, 500,
+            np.random.default_rng(1))
+        self.assertEqual(len(win), 500)
+        self.assertTrue(((win.astype(int) + tie + loss) == 1).all())
+
+    def test_draw_excludes_dead_cards(self):
+        remaining = equity.remaining_cards([0, 1, 2])
+        drawn = equity.draw(remaining, 200, 10, np.random.default_rng(2))
+        self.assertFalse(np.isin(drawn, [0, 1, 2]).any())
+        self.assertTrue(all(len(set(row)) == 10 for row in drawn))
+
+    def test_pot_shares(self):
+        shares = equity.pot_shares(
+            [Card(14, Suits.HEARTS), Card(14, Suits.SPADES)], [], 3, 2000,
+            np.random.default_rng(5))
+        self.assertEqual(shares.shape, (4,))
+        self.assertAlmostEqual(shares.sum(), 1)
+        self.assertGreater(shares[0], shares[1:].max())
+        # a board straight is always split
+        board = [Card(value, Suits.SUITS[value % 3]) for value in range(10, 15)]
+        shares = equity.pot_shares(
+            [Card(2, Suits.HEARTS), Card(3, Suits.SPADES)], board, 1, 100,
+            np.random.default_rng(6))
+        self.assertAlmostEqual(shares[0], shares[1])
+
+    def test_aces_heads_up(self):
+        analyzer = Analyzer(np.random.default_rng(4))
+        analyzer.set_num_opponents(1)
+        analyzer.set_monte_carlo_rounds(20000)
+        analyzer.set_pocket_cards(Card(14, Suits.HEARTS),
+                                  Card(14, Suits.SPADES))
+        self.assertAlmostEqual(analyzer.analyze(), 0.85, delta=0.02)
+
+
+class TestExact(unittest.TestCase):
+
+    pocket = [Card(9, Suits.HEARTS), Card(8, Suits.HEARTS)]
+    turn = [Card(14, Suits.CLUBS), Card(2, Suits.DIAMONDS),
+            Card(7, Suits.CLUBS), Card(10, Suits.HEARTS)]
+    river = turn + [Card(9, Suits.CLUBS)]
+
+    def test_river_heads_up_matches_brute_force(self):
+        hero = evaluator.evaluate(self.pocket + self.river)
+        outcomes = [0, 0, 0]
+        for hand in combinations(
+                equity.remaining_cards(self.pocket + self.river), 2):
+            opponent = evaluator.evaluate([int(card) for card in hand] +
+                                          self.river)
+            outcomes[(hero < opponent) - (hero > opponent) + 1] += 1
+        win, tie, loss, showdowns = equity.exact(self.pocket, self.river, 1)
+        self.assertEqual(showdowns, 990)
+        self.assertAlmostEqual(win, outcomes[0] / 990)
+        self.assertAlmostEqual(tie, outcomes[1] / 990)
+        self.assertAlmostEqual(loss, outcomes[2] / 990)
+
+    def test_two_opponents_match_simulation(self):
+        for board in (self.turn, self.river):
+            win, tie, loss, _ = equity.exact(self.pocket, board, 2)
+            self.assertAlmostEqual(win + tie + loss, 1)
+            simulated = equity.simulate(self.pocket, board, 2, 100000,
+                                        np.random.default_rng(11))
+            self.assertAlmostEqual(win, simulated[0].mean(), delta=0.006)
+            self.assertAlmostEqual(tie, simulated[1].mean(), delta=0.003)
+
+    def test_estimate_switches_to_exact(self):
+        self.assertIsNone(equity.enumeration_size(3, 3))
+        self.assertGreater(equity.enumeration_size(3, 1),
+                           equity.EXACT_MAX_SHOWDOWNS)
+        result = equity.estimate(self.pocket, self.turn, 1)
+        self.assertEqual(result.confidence_interval, 0)
+        self.assertEqual(result.win_ratio,
+                         equity.exact(self.pocket, self.turn, 1)[0])
+        sampled = equity.estimate(self.pocket, self.turn, 1,
+                                  exact_threshold=0)
+        self.assertGreater(sampled.confidence_interval, 0)
+
+
+class TestAdaptiveAnalyze(unittest.TestCase):
+
+    def analyzer(self, pocket, community_cards, seed):
+        analyzer = Analyzer(np.random.default_rng(seed), EquityCache())
+        analyzer.set_monte_carlo_rounds(20000)
+        analyzer.set_pocket_cards(*pocket)
+        for card in community_cards:
+            analyzer.community_card(card)
+        return analyzer
+
+    def test_clear_spots_stop_early(self):
+        flop = [Card(14, Suits.CLUBS), Card(14, Suits.DIAMONDS),
+                Card(7, Suits.CLUBS)]
+        quads = self.analyzer(
+            [Card(14, Suits.HEARTS), Card(14, Suits.SPADES)], flop, 7)
+        win_ratio = quads.analyze(target_ci=0.01)
+        self.assertGreater(win_ratio, 0.95)
+        self.assertLessEqual(quads.confidence_interval, 0.01)
+
+        marginal = self.analyzer(
+            [Card(9, Suits.HEARTS), Card(8, Suits.HEARTS)], flop, 8)
+        marginal.analyze(target_ci=0.01)
+        self.assertLessEqual(marginal.confidence_interval, 0.01)
+        self.assertLess(quads.iterations, marginal.iterations)
+
+    def test_time_budget(self):
+        analyzer = self.analyzer(
+            [Card(9, Suits.HEARTS), Card(8, Suits.HEARTS)],
+            [Card(14, Suits.CLUBS), Card(2, Suits.DIAMONDS),
+             Card(7, Suits.CLUBS)], 9)
+        analyzer.analyze(target_ci=0.001, time_budget=0)
+        self.assertEqual(analyzer.iterations, 200)
+        self.assertGreater(analyzer.confidence_interval, 0.001)
+
+    def test_cached_estimates_are_refined(self):
+        analyzer = self.analyzer(
+            [Card(9, Suits.HEARTS), Card(8, Suits.HEARTS)],
+            [Card(14, Suits.CLUBS), Card(2, Suits.DIAMONDS),
+             Card(7, Suits.CLUBS)], 10)
+        analyzer.analyze(target_ci=0.05)
+        first = analyzer.iterations
+        analyzer.analyze(target_ci=0.05)
+        self.assertEqual(analyzer.iterations, first)
+        analyzer.analyze(target_ci=0.02)
+        self.assertGreater(analyzer.iterations, first)
+        self.assertLessEqual(analyzer.confidence_interval, 0.02)
@@ -0,0 +1,99 @@
+from itertools import combinations
+import random
+import unittest
+
+from pokerbot.poker import evaluator
+from pokerbot.poker.deck import Card, Suits
+from pokerbot.poker.hands import Hand, StraightFlush, Straight, FullHouse
+
+
+def cards(*specs):
+    return [Card(value, suit) for value, suit in specs]
+
+
+class TestEvaluator(unittest.TestCase):
+
+    def test_distinct_strengths(self):
+        strengths = set(evaluator.PRODUCTS.values())
+        strengths.update(s for s in evaluator.FLUSHES if s)
+        strengths.update(s for s in evaluator.UNIQUE5 if s)
+        self.assertEqual(len(strengths), 7462)
+
+    def test_encode(self):
+        self.assertEqual(evaluator.encode(Card(2, Suits.SUITS[0])), 0)
+        self.assertEqual(evaluator.encode(Card(14, Suits.SUITS[3])), 51)
+
+    def test_ordering(self):
+        wheel = cards((14, Suits.HEARTS), (2, Suits.CLUBS), (3, Suits.HEARTS),
+                      (4, Suits.SPADES), (5, Suits.HEARTS))
+        six_high = cards((6, Suits.HEARTS), (2, Suits.CLUBS),
+                         (3, Suits.HEARTS), (4, Suits.SPADES),
+                         (5, Suits.HEARTS))
+        trips = cards((14, Suits.HEARTS), (14, Suits.CLUBS),
+                      (14, Suits.SPADES), (4, Suits.SPADES),
+                      (5, Suits.HEARTS))
+        self.assertEqual(evaluator.category(evaluator.evaluate(wheel)),
+                         evaluator.STRAIGHT)
+        self.assertLess(evaluator.evaluate(trips), evaluator.evaluate(wheel))
+        self.assertLess(evaluator.evaluate(wheel),
+                        evaluator.evaluate(six_high))
+
+    def test_seven_cards(self):
+        board = cards((10, Suits.SPADES), (11, Suits.SPADES),
+                      (12, Suits.SPADES), (2, Suits.HEARTS),
+                      (2, Suits.CLUBS))
+        royal = evaluator.evaluate(
+            board + cards((13, Suits.SPADES), (14, Suits.SPADES)))
+        boat = evaluator.evaluate(
+            board + cards((2, Suits.DIAMONDS), (10, Suits.HEARTS)))
+        self.assertEqual(evaluator.category(royal), evaluator.STRAIGHT_FLUSH)
+        self.assertEqual(evaluator.category(boat), evaluator.FULL_HOUSE)
+        six = evaluator.evaluate(
+            board[1:] + cards((2, Suits.DIAMONDS), (12, Suits.HEARTS)))
+        self.assertEqual(evaluator.category(six), evaluator.FULL_HOUSE)
+
+
+class TestHands(unittest.TestCase):
+
+    def test_detection(self):
+        straight_flush = Hand.get_hand([
+            Card(value, Suits.HEARTS) for value in range(2, 7)])
+        straight = Hand.get_hand([
+            Card(value, Suits.HEARTS) for value in
+            range(2, 6)] + [Card(6, Suits.CLUBS)])
+        self.assertIsInstance(straight_flush, StraightFlush)
+        self.assertIsInstance(straight, Straight)
+        self.assertTrue(Straight.is_valid(straight.cards))
+        self.assertEqual(max(straight, straight_flush), straight_flush)
+
+    def test_full_house_beats_flush(self):
+        full_house = Hand.get_hand(cards(
+            (3, Suits.HEARTS), (3, Suits.CLUBS), (3, Suits.SPADES),
+            (2, Suits.SPADES), (2, Suits.HEARTS)))
+        flush = Hand.get_hand([
+            Card(value, Suits.CLUBS) for value in (2, 4, 6, 8, 14)])
+        self.assertIsInstance(full_house, FullHouse)
+        self.assertGreater(full_house, flush)
+
+
+class TestSevenCardEvaluation(unittest.TestCase):
+
+    def test_matches_combination_expansion(self):
+        rng = random.Random(7)
+        for _ in range(2000):
+            cards = rng.sample(range(evaluator.CARDS), rng.choice((6, 7)))
+            expected = max(evaluator.evaluate5(*hand)
+                           for hand in combinations(cards, 5))
+            self.assertEqual(evaluator.evaluate7(cards), expected)
+
+    def test_best_hand_rank(self):
+        pocket = cards((14, Suits.HEARTS), (14, Suits.CLUBS))
+        board = cards((14, Suits.SPADES), (9, Suits.SPADES),
+                      (9, Suits.HEARTS))
+        strength = evaluator.best_hand_rank(pocket, board)
+        self.assertEqual(evaluator.category_name(strength), "Full House")
+
+    def test_repeated_card(self):
+        ace = evaluator.encode(Card(14, Suits.HEARTS))
+        with self.assertRaises(ValueError):
+            evaluator.evaluate7([ace] * 5)
@@ -0,0 +1,94 @@
+import unittest
+
+import numpy as np
+
+from pokerbot.ai import features
+from pokerbot.ai.holdemai import HoldemAI
+from pokerbot.ai.features import DecisionState
+
+
+def list_inputs(state):
+    # the list based input_parser encoding the layout was taken from
+    big_blind = state.big_blind
+    players = len(state.stacks)
+    chip_mean = sum(state.stacks) / players / big_blind
+    chip_range = chip_mean * players / 2
+    inputs_bin = [int(b) for b in bin(state.seat % 8)[2:].zfill(3)]
+    inputs_cont = [
+        (state.pot / big_blind - players) / chip_range,
+        (state.to_call / big_blind - players / 3) / chip_range,
+        (state.last_raise / big_blind - players / 3) / chip_range,
+        (state.win_ratio - 0.5) * 2]
+    for stack, active in zip(state.stacks, state.active):
+        inputs_bin += [int(active), 0]
+        inputs_cont.append((stack / big_blind - chip_mean) / chip_range)
+    inputs_bin += (8 - players) * [0, 0]
+    inputs_cont += (8 - players) * [0]
+    return [-1 if x == 0 else x for x in inputs_bin] + inputs_cont
+
+
+class TestFeatures(unittest.TestCase):
+
+    def setUp(self):
+        self.states = [
+            DecisionState(0, 60, 0, 0, 0.5, [1000, 980, 1020],
+                          [True, True, False], 4),
+            DecisionState(5, 300, 50, 50, 0.83,
+                          [500, 1500, 2000, 0, 700, 1300, 900, 1100],
+                          [True, False, True, False, True, True, True, False],
+                          20),
+            DecisionState(9, 12, 8, 4, 0.1, [2000, 2000], [True, True], 4),
+        ]
+
+    def test_layout(self):
+        self.assertEqual(features.INPUT_SIZE, 31)
+        self.assertEqual(features.STACKS + features.MAX_SEATS,
+                         features.INPUT_SIZE)
+
+    def test_encode_matches_list_encoding(self):
+        row = features.buffer()
+        for state in self.states:
+            features.encode(row, state)
+            self.assertEqual(row.dtype, np.float32)
+            np.testing.assert_allclose(row, list_inputs(state), rtol=1e-6,
+                                       atol=1e-6)
+
+    def test_encode_batch_matches_encode(self):
+        batch = features.encode_batch(self.states)
+        self.assertEqual(batch.shape, (len(self.states), features.INPUT_SIZE))
+        for row, state in zip(batch, self.states):
+            np.testing.assert_array_equal(
+                row, features.encode(features.buffer(), state))
+
+    def test_encode_into_batch_row(self):
+        batch = features.buffer(2)
+        features.encode(batch[1], self.states[0])
+        np.testing.assert_array_equal(batch[0], 0)
+        np.testing.assert_allclose(batch[1], list_inputs(self.states[0]),
+                                   rtol=1e-6, atol=1e-6)
+
+    def test_activate_states_matches_activate(self):
+        ai = HoldemAI('holdem')
+        outputs = ai.activate_states(self.states)
+        self.assertEqual(outputs.shape, (len(self.states), HoldemAI.DIM[-1]))
+        for output, state in zip(outputs, self.states):
+            row = features.encode(features.buffer(), state)
+            np.testing.assert_allclose(ai.activate(row)[:, 0], output)
+
+    def test_probe_states(self):
+        states = features.probe_states(50, np.random.default_rng(0), 25, 2000)
+        self.assertEqual(len(states), 50)
+        self.assertEqual(sum(state.to_call > 0 for state in states), 25)
+        for state in states:
+            self.assertEqual(len(state.stacks), len(state.active))
+            self.assertTrue(state.active[0])
+            self.assertLess(state.seat, len(state.stacks))
+        batch = features.encode_batch(states)
+        self.assertTrue(np.isfinite(batch).all())
+
+    def test_fold_ratio(self):
+        # raise, call, check, fold, amount
+        outputs = np.array([[[0, 1, 0, 0, 0], [0, 0, 0, 1, 0],
+                             [0, 0, 0, 1, 0]]])
+        self.assertEqual(list(HoldemAI.fold_ratio(outputs, [10, 10, 0])),
+                         [0.5])
@@ -0,0 +1,55 @@
+import unittest
+
+import numpy as np
+
+from pokerbot.ai import genetics
+
+
+class TestGeneticOperators(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+        self.parents1 = self.rng.standard_normal((50, 735))
+        self.parents2 = self.rng.standard_normal((50, 735))
+
+    def test_uniform_crossover_takes_parent_genes(self):
+        child = genetics.uniform_crossover(self.parents1, self.parents2,
+                                           self.rng)
+        from_parent = (child == self.parents1) | (child == self.parents2)
+        self.assertTrue(from_parent.all())
+        self.assertAlmostEqual((child == self.parents1).mean(), 0.5,
+                               delta=0.02)
+
+    def test_blend_crossover_stays_in_widened_interval(self):
+        child = genetics.blend_crossover(self.parents1, self.parents2,
+                                         self.rng, alpha=0.5)
+        low = np.minimum(self.parents1, self.parents2)
+        high = np.maximum(self.parents1, self.parents2)
+        spread = high - low
+        self.assertTrue((child >= low - 0.5 * spread - 1e-12).all())
+        self.assertTrue((child <= high + 0.5 * spread + 1e-12).all())
+
+    def test_gaussian_mutation_rate(self):
+        mutated = genetics.gaussian_mutation(self.parents1, self.rng,
+                                             rate=0.2, scale=1.0)
+        self.assertAlmostEqual((mutated != self.parents1).mean(), 0.2,
+                               delta=0.02)
+
+    def test_elite(self):
+        fitness = np.array([3, 9, -1, 7, 9])
+        self.assertEqual(list(genetics.elite(fitness, 3)), [1, 4, 3])
+        self.assertEqual(len(genetics.elite(fitness, 0)), 0)
+
+    def test_next_generation_keeps_elites(self):
+        fitness = self.rng.integers(-10, 10, 50)
+        generation = genetics.next_generation(
+            self.parents1, fitness, self.rng, n_elite=5)
+        self.assertEqual(generation.shape, self.parents1.shape)
+        np.testing.assert_array_equal(
+            generation[:5], self.parents1[genetics.elite(fitness, 5)])
+
+    def test_next_generation_size(self):
+        fitness = self.rng.integers(-10, 10, 50)
+        generation = genetics.next_generation(
+            self.parents1, fitness, self.rng, n_elite=0, size=7)
+        self.assertEqual(generation.shape, (7, self.parents1.shape[1]))
@@ -0,0 +1,84 @@
+import random
+import unittest
+
+from pokerbot.poker import evaluator
+from pokerbot.poker.deck import Card, Suits
+from pokerbot.poker.handstate import HandState
+from pokerbot.poker.player import RandomPlayer
+
+
+class TestHandState(unittest.TestCase):
+
+    def test_matches_evaluator(self):
+        rng = random.Random(5)
+        for _ in range(500):
+            cards = rng.sample(range(evaluator.CARDS), 7)
+            state = HandState(cards[:2])
+            for count in range(3, 8):
+                state.add(cards[count - 1])
+                if count >= 5:
+                    self.assertEqual(state.strength,
+                                     evaluator.evaluate(cards[:count]))
+
+    def test_pocket_strength(self):
+        pair = HandState([Card(9, Suits.HEARTS), Card(9, Suits.SPADES)])
+        high = HandState([Card(14, Suits.HEARTS), Card(13, Suits.SPADES)])
+        self.assertEqual(pair.category, evaluator.PAIR)
+        self.assertEqual(high.category, evaluator.HIGH_CARD)
+        self.assertGreater(pair.strength, high.strength)
+
+    def test_draws(self):
+        state = HandState([Card(9, Suits.HEARTS), Card(8, Suits.HEARTS)])
+        state.add(Card(7, Suits.HEARTS))
+        state.add(Card(6, Suits.CLUBS))
+        state.add(Card(2, Suits.HEARTS))
+        self.assertTrue(state.flush_draw)
+        self.assertEqual(state.straight_outs, 2)
+        state.add(Card(5, Suits.SPADES))
+        self.assertEqual(state.category, evaluator.STRAIGHT)
+        self.assertEqual(state.straight_outs, 0)
+
+        gutshot = HandState([Card(14, Suits.HEARTS), Card(13, Suits.CLUBS)])
+        gutshot.add(Card(12, Suits.SPADES))
+        gutshot.add(Card(10, Suits.DIAMONDS))
+        gutshot.add(Card(2, Suits.DIAMONDS))
+        self.assertEqual(gutshot.straight_outs, 1)
+        self.assertFalse(gutshot.flush_draw)
+
+    def test_river_has_no_draws(self):
+        state = HandState([Card(9, Suits.HEARTS), Card(8, Suits.HEARTS)])
+        for card in (Card(7, Suits.HEARTS), Card(6, Suits.CLUBS),
+                     Card(2, Suits.HEARTS), Card(13, Suits.SPADES),
+                     Card(3, Suits.CLUBS)):
+            state.add(card)
+        self.assertFalse(state.flush_draw)
+        self.assertEqual(state.straight_outs, 0)
+
+    def test_holds(self):
+        cards = [Card(9, Suits.HEARTS), Card(8, Suits.HEARTS),
+                 Card(7, Suits.HEARTS)]
+        state = HandState(cards)
+        self.assertTrue(state.holds(cards))
+        self.assertFalse(state.holds(cards[:2]))
+        self.assertFalse(state.holds(cards[:2] + [Card(7, Suits.CLUBS)]))
+
+    def test_player_rank_checks_the_board(self):
+        player = RandomPlayer('a', 100)
+        player.set_pocket(Card(9, Suits.HEARTS), Card(9, Suits.SPADES))
+        board = [Card(9, Suits.CLUBS), Card(4, Suits.HEARTS),
+                 Card(2, Suits.SPADES)]
+        for card in board:
+            player.add_community_card(card)
+        self.assertEqual(player.best_hand_rank(board),
+                         player.hand_state.strength)
+        # a board of the same size the state was not built from
+        other = [Card(13, Suits.CLUBS), Card(4, Suits.HEARTS),
+                 Card(2, Suits.SPADES)]
+        self.assertEqual(player.best_hand_rank(other),
+                         evaluator.best_hand_rank(player.pocket, other))
+        self.assertEqual(evaluator.category(player.best_hand_rank(other)),
+                         evaluator.PAIR)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from pokerbot.ai.ledger import FitnessLedger
+
+
+class TestFitnessLedger(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.ledger = FitnessLedger(os.path.join(self.directory, 'fitness.db'))
+
+    def tearDown(self):
+        self.ledger.close()
+        shutil.rmtree(self.directory)
+
+    def test_scores_accumulate(self):
+        self.ledger.add_many([('a', 0), ('b', 0)])
+        self.ledger.add_many([('a', 7), ('b', -1)])
+        self.ledger.add('a', -1)
+        self.assertEqual(self.ledger.score('a'), 6)
+        self.assertEqual(self.ledger.score('b'), -1)
+        self.assertIsNone(self.ledger.score('c'))
+        self.assertEqual(len(self.ledger), 2)
+
+    def test_top(self):
+        self.ledger.add_many([('a', 3), ('b', 10), ('c', -2), ('d', 5)])
+        self.assertEqual(self.ledger.top(2), [('b', 10), ('d', 5)])
+        self.assertEqual(len(self.ledger.top(10)), 4)
+
+    def test_hall_of_fame(self):
+        self.ledger.add_to_hall_of_fame(['a', 'b'])
+        self.ledger.add_to_hall_of_fame(['b', 'c'])
+        self.assertEqual(self.ledger.hall_of_fame(), {'a', 'b', 'c'})
+
+    def test_hall_of_fame_scores(self):
+        self.ledger.add('a', 3)
+        self.ledger.add('d', 9)
+        self.ledger.add_to_hall_of_fame(['a', 'b'])
+        self.assertEqual(self.ledger.hall_of_fame_scores(), {'a': 3, 'b': 0})
+
+    def test_persists(self):
+        self.ledger.add('a', 4)
+        self.ledger.add_to_hall_of_fame(['a'])
+        self.ledger.close()
+        self.ledger = FitnessLedger(self.ledger.path)
+        self.assertEqual(self.ledger.score('a'), 4)
+        self.assertEqual(self.ledger.hall_of_fame(), {'a'})
+
+    def test_import_logs(self):
+        fitness_log = os.path.join(self.directory, 'fitness.log')
+        hof_log = os.path.join(self.directory, 'hof_id.log')
+        with open(fitness_log, 'w') as f:
+            f.write('3 a\n-1 b\n9 a\n')
+        with open(hof_log, 'w') as f:
+            f.write('a\n\n')
+        self.ledger.import_logs(fitness_log, hof_log)
+        self.assertEqual(self.ledger.score('a'), 9)
+        self.assertEqual(self.ledger.score('b'), -1)
+        self.assertEqual(self.ledger.hall_of_fame(), {'a'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import logging
+import unittest
+
+from pokerbot import logs
+
+
+class TestLogs(unittest.TestCase):
+
+    def setUp(self):
+        self.logger = logging.getLogger('test-logs')
+        self.calls = []
+
+    def tearDown(self):
+        self.logger.setLevel(logging.NOTSET)
+
+    def expensive(self, value):
+        self.calls.append(value)
+        return value
+
+    def test_lazy_not_evaluated_when_disabled(self):
+        logs.set_level('test-logs', logging.WARNING)
+        self.logger.debug("value: %s", logs.lazy(self.expensive, 1))
+        self.assertEqual(self.calls, [])
+
+    def test_lazy_evaluated_when_enabled(self):
+        logs.set_level('test-logs', logging.DEBUG)
+        with self.assertLogs(self.logger, logging.DEBUG) as captured:
+            self.logger.debug("value: %s", logs.lazy(self.expensive, 2))
+        self.assertEqual(captured.records[0].getMessage(), "value: 2")
+        self.assertIn(2, self.calls)
+
+    def test_configure(self):
+        logs.configure(" test-logs=info, test-logs-other ")
+        self.assertEqual(self.logger.level, logging.INFO)
+        other = logging.getLogger('test-logs-other')
+        self.assertEqual(other.level, logging.DEBUG)
+        other.setLevel(logging.NOTSET)
+
+    def test_stream_handler_added_once(self):
+        logger = logs.set_level('test-logs-stream', logging.INFO, stream=True)
+        logs.set_level('test-logs-stream', logging.INFO, stream=True)
+        self.assertEqual(len(logger.handlers), 1)
+        self.assertFalse(logger.propagate)
@@ -0,0 +1,76 @@
+import itertools
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from pokerbot.ai import utils
+from pokerbot.ai.cache import EquityCache
+from pokerbot.poker import evaluator
+from pokerbot.poker.deck import Card, Suits
+
+
+def brute_force(pocket, community_cards):
+    known = pocket + community_cards
+    remaining = [card for card in range(evaluator.CARDS) if card not in known]
+    ranks = [evaluator.category(evaluator.evaluate(known + list(board)))
+             for board in itertools.combinations(
+                 remaining, min(3, 7 - len(known)))]
+    return sum(ranks) / len(ranks)
+
+
+class TestNaiveRank(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = utils.naive_rank_cache
+        utils.naive_rank_cache = EquityCache()
+
+    def tearDown(self):
+        utils.naive_rank_cache = self.cache
+
+    def test_matches_enumeration(self):
+        rng = random.Random(2)
+        for count in (2, 5, 6, 7):
+            cards = rng.sample(range(evaluator.CARDS), count)
+            self.assertAlmostEqual(utils.naive_rank(cards[:2], cards[2:]),
+                                   brute_force(cards[:2], cards[2:]))
+
+    def test_isomorphic_spots_are_cached(self):
+        first = utils.naive_rank(
+            [Card(14, Suits.HEARTS), Card(13, Suits.HEARTS)],
+            [Card(9, Suits.CLUBS), Card(9, Suits.HEARTS), Card(2, Suits.SPADES)])
+        second = utils.naive_rank(
+            [Card(9, Suits.DIAMONDS), Card(14, Suits.SPADES)],
+            [Card(2, Suits.HEARTS), Card(13, Suits.SPADES), Card(9, Suits.SPADES)])
+        self.assertEqual(first, second)
+        self.assertEqual(utils.naive_rank_cache.hits, 1)
+
+    def test_persistent_cache(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'naive_rank.pkl')
+            with mock.patch.object(utils, '_atexit_registered', False), \
+                    mock.patch('atexit.register') as register:
+                cache = utils.use_naive_rank_cache(path)
+                self.assertIs(utils.use_naive_rank_cache(path), cache)
+                register.assert_called_once_with(utils.save_naive_rank_cache)
+                value = utils.naive_rank([0, 5], [10, 20, 30])
+                utils.save_naive_rank_cache()
+                utils.naive_rank_cache = EquityCache()
+                reloaded = utils.use_naive_rank_cache(path)
+            self.assertIsNot(reloaded, cache)
+            self.assertEqual(utils.naive_rank([0, 5], [10, 20, 30]), value)
+            self.assertEqual(reloaded.hits, 1)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_cache_file_setting(self):
+        with mock.patch.dict(os.environ,
+                             {utils.CACHE_ENVIRONMENT_VARIABLE: ''}), \
+                mock.patch('atexit.register'):
+            self.assertIsNone(utils.use_naive_rank_cache().path)
+
+if __name__ == '__main__':
+    unittest.main()
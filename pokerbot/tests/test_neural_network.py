@@ -0,0 +1,56 @@
+import unittest
+
+import numpy as np
+
+from pokerbot.ai.neural_network import (NetworkStack, NeuralNetwork,
+                                        stack_networks)
+from pokerbot.ai.population import to_genome
+
+
+def random_network(dim, networkID, rng, slope=0.1):
+    weights = [rng.standard_normal((y, x)) for x, y in zip(dim[:-1], dim[1:])]
+    biases = [rng.standard_normal((y, 1)) for y in dim[1:]]
+    return NeuralNetwork(dim, networkID, slope, weights, biases)
+
+
+class TestBatchedInference(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+        self.networks = [random_network([31, 20, 5], i, self.rng, 0.1 * (i + 1))
+                         for i in range(4)]
+
+    def test_activate_batch_matches_activate(self):
+        network = self.networks[0]
+        inputs = self.rng.standard_normal((6, 31))
+        batch = network.activate_batch(inputs)
+        for row, output in zip(inputs, batch):
+            np.testing.assert_allclose(network.activate(list(row))[:, 0], output)
+        self.assertEqual(network.activate(list(inputs[0])).shape, (5, 1))
+
+    def test_population_stack(self):
+        odd = random_network([31, 10, 5], 'odd', self.rng)
+        stacks = stack_networks(self.networks + [odd])
+        self.assertEqual(sorted(len(s) for s in stacks.values()), [1, 4])
+
+        stack = stacks[(31, 20, 5)]
+        inputs = self.rng.standard_normal((4, 3, 31))
+        outputs = stack.activate(inputs)
+        self.assertEqual(outputs.shape, (4, 3, 5))
+        for network, rows, output in zip(self.networks, inputs, outputs):
+            np.testing.assert_allclose(network.activate_batch(rows), output)
+        np.testing.assert_allclose(stack.activate(inputs[:, 0]), outputs[:, 0])
+
+    def test_genome_stack_on_shared_decisions(self):
+        networks = [random_network([31, 20, 5], i, self.rng) for i in range(3)]
+        genomes = np.array([to_genome(n.weights, n.biases) for n in networks])
+        stack = NetworkStack.from_genomes([31, 20, 5], genomes, ids='abc')
+        self.assertEqual(stack.index['c'], 2)
+        inputs = self.rng.standard_normal((6, 31)).astype(np.float32)
+        outputs = stack.activate_shared(inputs)
+        self.assertEqual(outputs.shape, (3, 6, 5))
+        for network, output in zip(networks, outputs):
+            np.testing.assert_allclose(network.activate_batch(inputs), output,
+                                       rtol=1e-6)
+        with self.assertRaises(ValueError):
+            NetworkStack.from_genomes([31, 10, 5], genomes)
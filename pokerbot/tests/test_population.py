@@ -0,0 +1,93 @@
+import shutil
+import tempfile
+import unittest
+import uuid
+
+import numpy as np
+
+from pokerbot.ai import population
+from pokerbot.ai.neural_network import NeuralNetwork
+from pokerbot.ai.population import PopulationStore
+
+DIM = [4, 3, 2]
+
+
+def random_genome(rng):
+    return rng.standard_normal(population.genome_size(DIM))
+
+
+class TestPopulationStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.rng = np.random.default_rng(0)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_genome_round_trip(self):
+        weights = [self.rng.standard_normal((3, 4)),
+                   self.rng.standard_normal((2, 3))]
+        biases = [self.rng.standard_normal((3, 1)),
+                  self.rng.standard_normal((2, 1))]
+        store = PopulationStore(self.directory, DIM)
+        store.write('a', weights, biases)
+        read_weights, read_biases = store.read('a')
+        for expected, actual in zip(weights + biases,
+                                    read_weights + read_biases):
+            np.testing.assert_array_equal(expected, actual)
+        self.assertIsNone(store.read('missing'))
+
+    def test_append_grow_and_reopen(self):
+        store = PopulationStore(self.directory, DIM)
+        ids = [str(uuid.uuid4()) for _ in range(population.INITIAL_CAPACITY + 5)]
+        genomes = dict((i, random_genome(self.rng)) for i in ids)
+        for i in ids:
+            store.write_genome(i, genomes[i])
+        self.assertGreater(store.capacity, population.INITIAL_CAPACITY)
+        store.flush()
+
+        reopened = PopulationStore(self.directory, DIM, readonly=True)
+        self.assertEqual(len(reopened), len(ids))
+        uuids, stored = reopened.genomes()
+        self.assertEqual(uuids, ids)
+        np.testing.assert_array_equal(stored[-1], genomes[ids[-1]])
+
+    def test_tombstone_and_compact(self):
+        store = PopulationStore(self.directory, DIM)
+        genomes = dict((i, random_genome(self.rng)) for i in 'abcd')
+        for i, genome in sorted(genomes.items()):
+            store.write_genome(i, genome)
+        store.delete('b')
+        store.delete('c')
+        self.assertNotIn('b', store)
+        self.assertEqual(store.tombstones, 2)
+        self.assertRaises(KeyError, store.delete, 'b')
+
+        store.compact()
+        self.assertEqual((len(store), store.size, store.tombstones), (2, 2, 0))
+        np.testing.assert_array_equal(store.genomes()[1][1], genomes['d'])
+        store.write_genome('e', genomes['a'])
+        self.assertEqual(store.index['e'], 2)
+
+
+class TestNetworkStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.save_dir = NeuralNetwork.SAVE_DIR
+        NeuralNetwork.SAVE_DIR = tempfile.mkdtemp()
+        NeuralNetwork.reset_stores()
+
+    def tearDown(self):
+        shutil.rmtree(NeuralNetwork.SAVE_DIR)
+        NeuralNetwork.SAVE_DIR = self.save_dir
+        NeuralNetwork.reset_stores()
+
+    def test_save_load_delete(self):
+        network = NeuralNetwork(DIM, 'agent')
+        network.save()
+        loaded = NeuralNetwork(DIM, 'agent')
+        for expected, actual in zip(network.weights, loaded.weights):
+            np.testing.assert_array_equal(expected, actual)
+        network.delete()
+        self.assertNotIn('agent', NeuralNetwork.get_store(DIM))
@@ -0,0 +1,78 @@
+import random
+import unittest
+
+from pokerbot.poker.potstate import PotState, SidePot
+
+
+class TestPotState(unittest.TestCase):
+
+    def test_betting_queries(self):
+        pot = PotState()
+        pot.add('a', 15)
+        pot.add('b', 30)
+        self.assertEqual(pot.current_bet, 30)
+        self.assertEqual(pot.total, 45)
+        self.assertEqual(pot.amount_to_call('a'), 15)
+        self.assertEqual(pot.amount_to_call('c'), 30)
+        pot.add('a', 15)
+        self.assertEqual(pot.amount_to_call('a'), 0)
+        self.assertEqual(pot.current_bet, 30)
+
+    def test_cap(self):
+        pot = PotState()
+        for player, stack in zip('abc', (100, 50, 200)):
+            pot.seat(player, stack)
+        self.assertEqual(pot.cap, 50)
+        pot.fold('b')
+        self.assertEqual(pot.cap, 100)
+
+    def test_single_pot(self):
+        pot = PotState()
+        for player in 'abc':
+            pot.add(player, 40)
+        pot.fold('c')
+        self.assertEqual(pot.side_pots(), [SidePot(120, ('a', 'b'))])
+
+    def test_all_in_layers(self):
+        pot = PotState()
+        pot.add('a', 20, all_in=True)
+        pot.add('b', 100)
+        pot.add('c', 60, all_in=True)
+        pot.add('d', 100)
+        pot.add('e', 30)
+        pot.fold('e')
+        self.assertEqual(pot.all_in_levels, [20, 60])
+        self.assertEqual(pot.side_pots(), [
+            SidePot(100, ('a', 'b', 'c', 'd')),
+            SidePot(130, ('b', 'c', 'd')),
+            SidePot(80, ('b', 'd')),
+        ])
+
+    def test_folded_chips_above_live_players(self):
+        pot = PotState()
+        pot.add('a', 100)
+        pot.add('b', 40, all_in=True)
+        pot.fold('a')
+        self.assertEqual(pot.side_pots(), [SidePot(140, ('b',))])
+
+    def test_side_pots_add_up(self):
+        rng = random.Random(3)
+        for _ in range(200):
+            pot = PotState()
+            players = range(rng.randint(2, 9))
+            top = rng.randint(10, 500)
+            for player in players:
+                if rng.random() < 0.3:
+                    pot.add(player, rng.randint(1, top), all_in=True)
+                else:
+                    pot.add(player, top)
+                    if rng.random() < 0.2:
+                        pot.fold(player)
+            pots = pot.side_pots()
+            self.assertEqual(sum(p.amount for p in pots), pot.total)
+            for side_pot in pots:
+                self.assertTrue(side_pot.players)
+                eligible = [p for p in players if p not in pot.folded and
+                            pot.contribution(p) >= min(
+                                pot.contribution(q) for q in side_pot.players)]
+                self.assertEqual(list(side_pot.players), eligible)
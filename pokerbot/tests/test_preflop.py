@@ -0,0 +1,32 @@
+import unittest
+
+from pokerbot.ai import preflop
+from pokerbot.poker.deck import Card, Suits
+
+
+class TestPreflop(unittest.TestCase):
+
+    def test_canonical_index(self):
+        indices = set(preflop.hand_index(*preflop.representative(index))
+                      for index in range(preflop.HANDS))
+        self.assertEqual(len(indices), 169)
+        suited = (Card(14, Suits.HEARTS), Card(13, Suits.HEARTS))
+        offsuit = (Card(13, Suits.CLUBS), Card(14, Suits.HEARTS))
+        self.assertEqual(preflop.hand_index(*suited),
+                         preflop.hand_index(*reversed(suited)))
+        self.assertNotEqual(preflop.hand_index(*suited),
+                            preflop.hand_index(*offsuit))
+
+    def test_shipped_tables(self):
+        self.assertEqual(preflop.equity_table().shape,
+                         (preflop.HANDS, preflop.MAX_OPPONENTS))
+        aces = (Card(14, Suits.HEARTS), Card(14, Suits.SPADES))
+        seven_deuce = (Card(7, Suits.HEARTS), Card(2, Suits.SPADES))
+        self.assertAlmostEqual(preflop.win_ratio(aces, 1), 0.85, delta=0.01)
+        self.assertGreater(preflop.win_ratio(aces, 3),
+                           preflop.win_ratio(seven_deuce, 3))
+        self.assertGreater(preflop.win_ratio(aces, 1),
+                           preflop.win_ratio(aces, 7))
+        self.assertIsNone(preflop.win_ratio(aces, 0))
+        self.assertGreater(preflop.naive_rank(aces),
+                           preflop.naive_rank(seven_deuce))
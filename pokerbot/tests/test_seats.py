@@ -0,0 +1,45 @@
+import unittest
+
+from pokerbot.poker.seats import SeatRing
+
+
+class TestSeatRing(unittest.TestCase):
+
+    def setUp(self):
+        self.seats = SeatRing('abcde')
+
+    def test_after_wraps(self):
+        self.assertEqual(self.seats.after('c'), 'd')
+        self.assertEqual(self.seats.after('e'), 'a')
+
+    def test_active(self):
+        self.seats.fold('b')
+        self.assertEqual(self.seats.active, ['a', 'c', 'd', 'e'])
+        self.seats.fold('e')
+        self.assertEqual(self.seats.active, ['a', 'c', 'd'])
+        self.assertTrue(self.seats.is_folded('e'))
+        self.assertFalse(self.seats.is_folded('a'))
+
+    def test_next_to_act_skips_folded_and_all_in(self):
+        self.seats.fold('b')
+        self.seats.go_all_in('c')
+        self.assertEqual(self.seats.next_to_act('a'), 'd')
+        self.seats.act('d')
+        self.seats.act('e')
+        self.assertEqual(self.seats.next_to_act('e'), 'a')
+        self.seats.act('a')
+        self.assertIsNone(self.seats.next_to_act('a'))
+
+    def test_raise_reopens_the_action(self):
+        for player in 'abcd':
+            self.seats.act(player)
+        self.seats.act('e', raised=True)
+        self.assertEqual(self.seats.next_to_act('e'), 'a')
+        self.assertFalse(self.seats.is_waiting('e'))
+        self.seats.new_street()
+        self.assertTrue(self.seats.is_waiting('e'))
+
+    def test_player_itself_is_last(self):
+        for player in 'bcde':
+            self.seats.act(player)
+        self.assertEqual(self.seats.next_to_act('a'), 'a')
@@ -0,0 +1,46 @@
+import unittest
+
+from pokerbot.poker import showdown
+from pokerbot.poker.potstate import PotState
+
+
+class TestShowdown(unittest.TestCase):
+
+    def test_single_winner(self):
+        pot = PotState()
+        for player in 'abc':
+            pot.add(player, 50)
+        result = showdown.resolve(pot, {'a': 3, 'b': 7, 'c': 5})
+        self.assertEqual(dict(result.winnings), {'b': 150})
+        self.assertEqual(result.pots[0].winners, ('b',))
+
+    def test_uncontested_pot_needs_no_strength(self):
+        pot = PotState()
+        pot.add('a', 15)
+        pot.add('b', 30)
+        pot.fold('a')
+        result = showdown.resolve(pot, {})
+        self.assertEqual(dict(result.winnings), {'b': 45})
+
+    def test_side_pots(self):
+        pot = PotState()
+        pot.add('a', 20, all_in=True)
+        pot.add('b', 100)
+        pot.add('c', 60, all_in=True)
+        pot.add('d', 100)
+        # a holds the best hand, but only wins the main pot
+        result = showdown.resolve(pot, {'a': 9, 'b': 1, 'c': 5, 'd': 2})
+        self.assertEqual([award.winners for award in result.pots],
+                         [('a',), ('c',), ('d',)])
+        self.assertEqual(dict(result.winnings), {'a': 80, 'c': 120, 'd': 80})
+
+    def test_odd_chips_in_seat_order(self):
+        pot = PotState()
+        for player in 'abcd':
+            pot.add(player, 25)
+        pot.fold('d')
+        result = showdown.resolve(pot, {'a': 4, 'b': 4, 'c': 4},
+                                  order=['c', 'a', 'b'])
+        self.assertEqual(result.pots[0].winners, ('c', 'a', 'b'))
+        self.assertEqual(result.pots[0].shares, (34, 33, 33))
+        self.assertEqual(sum(result.winnings.values()), pot.total)
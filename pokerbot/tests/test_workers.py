@@ -0,0 +1,84 @@
+import subprocess
+import sys
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from pokerbot.ai import aiplayers, equity, utils, workers
+from pokerbot.poker.deck import Card, Suits
+
+
+def square(x):
+    return x * x
+
+
+class TestWorkers(unittest.TestCase):
+
+    def tearDown(self):
+        workers.configure()
+
+    def test_nothing_starts_at_import(self):
+        code = ('import multiprocessing\n'
+                'import pokerbot.ai.aiplayers\n'
+                'from pokerbot.ai import workers\n'
+                'assert workers._pool is None\n'
+                'assert not multiprocessing.active_children()\n')
+        subprocess.check_call([sys.executable, '-c', code])
+
+    def test_single_process_runs_in_process(self):
+        workers.configure(processes=1)
+        self.assertFalse(workers.parallel())
+        self.assertEqual(workers.map_chunks(square, range(5)), [0, 1, 4, 9, 16])
+        self.assertIsNone(workers._pool)
+
+    def test_pool(self):
+        workers.configure(processes=2, start_method='fork')
+        self.assertEqual(workers.map_chunks(square, range(5)), [0, 1, 4, 9, 16])
+        self.assertIsNotNone(workers._pool)
+        workers.shutdown()
+        self.assertIsNone(workers._pool)
+
+    def test_chunks(self):
+        chunks = workers.chunks(list(range(10)), 3)
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(sum(chunks, []), list(range(10)))
+
+    def test_parallel_workloads(self):
+        pocket = [Card(14, Suits.HEARTS), Card(14, Suits.SPADES)]
+        flop = [Card(10, Suits.CLUBS), Card(7, Suits.HEARTS),
+                Card(2, Suits.SPADES)]
+        utils.naive_rank_cache.clear()
+        serial = utils.naive_rank(pocket, [])
+        utils.naive_rank_cache.clear()
+        workers.configure(processes=2, start_method='fork')
+        with mock.patch.object(workers, 'map_chunks',
+                               wraps=workers.map_chunks) as pooled:
+            self.assertAlmostEqual(utils.naive_rank(pocket, []), serial)
+        self.assertEqual(pooled.call_count, 1)
+        self.assertIsNotNone(workers._pool)
+        with mock.patch.object(workers, 'map_chunks',
+                               wraps=workers.map_chunks) as pooled:
+            shares = equity.pot_shares(pocket, flop, 2,
+                                       equity.PARALLEL_ROLLOUTS,
+                                       np.random.default_rng(0))
+        self.assertEqual(pooled.call_count, 1)
+        self.assertAlmostEqual(shares.sum(), 1)
+        self.assertGreater(shares[0], 0.7)
+
+    def test_decision_time_estimates_stay_in_process(self):
+        pocket = [Card(14, Suits.HEARTS), Card(14, Suits.SPADES)]
+        workers.configure(processes=2, start_method='fork')
+        with mock.patch.object(workers, 'map_chunks',
+                               wraps=workers.map_chunks) as pooled:
+            # the Analyzer's batches and MonteCarloAI's simulation
+            equity.estimate(pocket, [], 3, target_ci=0.01, max_rollouts=1000,
+                            rng=np.random.default_rng(0))
+            equity.pot_shares(pocket, [], 3, aiplayers.SIMULATION_ROLLOUTS,
+                              np.random.default_rng(0))
+        self.assertEqual(pooled.call_count, 0)
+        self.assertIsNone(workers._pool)
+
+
+if __name__ == '__main__':
+    unittest.main()